@@ -0,0 +1,69 @@
+"""Import time benchmarks for heracles packages."""
+
+from __future__ import annotations
+
+import statistics
+import subprocess
+import sys
+
+import typer
+
+cli = typer.Typer()
+
+# modules which heracles.config only needs once rules are realized or dumped, so
+# importing it shouldn't load them
+_DEFERRED = ("yaml",)
+
+
+def import_time(module: str) -> tuple[float, list[str]]:
+    """
+    import_time imports module in a new interpreter, returning the time it took in
+    seconds according to -X importtime and which of the deferred modules it loaded.
+    Interpreter startup isn't included.
+    """
+    code = (
+        f"import sys, {module}; "
+        f"print(','.join(m for m in {_DEFERRED!r} if m in sys.modules))"
+    )
+    res = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    (line,) = (
+        line for line in res.stderr.splitlines() if line.split("|")[-1] == f" {module}"
+    )
+    cumulative_us = int(line.split("|")[1])
+    return cumulative_us / 1e6, [m for m in res.stdout.strip().split(",") if m]
+
+
+@cli.command()
+def config(runs: int = 20) -> None:
+    """
+    Measures the cold import time of heracles.config, which rule library unit
+    tests pay for before defining a single rule. heracles.ql is measured too,
+    since heracles.config imports it.
+
+    Every run uses a new interpreter, so nothing is cached between runs except
+    bytecode. The first run of each module is discarded so that its bytecode is
+    written before anything is measured.
+    """
+    print(f"runs={runs}")
+    print(f"{'':18}{'median':>10}{'min':>10}  deferred modules loaded")
+    for module in ("heracles.ql", "heracles.config"):
+        import_time(module)
+        times = []
+        loaded: set[str] = set()
+        for _ in range(runs):
+            t, modules = import_time(module)
+            times.append(t)
+            loaded.update(modules)
+        print(
+            f"{module:18}{statistics.median(times) * 1000:>8.1f}ms"
+            f"{min(times) * 1000:>8.1f}ms  {', '.join(sorted(loaded)) or '-'}"
+        )
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,69 @@
+"""Memory benchmarks for heracles expression trees."""
+
+from __future__ import annotations
+
+import gc
+import tracemalloc
+
+import typer
+
+from heracles import ql
+
+cli = typer.Typer()
+
+
+def synthetic_rule(i: int) -> ql.InstantVector:
+    """
+    synthetic_rule builds one alert expression shaped like the rules in a typical
+    service library: an error ratio over a rollup, compared against a threshold,
+    joined with a liveness check.
+    """
+    v = ql.Selector()
+    service = f"service_{i % 50}"
+    errors = ql.sum(
+        ql.rate(
+            v.http_requests_total(service=service, code=ql.RE("5.."))[5 * ql.Minute]
+        )
+    ).by("instance")
+    total = ql.sum(ql.rate(v.http_requests_total(service=service)[5 * ql.Minute])).by(
+        "instance"
+    )
+    up = ql.max_over_time(v.up(service=service)[ql.Minute])
+    return ((errors / total) > 0.05 + i % 3).and_(up == 1)
+
+
+def count_nodes(exprs: list[ql.InstantVector]) -> int:
+    seen: set[int] = set()
+
+    def visitor(t: ql.Timeseries) -> None:
+        seen.add(id(t))
+
+    for e in exprs:
+        e.accept_visitor(visitor)
+    return len(seen)
+
+
+@cli.command()
+def node_size(rules: int = 10_000) -> None:
+    """
+    Reports the memory used per expression node for a synthetic project with
+    `rules` rules. Durations, matchers and other values owned by the nodes are
+    included in the total, so this tracks the real cost of a node in a project.
+    """
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    exprs = [synthetic_rule(i) for i in range(rules)]
+    gc.collect()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    nodes = count_nodes(exprs)
+    total = after - before
+    print(f"rules={rules} nodes={nodes}")
+    print(f"total: {total / 1024 / 1024:.2f} MiB")
+    print(f"bytes per node: {total / nodes:.1f}")
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,132 @@
+"""Rendering benchmarks for heracles expression trees."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+
+import typer
+
+from heracles import ql
+
+cli = typer.Typer()
+
+
+def shared_tree(depth: int) -> ql.InstantVector:
+    """
+    shared_tree builds a left-deep expression of the given depth where every level
+    combines the previous level with a rollup, similar to the ratio/threshold
+    expressions rule libraries build on top of each other.
+    """
+    v = ql.Selector()
+    expr: ql.InstantVector = ql.rate(v.requests_total(job="api")[5 * ql.Minute])
+    for i in range(depth):
+        expr = (expr + ql.rate(v.errors_total(job="api", code=str(i))[ql.Minute])) / 2
+    return expr
+
+
+def _timed(f: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    f()
+    return time.perf_counter() - start
+
+
+@cli.command()
+def shared_subtrees(rules: int = 2000, depth: int = 50) -> None:
+    """
+    Renders `rules` rules which all reference a subtree of the given depth.
+
+    The "fresh" case builds a new copy of the subtree for every rule, so nothing can
+    be reused between renders. The "shared" case builds the subtree once, which is
+    how rule libraries reuse expressions, and benefits from the per-node render cache.
+    """
+
+    def fresh() -> None:
+        for i in range(rules):
+            (shared_tree(depth) > i).render()
+
+    shared = shared_tree(depth)
+
+    def reused() -> None:
+        for i in range(rules):
+            (shared > i).render()
+
+    fresh_time = _timed(fresh)
+    build_time = _timed(lambda: [shared_tree(depth) for _ in range(rules)])
+    shared_time = _timed(reused)
+
+    print(f"rules={rules} depth={depth}")
+    print(f"fresh subtrees:  {fresh_time - build_time:.4f}s (excluding tree build)")
+    print(f"shared subtree:  {shared_time:.4f}s")
+    print(f"speedup:         {(fresh_time - build_time) / shared_time:.1f}x")
+
+
+def or_chain(nodes: int) -> ql.InstantVector:
+    """
+    or_chain builds a left-deep chain of `or` with roughly `nodes` nodes, the shape
+    functools.reduce produces in AlertForMissingData and AlertsForAssertions.
+    """
+    v = ql.Selector()
+    # each link adds a BinaryOp, a TransformFunc and a SelectedInstantVector
+    links = max(nodes // 3, 1)
+    expr: ql.InstantVector = ql.absent(v.metric_0)
+    for i in range(1, links):
+        expr = expr.or_(ql.absent(v.get(f"metric_{i}")(job="api")))
+    return expr
+
+
+@cli.command()
+def deep_tree(nodes: int = 10_000, repeat: int = 20) -> None:
+    """
+    Renders and visits left-deep trees of roughly `nodes` nodes. Trees this deep
+    exceed the default recursion limit, so this also checks that neither rendering
+    nor visiting recurses.
+    """
+    trees = [or_chain(nodes) for _ in range(repeat)]
+
+    def render() -> None:
+        for t in trees:
+            t.render()
+
+    visited = 0
+
+    def visitor(t: ql.Timeseries) -> None:
+        nonlocal visited
+        visited += 1
+
+    def visit() -> None:
+        for t in trees:
+            t.accept_visitor(visitor)
+
+    render_time = _timed(render)
+    visit_time = _timed(visit)
+
+    print(f"nodes={visited // repeat} repeat={repeat}")
+    print(f"render: {render_time / repeat * 1000:.2f}ms per tree")
+    print(f"visit:  {visit_time / repeat * 1000:.2f}ms per tree")
+
+
+@cli.command()
+def durations(count: int = 100_000) -> None:
+    """
+    Builds and renders `count` durations the way range selectors, subqueries and
+    rule intervals use them.
+    """
+    scales = [(5, ql.Minute), (30, ql.Second), (1, ql.Hour), (90, ql.Second)]
+
+    def build() -> list[ql.Duration]:
+        return [n * unit for n, unit in scales for _ in range(count // len(scales))]
+
+    built = build()
+    build_time = _timed(build)
+    render_time = _timed(lambda: [d.render() for d in built])
+    rerender_time = _timed(lambda: [d.render() for d in built])
+
+    print(f"durations={len(built)}")
+    print(f"build:    {build_time * 1000:.1f}ms")
+    print(f"render:   {render_time * 1000:.1f}ms")
+    print(f"rerender: {rerender_time * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,77 @@
+"""Serialization benchmarks for heracles expression trees."""
+
+from __future__ import annotations
+
+import pickle
+import time
+from collections.abc import Callable
+from typing import Any
+
+import typer
+
+from heracles import ql
+from heracles.ql import assertions
+
+cli = typer.Typer()
+
+
+def synthetic_rule(i: int) -> ql.InstantVector:
+    """
+    synthetic_rule builds one alert expression shaped like the rules in a typical
+    service library, with an assertion annotation on one of its selectors.
+    """
+    v = ql.Selector()
+    service = f"service_{i % 50}"
+    errors = ql.sum(
+        ql.rate(
+            v.http_requests_total(service=service, code=ql.RE("5.."))[5 * ql.Minute]
+        )
+    ).by("instance")
+    total = ql.sum(ql.rate(v.http_requests_total(service=service)[5 * ql.Minute])).by(
+        "instance"
+    )
+    up = ql.max_over_time(
+        v.up(service=service).annotate(assertions.assert_exists)[ql.Minute]
+    )
+    return ((errors / total) > 0.05 + i % 3).and_(up == 1)
+
+
+def _timed(f: Callable[[], Any], repeat: int) -> tuple[float, Any]:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        res = f()
+    return (time.perf_counter() - start) / repeat, res
+
+
+@cli.command()
+def project(rules: int = 10_000, repeat: int = 5) -> None:
+    """
+    Serializes the expressions of a synthetic project with `rules` rules using
+    pickle and heracles' binary encoding, and reports the size of the output and
+    the time taken to dump and load it.
+    """
+    exprs = [synthetic_rule(i) for i in range(rules)]
+
+    pickle_dump, pickled = _timed(
+        lambda: pickle.dumps(exprs, protocol=pickle.HIGHEST_PROTOCOL), repeat
+    )
+    pickle_load, _ = _timed(lambda: pickle.loads(pickled), repeat)
+    ql_dump, encoded = _timed(lambda: ql.dumps_many(exprs), repeat)
+    ql_load, loaded = _timed(lambda: ql.loads_many(encoded), repeat)
+
+    assert [e.render() for e in loaded] == [e.render() for e in exprs]
+
+    print(f"rules={rules}")
+    print(f"{'':8}{'size':>12}{'dump':>12}{'load':>12}")
+    for name, size, dump, load in (
+        ("pickle", len(pickled), pickle_dump, pickle_load),
+        ("heracles", len(encoded), ql_dump, ql_load),
+    ):
+        print(
+            f"{name:8}{size / 1024:>9.0f}KiB"
+            f"{dump * 1000:>10.1f}ms{load * 1000:>10.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    cli()
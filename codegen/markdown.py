@@ -48,10 +48,17 @@ def generate_funcs(input_file: str, python_module: str) -> None:
     functions, the simple heuristics implemented here don't work. For those functions,
     we record that parsing didn't work.
 
-    Finally, we generate 2 files in the python_module directory:
-    1. generated.py with the generated python functions
-    2. __init__.py with imports for each of the generated functions and each of the
-    functions we failed to parse
+    Finally, we generate 4 files:
+    1. _func_table.py next to the python_module directory, with a row for each
+    generated function: its name, node type, cost class and parameters. This is
+    loaded by heracles.ql.registry, which builds all of the functions through one
+    constructor
+    2. generated.py in the python_module directory, which exports a builder for each
+    row of the table
+    3. generated.pyi in the python_module directory, with the signature of each
+    generated function for type checkers
+    4. __init__.py in the python_module directory, with imports for each of the
+    generated functions and each of the functions we failed to parse
 
     By generating imports for the functions we couldn't parse, we force the user
     to hand write those functions or the main package unit tests will fail. They must
@@ -123,6 +130,9 @@ def generate_funcs(input_file: str, python_module: str) -> None:
 
     init_file = output_dir.joinpath("__init__.py")
     generated_file = output_dir.joinpath("generated.py")
+    stub_file = output_dir.joinpath("generated.pyi")
+    table_file = output_dir.parent.joinpath("_func_table.py")
+    names_file = output_dir.parent.joinpath("_func_names.py")
 
     all_defined_func_names = [f.name for f in specs.all_defined()]
 
@@ -133,17 +143,78 @@ def generate_funcs(input_file: str, python_module: str) -> None:
         hand_written_imports = ",".join(f.name for f in specs.al_undefined())
         import_all_hand_written = f"from .handwritten import {hand_written_imports}\n"
 
-        all_entries = ",\n    ".join(f'"{f.name}"' for f in specs.funcs)
+        all_names = sorted((f.name for f in specs.funcs), key=_natural_sort_key)
+        all_entries = ",\n    ".join(f'"{name}"' for name in all_names)
         all_defn = f"__all__ = [{all_entries}\n]\n"
         file.writelines((import_all_generated, import_all_hand_written, all_defn))
 
+    with names_file.open("w") as file:
+        name_entries = "".join(f'    "{name}",\n' for name in all_names)
+        file.write(
+            "# generated by codegen/markdown.py: the name of every function in\n"
+            "# heracles.ql.funcs, which heracles.ql exports without importing it\n"
+            f"FUNC_NAMES = (\n{name_entries})\n"
+        )
+
+    with table_file.open("w") as file:
+        rows = "".join(f"    {f.as_table_row()},\n" for f in specs.all_defined())
+        file.write(
+            "# generated by codegen/markdown.py: a row for each function which\n"
+            "# heracles.ql.funcs.generated builds, as\n"
+            "# (name, node type, cost class, ((param, kind, variadic), ...))\n"
+            "from typing import Any\n\n"
+            f"FUNC_TABLE: tuple[tuple[Any, ...], ...] = (\n{rows})\n"
+        )
+
     with generated_file.open("w") as file:
+        file.write(
+            "# generated by codegen/markdown.py: builds a function for each row of\n"
+            "# heracles/ql/_func_table.py. Their signatures are in generated.pyi\n"
+            "from heracles.ql import registry\n\n"
+            "globals().update(registry._generated_builders())\n"
+        )
+
+    with stub_file.open("w") as file:
         file.write("from heracles.ql import prelude\n")
         for f in specs.all_defined():
-            file.write(f.as_python())
+            file.write(f.as_stub())
             file.write("\n")
 
 
+def _natural_sort_key(name: str) -> list[str | int]:
+    """
+    Orders names the way ruff sorts __all__, with runs of digits compared as
+    numbers (log2 before log10).
+    """
+    return [int(part) if part.isdigit() else part for part in re.split(r"(\d+)", name)]
+
+
+# PARAM_KINDS maps the python types of generated arguments to the kinds in
+# heracles.ql.registry.ParamKind
+PARAM_KINDS = {
+    "prelude.RangeVector": "range",
+    "prelude.InstantOrRangeVector": "instant_or_range",
+    "int | float | prelude.InstantVector": "scalar",
+    "str": "string",
+    "str | None": "optional_string",
+}
+
+# SORTING_FUNCTIONS sort or bucket the samples of each series, instead of doing a
+# constant amount of work per sample. See heracles.ql.registry.CostClass
+SORTING_FUNCTIONS = frozenset(
+    {
+        "count_values_over_time",
+        "distinct_over_time",
+        "histogram_over_time",
+        "mad_over_time",
+        "median_over_time",
+        "mode_over_time",
+        "outlier_iqr_over_time",
+        "quantile_over_time",
+    }
+)
+
+
 class FunctionArg(pydantic.BaseModel):
     name: str
     py_type: str
@@ -155,10 +226,8 @@ class FunctionArg(pydantic.BaseModel):
             res = "*" + res
         return res
 
-    def as_python_reference(self) -> str:
-        if self.variadic:
-            return f"*{self.name}"
-        return self.name
+    def as_table_entry(self) -> tuple[str, str, bool]:
+        return (self.name, PARAM_KINDS[self.py_type], self.variadic)
 
 
 class FunctionDef(pydantic.BaseModel):
@@ -166,13 +235,15 @@ class FunctionDef(pydantic.BaseModel):
     args: list[FunctionArg]
     return_type: str
 
-    def as_python(self) -> str:
+    def as_stub(self) -> str:
         args = ", ".join(f"{arg.as_python()}" for arg in self.args)
-        params = ", ".join(arg.as_python_reference() for arg in self.args)
-        return (
-            f"def {self.name}({args}) -> {self.return_type}:\n"
-            + f'    return {self.return_type}("{self.name}", {params})'
-        )
+        return f"def {self.name}({args}) -> {self.return_type}: ..."
+
+    def as_table_row(self) -> str:
+        node_type = self.return_type.removeprefix("prelude.")
+        cost_class = "sorting" if self.name in SORTING_FUNCTIONS else "linear"
+        params = tuple(arg.as_table_entry() for arg in self.args)
+        return repr((self.name, node_type, cost_class, params))
 
 
 class FailedFunctionDef(pydantic.BaseModel):
@@ -3,11 +3,22 @@ package main
 // #include <stdlib.h>
 import "C"
 import (
+	"encoding/binary"
+	"fmt"
+	"math"
+	"runtime"
+	"strconv"
+	"strings"
+	"sync"
+	"sync/atomic"
 	"unsafe"
 
 	"github.com/VictoriaMetrics/metricsql"
 )
 
+// formatFailed is written in place of a result's length when it can't be formatted
+const formatFailed = 0xFFFFFFFF
+
 //export Format
 func Format(input *C.char) *C.char {
 	inputStr := C.GoString(input)
@@ -19,6 +30,370 @@ func Format(input *C.char) *C.char {
 	return C.CString(res)
 }
 
+// FormatMany formats a batch of queries in parallel. The input buffer holds each
+// query as a little endian uint32 length followed by its UTF-8 bytes. The result is
+// a buffer in the same layout, with a length of formatFailed for queries which
+// couldn't be parsed. Its size is written to outLength, and it must be released with
+// FreeStr. Returns NULL if the input buffer is malformed.
+//
+//export FormatMany
+func FormatMany(input *C.char, length C.int, outLength *C.int) *C.char {
+	queries, ok := splitQueries(C.GoBytes(unsafe.Pointer(input), length))
+	if !ok {
+		return nil
+	}
+
+	results := make([]string, len(queries))
+	failed := make([]bool, len(queries))
+	forEachParallel(len(queries), func(i int) {
+		res, err := metricsql.Prettify(queries[i])
+		results[i], failed[i] = res, err != nil
+	})
+
+	size := 0
+	for _, res := range results {
+		size += 4 + len(res)
+	}
+	// malloc(0) may return NULL, which would read as a malformed input
+	out := C.malloc(C.size_t(size + 1))
+	dst := unsafe.Slice((*byte)(out), size)
+	pos := 0
+	for i, res := range results {
+		n := uint32(len(res))
+		if failed[i] {
+			n = formatFailed
+		}
+		binary.LittleEndian.PutUint32(dst[pos:], n)
+		pos += 4
+		pos += copy(dst[pos:], res)
+	}
+	*outLength = C.int(size)
+	return (*C.char)(out)
+}
+
+// ValidateMany parses a batch of queries in parallel, taking the same input as
+// FormatMany. For each query the result holds a little endian uint32 length, an
+// int32 byte offset and then that many bytes of error message. Valid queries have
+// an empty message. The offset is where parsing failed, or -1 if it isn't known. The
+// result's size is written to outLength, and it must be released with FreeStr.
+// Returns NULL if the input buffer is malformed.
+//
+//export ValidateMany
+func ValidateMany(input *C.char, length C.int, outLength *C.int) *C.char {
+	queries, ok := splitQueries(C.GoBytes(unsafe.Pointer(input), length))
+	if !ok {
+		return nil
+	}
+
+	messages := make([]string, len(queries))
+	offsets := make([]int32, len(queries))
+	forEachParallel(len(queries), func(i int) {
+		if _, err := metricsql.Parse(queries[i]); err != nil {
+			messages[i] = err.Error()
+			offsets[i] = errorOffset(queries[i], messages[i])
+		}
+	})
+
+	var buf []byte
+	for i, msg := range messages {
+		buf = binary.LittleEndian.AppendUint32(buf, uint32(len(msg)))
+		buf = binary.LittleEndian.AppendUint32(buf, uint32(offsets[i]))
+		buf = append(buf, msg...)
+	}
+	return toC(buf, outLength)
+}
+
+// errorOffset guesses where parsing query failed from a metricsql error, which
+// quotes the remainder of the query from the token it failed at. The shortest
+// quoted remainder is the innermost failure. Returns -1 if nothing in the message
+// is a remainder of the query.
+func errorOffset(query, msg string) int32 {
+	offset := int32(-1)
+	for i := strings.IndexByte(msg, '"'); i >= 0; {
+		quoted, err := strconv.QuotedPrefix(msg[i:])
+		if err != nil {
+			i = nextQuote(msg, i+1)
+			continue
+		}
+		if s, err := strconv.Unquote(quoted); err == nil && s != "" && strings.HasSuffix(query, s) {
+			offset = max(offset, int32(len(query)-len(s)))
+		}
+		i = nextQuote(msg, i+len(quoted))
+	}
+	return offset
+}
+
+func nextQuote(msg string, from int) int {
+	if i := strings.IndexByte(msg[from:], '"'); i >= 0 {
+		return from + i
+	}
+	return -1
+}
+
+// splitQueries splits a buffer of length prefixed queries. The queries share buf's
+// memory rather than each being copied.
+func splitQueries(buf []byte) ([]string, bool) {
+	var queries []string
+	for len(buf) > 0 {
+		if len(buf) < 4 {
+			return nil, false
+		}
+		n := binary.LittleEndian.Uint32(buf)
+		buf = buf[4:]
+		if uint64(len(buf)) < uint64(n) {
+			return nil, false
+		}
+		query := ""
+		if n > 0 {
+			query = unsafe.String(&buf[0], n)
+		}
+		queries = append(queries, query)
+		buf = buf[n:]
+	}
+	return queries, true
+}
+
+// forEachParallel calls fn with every index below n, spread over GOMAXPROCS
+// goroutines.
+func forEachParallel(n int, fn func(i int)) {
+	workers := min(runtime.GOMAXPROCS(0), n)
+	var next atomic.Int64
+	var wg sync.WaitGroup
+	for range workers {
+		wg.Add(1)
+		go func() {
+			defer wg.Done()
+			for {
+				i := int(next.Add(1) - 1)
+				if i >= n {
+					return
+				}
+				fn(i)
+			}
+		}()
+	}
+	wg.Wait()
+}
+
+// toC copies buf into memory allocated by malloc, writing its size to outLength.
+func toC(buf []byte, outLength *C.int) *C.char {
+	// malloc(0) may return NULL, which would read as a failure
+	out := C.malloc(C.size_t(len(buf) + 1))
+	copy(unsafe.Slice((*byte)(out), len(buf)), buf)
+	*outLength = C.int(len(buf))
+	return (*C.char)(out)
+}
+
+// node tags of the binary AST written by Parse, which must match heracles/ql/parsing.py
+const (
+	tagNumber byte = iota + 1
+	tagString
+	tagDuration
+	tagSelector
+	tagRollup
+	tagFunc
+	tagAggr
+	tagBinaryOp
+)
+
+// flags of a rollup node, recording which of its optional parts are present
+const (
+	rollupWindow byte = 1 << iota
+	rollupStep
+	rollupInheritStep
+	rollupOffset
+	rollupAt
+)
+
+// Parse parses a query, returning a buffer which starts with a status byte. If it's
+// 0 the rest of the buffer is the query's AST, written in postorder so that it can
+// be decoded without recursion:
+//
+//   - numbers are tagNumber and a float64
+//   - strings are tagString and a string
+//   - durations are tagDuration, an int64 number of milliseconds and a float64
+//     number of steps
+//   - series selectors are tagSelector, a uint32 count and that many label filters,
+//     each a label string, a matcher kind byte and a value string
+//   - rollups are their expression, their @ expression if there is one, tagRollup,
+//     a flags byte and their window, step and offset durations if present
+//   - functions are their arguments, tagFunc, a byte which is 1 for rollup functions,
+//     the function name and a uint32 argument count
+//   - aggregations are their arguments, tagAggr, the name, the modifier and a uint32
+//     argument count
+//   - binary operations are their operands, tagBinaryOp, the operator, the on or
+//     ignoring modifier and the group_left or group_right modifier
+//
+// Strings are a uint32 length followed by UTF-8 bytes, modifiers are a string (empty
+// if there's no modifier), a uint32 count and that many label strings, and every
+// number is little endian. If the status is 1 the rest of the buffer is an error
+// message. The buffer's size is written to outLength, and it must be released with
+// FreeStr.
+//
+//export Parse
+func Parse(input *C.char, length C.int, outLength *C.int) *C.char {
+	query := C.GoStringN(input, length)
+	expr, err := metricsql.Parse(query)
+	var buf []byte
+	if err == nil {
+		buf, err = appendExpr([]byte{0}, expr)
+	}
+	if err != nil {
+		buf = append([]byte{1}, err.Error()...)
+	}
+	return toC(buf, outLength)
+}
+
+func appendExpr(dst []byte, expr metricsql.Expr) ([]byte, error) {
+	var err error
+	switch e := expr.(type) {
+	case *metricsql.NumberExpr:
+		dst = append(dst, tagNumber)
+		return binary.LittleEndian.AppendUint64(dst, math.Float64bits(e.N)), nil
+	case *metricsql.StringExpr:
+		return appendString(append(dst, tagString), e.S), nil
+	case *metricsql.DurationExpr:
+		return appendDuration(append(dst, tagDuration), e), nil
+	case *metricsql.MetricExpr:
+		if len(e.LabelFilterss) > 1 {
+			return nil, unsupported(expr, "series selectors joined with or")
+		}
+		var filters []metricsql.LabelFilter
+		if len(e.LabelFilterss) == 1 {
+			filters = e.LabelFilterss[0]
+		}
+		dst = append(dst, tagSelector)
+		dst = binary.LittleEndian.AppendUint32(dst, uint32(len(filters)))
+		for _, f := range filters {
+			dst = appendString(dst, f.Label)
+			dst = append(dst, matcherKind(f))
+			dst = appendString(dst, f.Value)
+		}
+		return dst, nil
+	case *metricsql.RollupExpr:
+		if dst, err = appendExpr(dst, e.Expr); err != nil {
+			return nil, err
+		}
+		var flags byte
+		if e.At != nil {
+			if dst, err = appendExpr(dst, e.At); err != nil {
+				return nil, err
+			}
+			flags |= rollupAt
+		}
+		if e.Window != nil {
+			flags |= rollupWindow
+		}
+		if e.Step != nil {
+			flags |= rollupStep
+		}
+		if e.InheritStep {
+			flags |= rollupInheritStep
+		}
+		if e.Offset != nil {
+			flags |= rollupOffset
+		}
+		dst = append(dst, tagRollup, flags)
+		for _, d := range []*metricsql.DurationExpr{e.Window, e.Step, e.Offset} {
+			if d != nil {
+				dst = appendDuration(dst, d)
+			}
+		}
+		return dst, nil
+	case *metricsql.FuncExpr:
+		if e.KeepMetricNames {
+			return nil, unsupported(expr, "keep_metric_names")
+		}
+		if dst, err = appendArgs(dst, e.Args); err != nil {
+			return nil, err
+		}
+		var rollup byte
+		if metricsql.IsRollupFunc(e.Name) {
+			rollup = 1
+		}
+		dst = append(dst, tagFunc, rollup)
+		dst = appendString(dst, strings.ToLower(e.Name))
+		return binary.LittleEndian.AppendUint32(dst, uint32(len(e.Args))), nil
+	case *metricsql.AggrFuncExpr:
+		if e.Limit > 0 {
+			return nil, unsupported(expr, "limit")
+		}
+		if dst, err = appendArgs(dst, e.Args); err != nil {
+			return nil, err
+		}
+		dst = appendString(append(dst, tagAggr), strings.ToLower(e.Name))
+		dst = appendModifier(dst, e.Modifier)
+		return binary.LittleEndian.AppendUint32(dst, uint32(len(e.Args))), nil
+	case *metricsql.BinaryOpExpr:
+		if e.Bool {
+			return nil, unsupported(expr, "the bool modifier")
+		}
+		if e.KeepMetricNames {
+			return nil, unsupported(expr, "keep_metric_names")
+		}
+		if e.JoinModifierPrefix != nil {
+			return nil, unsupported(expr, "prefix")
+		}
+		if dst, err = appendArgs(dst, []metricsql.Expr{e.Left, e.Right}); err != nil {
+			return nil, err
+		}
+		dst = appendString(append(dst, tagBinaryOp), strings.ToLower(e.Op))
+		dst = appendModifier(dst, e.GroupModifier)
+		return appendModifier(dst, e.JoinModifier), nil
+	}
+	return nil, unsupported(expr, "this kind of expression")
+}
+
+func appendArgs(dst []byte, args []metricsql.Expr) ([]byte, error) {
+	var err error
+	for _, arg := range args {
+		if dst, err = appendExpr(dst, arg); err != nil {
+			return nil, err
+		}
+	}
+	return dst, nil
+}
+
+func appendString(dst []byte, s string) []byte {
+	dst = binary.LittleEndian.AppendUint32(dst, uint32(len(s)))
+	return append(dst, s...)
+}
+
+func appendDuration(dst []byte, d *metricsql.DurationExpr) []byte {
+	// durations may be counted in steps (like 5i), so the number of steps is
+	// recovered from how the duration scales with the step
+	const step = 1_000_000_000
+	millis := d.Duration(0)
+	steps := float64(d.Duration(step)-millis) / step
+	dst = binary.LittleEndian.AppendUint64(dst, uint64(millis))
+	return binary.LittleEndian.AppendUint64(dst, math.Float64bits(steps))
+}
+
+func appendModifier(dst []byte, m metricsql.ModifierExpr) []byte {
+	dst = appendString(dst, strings.ToLower(m.Op))
+	dst = binary.LittleEndian.AppendUint32(dst, uint32(len(m.Args)))
+	for _, label := range m.Args {
+		dst = appendString(dst, label)
+	}
+	return dst
+}
+
+func matcherKind(f metricsql.LabelFilter) byte {
+	switch {
+	case f.IsRegexp && f.IsNegative:
+		return 3
+	case f.IsNegative:
+		return 2
+	case f.IsRegexp:
+		return 1
+	}
+	return 0
+}
+
+func unsupported(expr metricsql.Expr, feature string) error {
+	return fmt.Errorf("%s: heracles doesn't support %s", expr.AppendString(nil), feature)
+}
+
 //export FreeStr
 func FreeStr(input *C.void) {
 	C.free(unsafe.Pointer(input))
@@ -12,4 +12,8 @@ if any(not importlib.util.find_spec(dep) for dep in _required_deps):
 from heracles.config.rule import *  # noqa
 from heracles.config.contexts import *  # noqa
 from heracles.config.generation import *  # noqa
+from heracles.config.diff import *  # noqa
+from heracles.config.cse import *  # noqa
+from heracles.config.cost import *  # noqa
+from heracles.config.validation import *  # noqa
 from heracles.config import utils  # noqa
@@ -0,0 +1,128 @@
+"""Static cost reports and budgets for generated rules"""
+
+from __future__ import annotations
+
+import dataclasses
+
+from heracles import config, ql
+
+__all__ = [
+    "CostBudget",
+    "CostBudgetExceeded",
+    "GroupCost",
+    "RuleCost",
+    "cost_report",
+]
+
+
+@dataclasses.dataclass
+class RuleCost:
+    """
+    RuleCost is the estimated cost of one evaluation of a rule.
+    """
+
+    name: str
+    rule: config.RealizedRule
+    cost: float
+
+
+@dataclasses.dataclass
+class GroupCost:
+    """
+    GroupCost is the estimated cost of a rule group. cost is the cost of one
+    evaluation of every rule in the group, and cost_per_minute accounts for how
+    often the group is evaluated.
+    """
+
+    name: str
+    interval: ql.Duration
+    cost: float
+    rules: list[RuleCost]
+
+    @property
+    def cost_per_minute(self) -> float:
+        return self.cost * ql.Minute.time_value / max(1, self.interval.time_value)
+
+
+def cost_report(
+    rules_config: config.PrometheusRulesConfig, model: ql.CostModel | None = None
+) -> list[GroupCost]:
+    """
+    Estimates the cost of every rule and group in a config, using model or the
+    default ql.CostModel. Rules are costed as they're written to the config. A
+    group's own evaluation interval, if it has one, replaces the model's evaluation
+    interval. Interval units in it (see ql.I) are resolved against the model's.
+    """
+    model = model or ql.CostModel()
+    report = []
+    for group in rules_config.groups:
+        group_model = model
+        if group.interval is not None:
+            group_model = dataclasses.replace(
+                model, evaluation_interval=model.resolve(group.interval)
+            )
+        rules = [
+            RuleCost(
+                name=rule.name,
+                rule=rule,
+                cost=group_model.cost(rule.expr),
+            )
+            for rule in group.rules
+        ]
+        report.append(
+            GroupCost(
+                name=group.name,
+                interval=group_model.evaluation_interval,
+                cost=sum(r.cost for r in rules),
+                rules=rules,
+            )
+        )
+    return report
+
+
+class CostBudgetExceeded(Exception):
+    def __init__(self, violations: list[str]) -> None:
+        super().__init__("cost budget exceeded:\n" + "\n".join(violations))
+        self.violations = violations
+
+
+@dataclasses.dataclass(frozen=True)
+class CostBudget:
+    """
+    CostBudget is a hard limit on the estimated cost of generated rules. Passing
+    one to HeraclesProject makes generation fail, rather than ship rules which
+    would overload the query layer.
+
+    max_rule_cost limits the cost of one evaluation of any rule, and
+    max_group_cost_per_minute limits the cost of a group per minute of
+    evaluation. Either may be None to leave it unlimited.
+    """
+
+    max_rule_cost: float | None = None
+    max_group_cost_per_minute: float | None = None
+    model: ql.CostModel = dataclasses.field(default_factory=ql.CostModel)
+
+    def check(self, rules_config: config.PrometheusRulesConfig) -> list[GroupCost]:
+        """
+        Returns the cost report for the config, or raises CostBudgetExceeded
+        listing every rule and group which is over budget.
+        """
+        report = cost_report(rules_config, self.model)
+        violations = []
+        for group in report:
+            if self.max_rule_cost is not None:
+                for rule in group.rules:
+                    if rule.cost > self.max_rule_cost:
+                        violations.append(
+                            f"rule '{rule.name}' in group '{group.name}' costs "
+                            f"{rule.cost:g}, over the limit of {self.max_rule_cost:g}"
+                        )
+            limit = self.max_group_cost_per_minute
+            if limit is not None and group.cost_per_minute > limit:
+                violations.append(
+                    f"group '{group.name}' costs {group.cost_per_minute:g} per "
+                    f"minute, over the limit of {limit:g}"
+                )
+        if violations:
+            raise CostBudgetExceeded(violations)
+        return report
@@ -0,0 +1,247 @@
+"""Project-wide common subexpression elimination into recording rules"""
+
+from __future__ import annotations
+
+import hashlib
+import heapq
+from collections.abc import Callable
+from typing import Any
+
+from heracles import config, ql
+from heracles.config.generation import ConfigFactory, PrometheusRulesConfig
+
+__all__ = ["CommonSubexpressionConfigFactory"]
+
+
+class CommonSubexpressionConfigFactory(ConfigFactory):
+    """
+    CommonSubexpressionConfigFactory finds expensive subexpressions which are
+    repeated across the rules of a group, such as the same rate(x[5m]) aggregated
+    by the same labels in many alerts. Each one is evaluated once by a new recording
+    rule and the rules which used it select the recorded series instead.
+
+    Rollups, and aggregations over rollups, are considered. Subexpressions are
+    chosen greedily by the work they save, (uses - 1) * size, until max_series
+    recorded series have been added. estimate_series estimates the number of series
+    a recording will produce. It defaults to 1, which makes max_series a limit on
+    the number of recording rules.
+
+    Subexpressions inside subqueries and under offset or @ are left alone, since
+    they're evaluated at other times than the rule. Annotated subexpressions are
+    left alone as well. Each recording rule is added to the start of the group
+    which uses it, so it's evaluated just before its uses. Subexpressions are never
+    shared between groups: groups are evaluated independently, so a rule in another
+    group could read a series recorded up to an evaluation interval earlier.
+    Recordings are added after hooks have run, so context hooks (like
+    ConstLabelContext) don't apply to them.
+
+    Like all recording rules, recorded series carry the recording's name as their
+    __name__, which the original rollup or aggregation would have dropped.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_series: int,
+        estimate_series: Callable[[ql.InstantVector], int] | None = None,
+        min_uses: int = 2,
+        name_prefix: str = "cse",
+    ) -> None:
+        self.max_series = max_series
+        self.estimate_series = estimate_series or (lambda _: 1)
+        self.min_uses = min_uses
+        self.name_prefix = name_prefix
+        self.recordings: list[config.RealizedRecording] = []
+        # realized and rewritten rules, keyed by the id of their bundle
+        self._prepared: dict[
+            int, tuple[config.RuleBundle, list[config.RealizedRule]]
+        ] = {}
+
+    def prepare(self, bundles: list[config.RuleBundle]) -> None:
+        self.recordings = []
+        self._prepared = {}
+        realized = [(b, list(b.dump())) for b in bundles]
+        interner = ql.Interner()
+        exprs: list[list[ql.Timeseries]] = [
+            [interner.intern(r.expr) for r in rules] for _, rules in realized
+        ]
+
+        selected = self._select(exprs)
+        recordings: list[list[config.RealizedRecording]] = [[] for _ in realized]
+        replacements: list[dict[int, ql.Timeseries]] = [{} for _ in realized]
+        # inner subexpressions are smaller than the ones which contain them, so
+        # sorting by size puts every recording after the ones it depends on
+        for group, node in sorted(selected, key=lambda s: _size(s[1])):
+            bundle, _ = realized[group]
+            name = self._recording_name(node, bundle.name)
+            replacements[group][id(node)] = ql.SelectedInstantVector(name=name)
+            # nodes which only differ in annotations render the same, so they get
+            # the same name and share the recording of the first of them
+            if any(r.name == name for r in recordings[group]):
+                continue
+            recording = config.RealizedRecording(
+                name=name,
+                raw_expr=node._map_children(lambda c: _replace(c, replacements[group])),
+            )
+            recordings[group].append(recording)
+            self.recordings.append(recording)
+
+        for group, (bundle, rules) in enumerate(realized):
+            rewritten: list[config.RealizedRule] = [*recordings[group]]
+            for rule, expr in zip(rules, exprs[group]):
+                new_expr = _replace(expr, replacements[group])
+                if new_expr is expr:
+                    rewritten.append(rule)
+                else:
+                    rewritten.append(rule.model_copy(update={"raw_expr": new_expr}))
+            self._prepared[id(bundle)] = (bundle, rewritten)
+
+    def config_from_bundles(self, *bundles: config.RuleBundle) -> PrometheusRulesConfig:
+        if not all(id(b) in self._prepared for b in bundles):
+            return super().config_from_bundles(*bundles)
+        return PrometheusRulesConfig.from_realized_bundles(
+            self._prepared[id(b)] for b in bundles
+        )
+
+    def _select(
+        self, exprs: list[list[ql.Timeseries]]
+    ) -> list[tuple[int, ql.InstantVector]]:
+        """
+        Returns the subexpressions to record, with the index of the group which
+        records them.
+        """
+        # exprs have been interned, so repeated subexpressions are the same object
+        # and can be counted by id. Uses are counted per group, since recordings
+        # aren't shared between groups
+        uses: dict[tuple[int, int], int] = {}
+        nodes: dict[tuple[int, int], ql.InstantVector] = {}
+        for group, group_exprs in enumerate(exprs):
+            for expr in group_exprs:
+                for node in _replaceable_nodes(expr):
+                    if _is_candidate(node):
+                        key = (group, id(node))
+                        uses[key] = uses.get(key, 0) + 1
+                        nodes[key] = node  # type: ignore[assignment]
+
+        def savings(i: tuple[int, int]) -> int:
+            return (uses[i] - 1) * _size(nodes[i])
+
+        heap = [(-savings(i), i) for i in uses if uses[i] >= self.min_uses]
+        heapq.heapify(heap)
+        selected: list[tuple[int, ql.InstantVector]] = []
+        budget = self.max_series
+        while heap:
+            neg_savings, i = heapq.heappop(heap)
+            if -neg_savings != savings(i):
+                # uses changed since this entry was pushed
+                if uses[i] >= self.min_uses:
+                    heapq.heappush(heap, (-savings(i), i))
+                continue
+            cost = self.estimate_series(nodes[i])
+            if cost > budget:
+                continue
+            budget -= cost
+            group, _ = i
+            selected.append((group, nodes[i]))
+            # once recorded, the subexpressions inside this one are only evaluated
+            # by its recording rule, rather than once per use
+            for inner in _replaceable_nodes(nodes[i]):
+                if inner is not nodes[i] and (group, id(inner)) in uses:
+                    uses[group, id(inner)] -= uses[i] - 1
+        return selected
+
+    def _recording_name(self, node: ql.InstantVector, group: str) -> str:
+        metric = "expr"
+
+        def find_metric(t: ql.SelectedInstantVector) -> ql.VisitorAction | None:
+            nonlocal metric
+            if t.name:
+                metric = t.name
+                return ql.VisitorAction.STOP
+            return None
+
+        node.accept_visitor(find_metric)
+        # the group is part of the digest, so recordings of the same subexpression
+        # in different groups don't write the same series
+        digest = hashlib.sha256(f"{group}\n{node.render()}".encode()).hexdigest()[:12]
+        return f"{self.name_prefix}:{metric}:{digest}"
+
+
+def _is_candidate(node: Any) -> bool:
+    if isinstance(node, ql.RollupFunc):
+        return not node.is_annotated()
+    if not isinstance(node, ql.BaseAggrFunc) or node.is_annotated():
+        return False
+    has_rollup = False
+
+    def find_rollup(t: ql.RollupFunc) -> ql.VisitorAction:
+        nonlocal has_rollup
+        has_rollup = True
+        return ql.VisitorAction.STOP
+
+    node.accept_visitor(find_rollup)
+    return has_rollup
+
+
+_BLOCKING_TYPES = (ql.SubqueryRangeVector, ql.OffsetOp, ql.AtOp)
+
+
+def _replaceable_nodes(root: ql.Timeseries) -> list[ql.Timeseries]:
+    """
+    Returns every occurrence of a node in the tree which could be replaced by a
+    recorded series, that is every node which isn't inside a subquery or under
+    offset or @. Shared nodes are listed once per occurrence.
+    """
+    found = []
+    stack: list[Any] = [root]
+    while stack:
+        node = stack.pop()
+        if not isinstance(node, ql.Timeseries):
+            continue
+        found.append(node)
+        if not isinstance(node, _BLOCKING_TYPES):
+            stack.extend(node._children_to_visit())
+    return found
+
+
+def _size(root: ql.Timeseries) -> int:
+    size = 0
+
+    def count(t: ql.Timeseries) -> None:
+        nonlocal size
+        size += 1
+
+    root.accept_visitor(count)
+    return size
+
+
+def _replace(
+    root: ql.Timeseries, replacements: dict[int, ql.Timeseries]
+) -> ql.Timeseries:
+    """
+    Returns root with each replaceable node whose id is in replacements replaced.
+    Unchanged subtrees are returned as-is.
+    """
+    done: dict[int, ql.Timeseries] = {}
+    # each entry is a node and whether its children have already been pushed
+    stack: list[tuple[ql.Timeseries, bool]] = [(root, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if id(node) in done:
+            continue
+        if expanded:
+            done[id(node)] = node._map_children(lambda c: done.get(id(c), c))
+            continue
+        if id(node) in replacements:
+            done[id(node)] = replacements[id(node)]
+            continue
+        if isinstance(node, _BLOCKING_TYPES):
+            done[id(node)] = node
+            continue
+        stack.append((node, True))
+        stack.extend(
+            (c, False)
+            for c in node._children_to_visit()
+            if isinstance(c, ql.Timeseries)
+        )
+    return done[id(root)]
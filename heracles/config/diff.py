@@ -0,0 +1,236 @@
+"""Structural diffs of realized rules and rule groups"""
+
+from __future__ import annotations
+
+import collections
+import dataclasses
+from collections.abc import Hashable, Iterable, Sequence
+from typing import TypeVar
+
+from heracles import config, ql
+
+__all__ = ["GroupChange", "RuleChange", "diff_configs", "diff_rule", "diff_rules"]
+
+
+@dataclasses.dataclass
+class RuleChange:
+    """
+    RuleChange describes how one rule differs between two versions of a project.
+    old is None for added rules and new is None for removed rules. moved is set for
+    rules whose position relative to the other rules in their group changed, which
+    matters since rules in a group are evaluated in order.
+    """
+
+    name: str
+    old: config.RealizedRule | None
+    new: config.RealizedRule | None
+    # the names of the changed fields, e.g. ["expr", "labels"]
+    changed_fields: list[str]
+    # the structural edits to the rule's expression, if it changed
+    expr_edits: list[ql.Edit]
+    moved: bool = False
+
+    @property
+    def added(self) -> bool:
+        return self.old is None
+
+    @property
+    def removed(self) -> bool:
+        return self.new is None
+
+
+@dataclasses.dataclass
+class GroupChange:
+    """
+    GroupChange describes how one rule group differs between two configs. old is
+    None for added groups and new is None for removed groups. moved is set for
+    groups whose position relative to the other groups changed.
+    """
+
+    name: str
+    old: config.PrometheusRuleGroup | None
+    new: config.PrometheusRuleGroup | None
+    interval_changed: bool
+    rule_changes: list[RuleChange]
+    moved: bool = False
+
+
+def diff_rule(old: config.RealizedRule, new: config.RealizedRule) -> RuleChange | None:
+    """
+    Compares two versions of a rule field by field. Expressions are compared
+    structurally with ql.diff. Returns None if the rules are the same.
+    """
+    changed: list[str] = []
+    if type(old) is not type(new):
+        changed.append("type")
+    for field in type(new).model_fields:
+        if field == "raw_expr":
+            continue
+        if getattr(old, field, None) != getattr(new, field, None):
+            changed.append(field)
+    # expr is computed and may call the rule's expression function, so it's only
+    # evaluated once per rule
+    expr_edits = ql.diff(old.expr, new.expr)
+    if expr_edits:
+        changed.append("expr")
+    if not changed:
+        return None
+    return RuleChange(
+        name=new.name,
+        old=old,
+        new=new,
+        changed_fields=changed,
+        expr_edits=expr_edits,
+    )
+
+
+def diff_rules(
+    old: Iterable[config.RealizedRule], new: Iterable[config.RealizedRule]
+) -> list[RuleChange]:
+    """
+    Compares two versions of a list of rules and returns a change for every rule
+    which was added, removed, modified or moved.
+
+    Rules are matched by kind (alert or recording) and name. Several rules may
+    share a name, for example alerts with the same name and different thresholds,
+    in which case they're matched in the order they appear. The fewest rules which
+    account for a change in order are reported as moved: those outside the longest
+    common subsequence of the old and new orders.
+    """
+    old_rules = _keyed_rules(old)
+    new_rules = _keyed_rules(new)
+    moved = _moved(list(old_rules), list(new_rules))
+    changes: list[RuleChange] = []
+    for key, new_rule in new_rules.items():
+        old_rule = old_rules.pop(key, None)
+        if old_rule is None:
+            changes.append(
+                RuleChange(
+                    name=new_rule.name,
+                    old=None,
+                    new=new_rule,
+                    changed_fields=[],
+                    expr_edits=[],
+                )
+            )
+        elif change := diff_rule(old_rule, new_rule):
+            change.moved = key in moved
+            changes.append(change)
+        elif key in moved:
+            changes.append(
+                RuleChange(
+                    name=new_rule.name,
+                    old=old_rule,
+                    new=new_rule,
+                    changed_fields=[],
+                    expr_edits=[],
+                    moved=True,
+                )
+            )
+    for old_rule in old_rules.values():
+        changes.append(
+            RuleChange(
+                name=old_rule.name,
+                old=old_rule,
+                new=None,
+                changed_fields=[],
+                expr_edits=[],
+            )
+        )
+    return changes
+
+
+def diff_configs(
+    old: config.PrometheusRulesConfig, new: config.PrometheusRulesConfig
+) -> list[GroupChange]:
+    """
+    Compares two generated configs and returns a change for every group which was
+    added, removed, modified or moved, including groups whose rules were only
+    reordered. Unchanged groups are left out, so the result is the set of groups
+    which need to be reloaded.
+    """
+    old_groups = {g.name: g for g in old.groups}
+    moved = _moved(list(old_groups), [g.name for g in new.groups])
+    changes: list[GroupChange] = []
+    for new_group in new.groups:
+        old_group = old_groups.pop(new_group.name, None)
+        if old_group is None:
+            changes.append(
+                GroupChange(
+                    name=new_group.name,
+                    old=None,
+                    new=new_group,
+                    interval_changed=new_group.interval is not None,
+                    rule_changes=diff_rules([], new_group.rules),
+                )
+            )
+            continue
+        interval_changed = old_group.interval != new_group.interval
+        rule_changes = diff_rules(old_group.rules, new_group.rules)
+        if interval_changed or rule_changes or new_group.name in moved:
+            changes.append(
+                GroupChange(
+                    name=new_group.name,
+                    old=old_group,
+                    new=new_group,
+                    interval_changed=interval_changed,
+                    rule_changes=rule_changes,
+                    moved=new_group.name in moved,
+                )
+            )
+    for old_group in old_groups.values():
+        changes.append(
+            GroupChange(
+                name=old_group.name,
+                old=old_group,
+                new=None,
+                interval_changed=old_group.interval is not None,
+                rule_changes=diff_rules(old_group.rules, []),
+            )
+        )
+    return changes
+
+
+def _keyed_rules(
+    rules: Iterable[config.RealizedRule],
+) -> dict[tuple[type, str, int], config.RealizedRule]:
+    seen: collections.Counter[tuple[type, str]] = collections.Counter()
+    keyed = {}
+    for r in rules:
+        kind = type(r)
+        keyed[(kind, r.name, seen[(kind, r.name)])] = r
+        seen[(kind, r.name)] += 1
+    return keyed
+
+
+_K = TypeVar("_K", bound=Hashable)
+
+
+def _moved(old: Sequence[_K], new: Sequence[_K]) -> set[_K]:
+    """
+    Returns the keys in both old and new which aren't part of the longest common
+    subsequence of the two, so they have to move to turn old's order into new's.
+    """
+    common = set(old) & set(new)
+    a = [k for k in old if k in common]
+    b = [k for k in new if k in common]
+    # lengths[i][j] is the length of the longest common subsequence of a[i:], b[j:]
+    lengths = [[0] * (len(b) + 1) for _ in range(len(a) + 1)]
+    for i in reversed(range(len(a))):
+        for j in reversed(range(len(b))):
+            if a[i] == b[j]:
+                lengths[i][j] = lengths[i + 1][j + 1] + 1
+            else:
+                lengths[i][j] = max(lengths[i + 1][j], lengths[i][j + 1])
+    kept = set()
+    i = j = 0
+    while i < len(a) and j < len(b):
+        if a[i] == b[j]:
+            kept.add(a[i])
+            i += 1
+            j += 1
+        elif lengths[i + 1][j] >= lengths[i][j + 1]:
+            i += 1
+        else:
+            j += 1
+    return common - kept
@@ -3,66 +3,119 @@
 from __future__ import annotations
 
 import collections
+import functools
 import importlib
 import logging
 import os
 import pathlib
 import pkgutil
+from collections.abc import Iterable
 from types import ModuleType
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import pydantic
-import yaml
 
 from heracles import config, ql
 
+if TYPE_CHECKING:
+    import yaml
+
 log = logging.getLogger(__name__)
 
 
-class _MultilineDumper(yaml.Dumper):
-    def represent_str(self, data: str) -> yaml.ScalarNode:
-        if "\n" in data:
-            return self.represent_scalar("tag:yaml.org,2002:str", data, style="|")
-        return self.represent_scalar("tag:yaml.org,2002:str", data)
+@functools.cache
+def _multiline_dumper() -> type[yaml.Dumper]:
+    # yaml is only imported once a config is dumped, since importing heracles.config
+    # shouldn't pay for it
+    import yaml
+
+    class _MultilineDumper(yaml.Dumper):
+        def represent_str(self, data: str) -> yaml.ScalarNode:
+            if "\n" in data:
+                return self.represent_scalar("tag:yaml.org,2002:str", data, style="|")
+            return self.represent_scalar("tag:yaml.org,2002:str", data)
+
+    _MultilineDumper.add_representer(str, _MultilineDumper.represent_str)
+    return _MultilineDumper
 
 
-_MultilineDumper.add_representer(str, _MultilineDumper.represent_str)
+def _dump_yaml(data: dict[str, Any]) -> str:
+    import yaml
+
+    return yaml.dump(data, Dumper=_multiline_dumper(), sort_keys=False)
 
 
 class ConfigFactory:
+    def prepare(self, bundles: list[config.RuleBundle]) -> None:
+        """
+        Called with every bundle in a project before any configs are generated.
+        Factories which optimize across the whole project override this to realize
+        and rewrite the project's rules up front.
+        """
+
     def config_from_bundles(self, *bundles: config.RuleBundle) -> PrometheusRulesConfig:
         return PrometheusRulesConfig.from_bundles(*bundles)
 
 
 class PrometheusRulesConfig(pydantic.BaseModel):
+    # schemas are built when the first config is created, not on import
+    model_config = pydantic.ConfigDict(defer_build=True)
     groups: list[PrometheusRuleGroup]
 
-    def as_yaml(self) -> str:
-        return yaml.dump(
-            self.model_dump(exclude_none=True),
-            Dumper=_MultilineDumper,
-            sort_keys=False,
+    def as_yaml(self, *, with_templates: bool = False) -> str:
+        """
+        Renders the config as YAML. If with_templates is set, expressions which
+        repeat subexpressions are rendered with MetricsQL WITH templates (see
+        ql.render_with_templates), which vmalert understands but Prometheus
+        doesn't. Those expressions aren't formatted.
+        """
+        return _dump_yaml(self.to_dict(with_templates=with_templates))
+
+    def to_dict(self, *, with_templates: bool = False) -> dict[str, Any]:
+        """
+        Returns the config as it's written by as_yaml, before it's rendered as
+        YAML.
+        """
+        return self.model_dump(
+            exclude_none=True, context={"with_templates": with_templates}
         )
 
     @staticmethod
     def from_bundles(*bundles: config.RuleBundle) -> PrometheusRulesConfig:
+        return PrometheusRulesConfig.from_realized_bundles(
+            (b, list(b.dump())) for b in bundles
+        )
+
+    @staticmethod
+    def from_realized_bundles(
+        bundles: Iterable[tuple[config.RuleBundle, list[config.RealizedRule]]],
+    ) -> PrometheusRulesConfig:
+        """
+        Builds a config from bundles whose rules have already been realized.
+        """
         groups = []
-        for b in sorted(bundles, key=lambda b: b.name):
+        for b, rules in sorted(bundles, key=lambda b: b[0].name):
             groups.append(
                 PrometheusRuleGroup(
-                    name=b.name, rules=list(b.dump()), interval=b.evaluation_interval
+                    name=b.name, rules=rules, interval=b.evaluation_interval
                 )
             )
         return PrometheusRulesConfig(groups=groups)
 
     def model_dump(self, **kwargs: Any) -> dict[str, Any]:
-        return super().model_dump(serialize_as_any=True, **kwargs)
+        context = dict(kwargs.pop("context", None) or {})
+        if not context.get("with_templates") and "formatted_exprs" not in context:
+            rules = [r for g in self.groups for r in g.rules]
+            formatted = config.format_exprs([r.expr for r in rules])
+            context["formatted_exprs"] = {id(r): f for r, f in zip(rules, formatted)}
+        return super().model_dump(serialize_as_any=True, context=context, **kwargs)
 
 
 class PrometheusRuleGroup(pydantic.BaseModel):
     model_config = pydantic.ConfigDict(
         arbitrary_types_allowed=True,
         serialize_by_alias=True,
+        defer_build=True,
     )
     name: str
     rules: list[config.RealizedRule]
@@ -80,11 +133,13 @@ class HeraclesProject:
         self,
         *modules: ModuleType,
         config_factory: ConfigFactory | None = None,
+        cost_budget: config.CostBudget | None = None,
     ) -> None:
         self.rules_bundles: collections.defaultdict[str, list[config.RuleBundle]] = (
             collections.defaultdict(list)
         )
         self.config_factory = config_factory or ConfigFactory()
+        self.cost_budget = cost_budget
         for m in modules:
             self.register_module(m)
 
@@ -104,14 +159,48 @@ class HeraclesProject:
             log.debug("no rules bundle found in '{}'", module.__name__)
 
     def generate_files(
-        self, target_dir: pathlib.Path, file_extension: str = "rules.yml"
+        self,
+        target_dir: pathlib.Path,
+        file_extension: str = "rules.yml",
+        *,
+        with_templates: bool = False,
+        validate: bool = True,
     ) -> list[pathlib.Path]:
+        """
+        Writes a rules file for every module with rule bundles, returning their
+        paths. Nothing is written if a config is over the project's cost budget
+        (raising CostBudgetExceeded) or, if validate is set, if any generated
+        expression can't be parsed (raising InvalidRulesError).
+        """
         files: list[pathlib.Path] = []
         os.makedirs(target_dir, exist_ok=True)
-        for module, bundles in self.rules_bundles.items():
+        self.config_factory.prepare(
+            [b for bundles in self.rules_bundles.values() for b in bundles]
+        )
+        configs = {
+            module: self.config_factory.config_from_bundles(*bundles)
+            for module, bundles in self.rules_bundles.items()
+        }
+        for rules_config in configs.values():
+            # every config is checked before any file is written, so that a rule
+            # over budget doesn't leave a partially generated project behind
+            if self.cost_budget is not None:
+                self.cost_budget.check(rules_config)
+            for group in rules_config.groups:
+                for rule in group.rules:
+                    for warning in ql.unindexed_matchers(rule.expr):
+                        log.warning("rule '%s': %s", rule.name, warning)
+        dumps = {
+            module: rules_config.to_dict(with_templates=with_templates)
+            for module, rules_config in configs.items()
+        }
+        if validate:
+            errors = config.validate_syntax(dumps)
+            if errors:
+                raise config.InvalidRulesError(errors)
+        for module, dump in dumps.items():
             file_path = target_dir / f"{module}.{file_extension}"
-            config_data = self.config_factory.config_from_bundles(*bundles).as_yaml()
             with open(file_path, "w") as output_file:
-                output_file.write(config_data)
+                output_file.write(_dump_yaml(dump))
             files.append(file_path)
         return files
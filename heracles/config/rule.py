@@ -5,7 +5,8 @@ import contextlib
 import dataclasses
 import functools
 import inspect
-from collections.abc import Callable, Generator, Iterable
+import logging
+from collections.abc import Callable, Generator, Iterable, Sequence
 from typing import (
     Annotated,
     Any,
@@ -21,6 +22,8 @@ import pydantic
 
 from heracles import ql
 
+log = logging.getLogger(__name__)
+
 _Rule = TypeVar("_Rule", bound="Rule")
 _RealizedRule = TypeVar("_RealizedRule", bound="RealizedRule")
 
@@ -47,10 +50,27 @@ class Rule(abc.ABC, Generic[_RealizedRule]):  # type: ignore
         raise NotImplementedError
 
 
+def _optimize_expr(expr: ql.Timeseries) -> ql.Timeseries:
+    return ql.normalize_matchers(ql.simplify(expr))
+
+
+def format_exprs(exprs: Sequence[ql.InstantVector]) -> list[str]:
+    """
+    Renders and formats expressions as they're written to rule configs, with a
+    single call into the formatter.
+    """
+    # the formatter prints the query it parses in its own style, so it's given the
+    # smallest equivalent input
+    formatted = ql.format_many([ql.render_minimal(e) for e in exprs])
+    return [f or e.render() for f, e in zip(formatted, exprs)]
+
+
 class RealizedRule(pydantic.BaseModel, abc.ABC):
     model_config = pydantic.ConfigDict(
         arbitrary_types_allowed=True,
         serialize_by_alias=True,
+        # schemas are built when the first rule is realized, not on import
+        defer_build=True,
     )
     name: str
     raw_expr: Annotated[Expr[Self], pydantic.Field(exclude=True)]
@@ -71,9 +91,19 @@ class RealizedRule(pydantic.BaseModel, abc.ABC):
         self.raw_expr = v
 
     @pydantic.field_serializer("expr")
-    def _serialize_expr(self, expr: ql.InstantVector) -> str:
-        rendered = expr.render()
-        return ql.format(rendered) or rendered
+    def _serialize_expr(
+        self, expr: ql.InstantVector, info: pydantic.FieldSerializationInfo
+    ) -> str:
+        context = info.context or {}
+        # configs format all of their rules in one batch before serializing them
+        formatted = context.get("formatted_exprs", {}).get(id(self))
+        if formatted is not None:
+            return formatted  # type: ignore[no-any-return]
+        if context.get("with_templates"):
+            # formatting would expand the templates again
+            return ql.render_with_templates(expr)
+        (formatted,) = format_exprs([expr])
+        return formatted
 
     @abc.abstractmethod
     def _field_order(self) -> list[str]:
@@ -312,6 +342,7 @@ class RealizedRecording(RealizedRule):
     model_config = pydantic.ConfigDict(
         arbitrary_types_allowed=True,
         serialize_by_alias=True,
+        defer_build=True,
     )
 
     name: Annotated[str, pydantic.Field(serialization_alias="record")]
@@ -558,10 +589,25 @@ class RuleBundle:
         name: str,
         *context: RuleContext,
         evaluation_interval: ql.Duration | None = None,
+        align_subqueries: bool = False,
+        simplify_exprs: bool = False,
     ) -> None:
         self.name: str = name
         self.evaluation_interval = evaluation_interval
+        # whether subqueries in this bundle's rules are aligned to its evaluation
+        # interval, see ql.align_subqueries
+        self.align_subqueries = align_subqueries
+        # whether this bundle's rules are simplified and have their matchers
+        # normalized, see ql.simplify and ql.normalize_matchers. Off by default,
+        # since it changes the expressions written for existing rules.
+        self.simplify_exprs = simplify_exprs
         self._rules: list[WrappedRule] = []
+        # the rules realized from each of _rules, or None if it hasn't been
+        # realized yet. Adding a rule doesn't change what the others realize to.
+        self._realized: list[list[RealizedRule] | None] = []
+        # realized rules by name, built by the first call to get and dropped
+        # whenever a rule is added
+        self._index: dict[str, RealizedRule] | None = None
         self._context_stack: list[RuleContext] = [*context]
         pass
 
@@ -569,15 +615,48 @@ class RuleBundle:
     extends_recording: type[ExtendRecordingFn] = functools.partial
 
     def get(self, name: str) -> RealizedRule | None:
-        for a in self._rules:
+        """
+        Returns the realized rule called name, or None if the bundle has none.
+
+        Each rule in the bundle is realized once and indexed by name, so lookups
+        only realize rules which were added since the last one. Rules which still
+        have unbound parameters can't be realized and are skipped. Errors raised
+        while realizing a rule are propagated.
+
+        The result is a copy, so changing it doesn't change later lookups or
+        dumps.
+        """
+        if self._index is None:
+            index: dict[str, RealizedRule] = {}
+            for i, wrapper in enumerate(self._rules):
+                if not wrapper.is_thunkish():
+                    continue
+                for r in self._realized_rules(i):
+                    # the first rule with a name wins, like a linear scan
+                    index.setdefault(r.name, r)
+            self._index = index
+        rule = self._index.get(name)
+        return rule.model_copy() if rule is not None else None
+
+    def _realized_rules(self, i: int) -> list[RealizedRule]:
+        """
+        Returns the rules realized from self._rules[i], realizing it if it hasn't
+        been already. The rules are shared, so they must be copied before they're
+        handed out.
+        """
+        rules = self._realized[i]
+        if rules is None:
             try:
-                rules = a()
-                for r in rules:
-                    if r.name == name:
-                        return r
-            except:  # noqa
-                pass
-        return None
+                rules = self._realized[i] = self._realize(self._rules[i])
+            except Exception as e:
+                e.add_note(f"while realizing the rules of bundle '{self.name}'")
+                raise
+        return rules
+
+    def _add_rule(self, wrapper: WrappedRule) -> None:
+        self._rules.append(self._curry_wrapper(wrapper))
+        self._realized.append(None)
+        self._index = None
 
     def _curry_wrapper(self, wrapper: WrappedRule) -> WrappedRule:
         return self._apply_context(self._add_vectors(wrapper))
@@ -610,12 +689,38 @@ class RuleBundle:
         return Hooks(hooks=self._context_stack)
 
     def dump(self) -> Iterable[RealizedRule]:
-        for wrapper in self._rules:
+        """
+        Yields a copy of every rule in the bundle, realizing those which haven't
+        been realized by an earlier dump or get.
+        """
+        for i, wrapper in enumerate(self._rules):
             if not wrapper.is_thunkish():
                 raise Exception(
                     f"there's a wrapper which isn't fully applied: {wrapper.overrides}"
                 )
-            yield from wrapper()
+            for rule in self._realized_rules(i):
+                yield rule.model_copy()
+
+    def _realize(self, wrapper: WrappedRule) -> list[RealizedRule]:
+        rules = wrapper()
+        if not self.align_subqueries and not self.simplify_exprs:
+            return rules
+        # vmalert evaluates groups every minute unless told otherwise
+        interval = self.evaluation_interval or ql.Minute
+        rewritten_rules = []
+        for rule in rules:
+            expr = rule.expr
+            rewritten: ql.Timeseries = expr
+            if self.simplify_exprs:
+                rewritten = _optimize_expr(rewritten)
+            if self.align_subqueries:
+                rewritten = ql.align_subqueries(rewritten, interval)
+                for warning in ql.misaligned_subqueries(rewritten, interval):
+                    log.warning("rule '%s' in '%s': %s", rule.name, self.name, warning)
+            if rewritten is not expr:
+                rule = rule.model_copy(update={"raw_expr": rewritten})
+            rewritten_rules.append(rule)
+        return rewritten_rules
 
     def vectors(self) -> ql.Selector:
         return ql.Selector()
@@ -632,7 +737,7 @@ class RuleBundle:
             overrides=named_args,
             hooks=self._hooks(),
         )
-        self._rules.append(self._curry_wrapper(wrapper))
+        self._add_rule(wrapper)
 
     @classmethod
     def _rename_alert_rule(cls, name: str) -> str:
@@ -728,7 +833,7 @@ class RuleBundle:
             overrides=named_args,
             hooks=self._hooks(),
         )
-        self._rules.append(self._curry_wrapper(wrapper))
+        self._add_rule(wrapper)
 
     @classmethod
     def _rename_recording_rule(cls, name: str) -> str:
@@ -763,7 +868,7 @@ class RuleBundle:
             hooks=self._hooks(),
         )
 
-        self._rules.append(self._curry_wrapper(wrapper))
+        self._add_rule(wrapper)
 
     @overload
     def record(
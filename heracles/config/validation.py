@@ -0,0 +1,75 @@
+"""Syntax validation of generated rules"""
+
+from __future__ import annotations
+
+import dataclasses
+import logging
+from collections.abc import Mapping
+from typing import Any
+
+from heracles import ql
+
+__all__ = ["InvalidRulesError", "RuleSyntaxError", "validate_syntax"]
+
+log = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass(frozen=True)
+class RuleSyntaxError:
+    """
+    RuleSyntaxError is a generated rule whose expression MetricsQL can't parse.
+    """
+
+    module: str
+    group: str
+    rule: str
+    expr: str
+    error: ql.QuerySyntaxError
+
+    @property
+    def offset(self) -> int | None:
+        """
+        The byte offset into expr at which parsing failed, if it's known.
+        """
+        return self.error.offset
+
+    def __str__(self) -> str:
+        return f"{self.module}: rule '{self.rule}' in group '{self.group}' {self.error}"
+
+
+class InvalidRulesError(Exception):
+    def __init__(self, errors: list[RuleSyntaxError]) -> None:
+        super().__init__(
+            "generated rules have syntax errors:\n" + "\n".join(map(str, errors))
+        )
+        self.errors = errors
+
+
+def validate_syntax(dumps: Mapping[str, dict[str, Any]]) -> list[RuleSyntaxError]:
+    """
+    Checks the expression of every rule in dumps, which maps module names to
+    configs dumped by PrometheusRulesConfig.to_dict, so that exactly what will be
+    written is checked. Every expression in the project is checked by one call
+    into the formatter library, which parses them in parallel.
+
+    Returns an error for every expression which can't be parsed. If the formatter
+    library isn't available nothing can be checked, which is logged.
+    """
+    located: list[tuple[str, str, str]] = []
+    exprs: list[str] = []
+    for module, dump in dumps.items():
+        for group in dump.get("groups", []):
+            for rule in group.get("rules", []):
+                name = rule.get("alert") or rule.get("record") or "<unnamed>"
+                located.append((module, group.get("name", ""), name))
+                exprs.append(rule.get("expr", ""))
+    try:
+        results = ql.validate_many(exprs)
+    except RuntimeError as e:
+        log.warning("skipping rule syntax validation: %s", e)
+        return []
+    return [
+        RuleSyntaxError(module, group, rule, expr, error)
+        for (module, group, rule), expr, error in zip(located, exprs, results)
+        if error is not None
+    ]
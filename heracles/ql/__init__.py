@@ -1,5 +1,75 @@
 from heracles.ql.prelude import *  # noqa F405
-from heracles.ql.funcs import *  # noqa F405
 from heracles.ql.duration import *  # noqa F405
 from heracles.ql.format import *  # noqa F405
 from heracles.ql.factory import *  # noqa F405
+from heracles.ql.diff import *  # noqa F405
+from heracles.ql.simplify import *  # noqa F405
+
+import importlib
+import sys
+
+from heracles.ql._func_names import FUNC_NAMES as _FUNC_NAMES
+
+# every module star-imported above, whose __all__ make up this package's. diff
+# and simplify export functions named after their modules, so they're imported
+# eagerly: importing them later would bind the modules over the functions.
+_EAGER_MODULES = ("prelude", "duration", "format", "factory", "diff", "simplify")
+
+# the analysis and tooling modules, and the names each exports, are only imported
+# once one of their names is used. Type checkers read __init__.pyi instead, which
+# imports them directly.
+_LAZY_MODULES = {
+    "interning": ("Interner",),
+    "ir": ("ExprIR", "ExprIRVisitor", "NodeRef"),
+    "serialization": ("dumps", "dumps_many", "loads", "loads_many"),
+    "matchers": (
+        "MatcherWarning",
+        "normalize_matcher_expr",
+        "normalize_matchers",
+        "unindexed_matchers",
+        "unindexed_reason",
+    ),
+    "cost": ("CostModel", "estimate_cost"),
+    "alignment": ("AlignmentWarning", "align_subqueries", "misaligned_subqueries"),
+    "templates": ("render_with_templates",),
+    "minimal": ("format_number", "render_minimal"),
+    "parsing": ("ParseError", "QuerySyntaxError", "parse", "validate_many"),
+    "registry": (
+        "CostClass",
+        "FuncParam",
+        "FuncSpec",
+        "ParamKind",
+        "func_names",
+        "func_spec",
+        "func_specs",
+    ),
+}
+_LAZY_NAMES = {name: m for m, names in _LAZY_MODULES.items() for name in names}
+
+# likewise, the functions in heracles.ql.funcs are only imported once one of them
+# is used, since there are hundreds of them
+__all__ = [
+    *(n for m in _EAGER_MODULES for n in sys.modules[f"heracles.ql.{m}"].__all__),
+    *_LAZY_NAMES,
+    "funcs",  # noqa F405
+    *_FUNC_NAMES,
+]
+
+
+def __getattr__(name: str) -> object:
+    if name == "funcs" or name in _FUNC_NAMES:
+        module, names = "funcs", _FUNC_NAMES
+    elif name in _LAZY_NAMES:
+        module = _LAZY_NAMES[name]
+        names = _LAZY_MODULES[module]
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    imported = importlib.import_module(f"heracles.ql.{module}")
+    # every name from the module is cached at once, so later lookups don't come
+    # back here
+    globals().update((n, getattr(imported, n)) for n in names)
+    return globals()[name]
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
@@ -0,0 +1,21 @@
+# heracles.ql imports heracles.ql.funcs on first use, which type checkers can't
+# follow, so this stub imports it directly. It must export the same modules as
+# __init__.py.
+from heracles.ql import funcs as funcs  # noqa F405
+from heracles.ql.prelude import *  # noqa F405
+from heracles.ql.funcs import *  # noqa F405
+from heracles.ql.duration import *  # noqa F405
+from heracles.ql.format import *  # noqa F405
+from heracles.ql.factory import *  # noqa F405
+from heracles.ql.interning import *  # noqa F405
+from heracles.ql.ir import *  # noqa F405
+from heracles.ql.serialization import *  # noqa F405
+from heracles.ql.diff import *  # noqa F405
+from heracles.ql.simplify import *  # noqa F405
+from heracles.ql.matchers import *  # noqa F405
+from heracles.ql.cost import *  # noqa F405
+from heracles.ql.alignment import *  # noqa F405
+from heracles.ql.templates import *  # noqa F405
+from heracles.ql.minimal import *  # noqa F405
+from heracles.ql.parsing import *  # noqa F405
+from heracles.ql.registry import *  # noqa F405
@@ -0,0 +1,234 @@
+# generated by codegen/markdown.py: the name of every function in
+# heracles.ql.funcs, which heracles.ql exports without importing it
+FUNC_NAMES = (
+    "abs",
+    "absent",
+    "absent_over_time",
+    "acos",
+    "acosh",
+    "aggr_over_time",
+    "alias",
+    "any",
+    "ascent_over_time",
+    "asin",
+    "asinh",
+    "atan",
+    "atanh",
+    "avg",
+    "avg_over_time",
+    "bitmap_and",
+    "bitmap_or",
+    "bitmap_xor",
+    "bottomk",
+    "bottomk_avg",
+    "bottomk_last",
+    "bottomk_max",
+    "bottomk_median",
+    "bottomk_min",
+    "buckets_limit",
+    "ceil",
+    "changes",
+    "changes_prometheus",
+    "clamp",
+    "clamp_max",
+    "clamp_min",
+    "cos",
+    "cosh",
+    "count",
+    "count_eq_over_time",
+    "count_gt_over_time",
+    "count_le_over_time",
+    "count_ne_over_time",
+    "count_over_time",
+    "count_values",
+    "count_values_over_time",
+    "day_of_month",
+    "day_of_week",
+    "day_of_year",
+    "days_in_month",
+    "decreases_over_time",
+    "default_rollup",
+    "deg",
+    "delta",
+    "delta_prometheus",
+    "deriv",
+    "deriv_fast",
+    "descent_over_time",
+    "distinct",
+    "distinct_over_time",
+    "drop_common_labels",
+    "drop_empty_series",
+    "duration_over_time",
+    "end",
+    "exp",
+    "first_over_time",
+    "floor",
+    "geomean",
+    "geomean_over_time",
+    "group",
+    "histogram",
+    "histogram_avg",
+    "histogram_over_time",
+    "histogram_quantile",
+    "histogram_quantiles",
+    "histogram_share",
+    "histogram_stddev",
+    "histogram_stdvar",
+    "hoeffding_bound_lower",
+    "hoeffding_bound_upper",
+    "holt_winters",
+    "hour",
+    "idelta",
+    "ideriv",
+    "increase",
+    "increase_prometheus",
+    "increase_pure",
+    "increases_over_time",
+    "integrate",
+    "interpolate",
+    "irate",
+    "keep_last_value",
+    "keep_next_value",
+    "label_copy",
+    "label_del",
+    "label_graphite_group",
+    "label_join",
+    "label_keep",
+    "label_lowercase",
+    "label_map",
+    "label_match",
+    "label_mismatch",
+    "label_move",
+    "label_replace",
+    "label_set",
+    "label_transform",
+    "label_uppercase",
+    "label_value",
+    "labels_equal",
+    "lag",
+    "last_over_time",
+    "lifetime",
+    "limit_offset",
+    "limitk",
+    "ln",
+    "log2",
+    "log10",
+    "mad",
+    "mad_over_time",
+    "max",
+    "max_over_time",
+    "median",
+    "median_over_time",
+    "min",
+    "min_over_time",
+    "minute",
+    "mode",
+    "mode_over_time",
+    "month",
+    "now",
+    "outlier_iqr_over_time",
+    "outliers_iqr",
+    "outliers_mad",
+    "outliersk",
+    "pi",
+    "predict_linear",
+    "present_over_time",
+    "prometheus_buckets",
+    "quantile",
+    "quantile_over_time",
+    "quantiles",
+    "quantiles_over_time",
+    "rad",
+    "rand",
+    "rand_exponential",
+    "rand_normal",
+    "range_avg",
+    "range_first",
+    "range_last",
+    "range_linear_regression",
+    "range_mad",
+    "range_max",
+    "range_median",
+    "range_min",
+    "range_normalize",
+    "range_over_time",
+    "range_quantile",
+    "range_stddev",
+    "range_stdvar",
+    "range_sum",
+    "range_trim_outliers",
+    "range_trim_spikes",
+    "range_trim_zscore",
+    "range_zscore",
+    "rate",
+    "rate_over_sum",
+    "remove_resets",
+    "resets",
+    "rollup",
+    "rollup_candlestick",
+    "rollup_delta",
+    "rollup_deriv",
+    "rollup_increase",
+    "rollup_rate",
+    "rollup_scrape_interval",
+    "round",
+    "ru",
+    "running_avg",
+    "running_max",
+    "running_min",
+    "running_sum",
+    "scalar",
+    "scrape_interval",
+    "sgn",
+    "share",
+    "share_eq_over_time",
+    "share_gt_over_time",
+    "share_le_over_time",
+    "sin",
+    "sinh",
+    "smooth_exponential",
+    "sort",
+    "sort_by_label",
+    "sort_by_label_desc",
+    "sort_by_label_numeric",
+    "sort_by_label_numeric_desc",
+    "sort_desc",
+    "sqrt",
+    "stale_samples_over_time",
+    "start",
+    "stddev",
+    "stddev_over_time",
+    "stdvar",
+    "stdvar_over_time",
+    "step",
+    "sum",
+    "sum2",
+    "sum2_over_time",
+    "sum_eq_over_time",
+    "sum_gt_over_time",
+    "sum_le_over_time",
+    "sum_over_time",
+    "tan",
+    "tanh",
+    "tfirst_over_time",
+    "time",
+    "timestamp",
+    "timestamp_with_name",
+    "timezone_offset",
+    "tlast_change_over_time",
+    "tlast_over_time",
+    "tmax_over_time",
+    "tmin_over_time",
+    "topk",
+    "topk_avg",
+    "topk_last",
+    "topk_max",
+    "topk_median",
+    "topk_min",
+    "ttf",
+    "union",
+    "vector",
+    "year",
+    "zscore",
+    "zscore_over_time",
+)
@@ -0,0 +1,750 @@
+# generated by codegen/markdown.py: a row for each function which
+# heracles.ql.funcs.generated builds, as
+# (name, node type, cost class, ((param, kind, variadic), ...))
+from typing import Any
+
+FUNC_TABLE: tuple[tuple[Any, ...], ...] = (
+    ("absent_over_time", "RollupFunc", "linear", (("vector", "range", False),)),
+    ("ascent_over_time", "RollupFunc", "linear", (("vector", "range", False),)),
+    ("avg_over_time", "RollupFunc", "linear", (("vector", "range", False),)),
+    ("changes", "RollupFunc", "linear", (("vector", "range", False),)),
+    ("changes_prometheus", "RollupFunc", "linear", (("vector", "range", False),)),
+    (
+        "count_eq_over_time",
+        "RollupFunc",
+        "linear",
+        (("vector", "range", False), ("eq", "scalar", False)),
+    ),
+    (
+        "count_gt_over_time",
+        "RollupFunc",
+        "linear",
+        (("vector", "range", False), ("gt", "scalar", False)),
+    ),
+    (
+        "count_le_over_time",
+        "RollupFunc",
+        "linear",
+        (("vector", "range", False), ("le", "scalar", False)),
+    ),
+    (
+        "count_ne_over_time",
+        "RollupFunc",
+        "linear",
+        (("vector", "range", False), ("ne", "scalar", False)),
+    ),
+    ("count_over_time", "RollupFunc", "linear", (("vector", "range", False),)),
+    (
+        "count_values_over_time",
+        "RollupFunc",
+        "sorting",
+        (("label", "string", False), ("vector", "range", False)),
+    ),
+    ("decreases_over_time", "RollupFunc", "linear", (("vector", "range", False),)),
+    ("default_rollup", "RollupFunc", "linear", (("vector", "range", False),)),
+    ("delta", "RollupFunc", "linear", (("vector", "range", False),)),
+    ("delta_prometheus", "RollupFunc", "linear", (("vector", "range", False),)),
+    ("deriv", "RollupFunc", "linear", (("vector", "range", False),)),
+    ("deriv_fast", "RollupFunc", "linear", (("vector", "range", False),)),
+    ("descent_over_time", "RollupFunc", "linear", (("vector", "range", False),)),
+    ("distinct_over_time", "RollupFunc", "sorting", (("vector", "range", False),)),
+    (
+        "duration_over_time",
+        "RollupFunc",
+        "linear",
+        (("vector", "range", False), ("max_interval", "scalar", False)),
+    ),
+    ("first_over_time", "RollupFunc", "linear", (("vector", "range", False),)),
+    ("geomean_over_time", "RollupFunc", "linear", (("vector", "range", False),)),
+    ("histogram_over_time", "RollupFunc", "sorting", (("vector", "range", False),)),
+    (
+        "hoeffding_bound_lower",
+        "RollupFunc",
+        "linear",
+        (("phi", "scalar", False), ("vector", "range", False)),
+    ),
+    (
+        "hoeffding_bound_upper",
+        "RollupFunc",
+        "linear",
+        (("phi", "scalar", False), ("vector", "range", False)),
+    ),
+    (
+        "holt_winters",
+        "RollupFunc",
+        "linear",
+        (("vector", "range", False), ("sf", "scalar", False), ("tf", "scalar", False)),
+    ),
+    ("idelta", "RollupFunc", "linear", (("vector", "range", False),)),
+    ("ideriv", "RollupFunc", "linear", (("vector", "range", False),)),
+    ("increase", "RollupFunc", "linear", (("vector", "range", False),)),
+    ("increase_prometheus", "RollupFunc", "linear", (("vector", "range", False),)),
+    ("increase_pure", "RollupFunc", "linear", (("vector", "range", False),)),
+    ("increases_over_time", "RollupFunc", "linear", (("vector", "range", False),)),
+    ("integrate", "RollupFunc", "linear", (("vector", "range", False),)),
+    ("irate", "RollupFunc", "linear", (("vector", "range", False),)),
+    ("lag", "RollupFunc", "linear", (("vector", "range", False),)),
+    ("last_over_time", "RollupFunc", "linear", (("vector", "range", False),)),
+    ("lifetime", "RollupFunc", "linear", (("vector", "range", False),)),
+    ("mad_over_time", "RollupFunc", "sorting", (("vector", "range", False),)),
+    ("max_over_time", "RollupFunc", "linear", (("vector", "range", False),)),
+    ("median_over_time", "RollupFunc", "sorting", (("vector", "range", False),)),
+    ("min_over_time", "RollupFunc", "linear", (("vector", "range", False),)),
+    ("mode_over_time", "RollupFunc", "sorting", (("vector", "range", False),)),
+    ("outlier_iqr_over_time", "RollupFunc", "sorting", (("vector", "range", False),)),
+    (
+        "predict_linear",
+        "RollupFunc",
+        "linear",
+        (("vector", "range", False), ("t", "scalar", False)),
+    ),
+    ("present_over_time", "RollupFunc", "linear", (("vector", "range", False),)),
+    (
+        "quantile_over_time",
+        "RollupFunc",
+        "sorting",
+        (("phi", "scalar", False), ("vector", "range", False)),
+    ),
+    ("range_over_time", "RollupFunc", "linear", (("vector", "range", False),)),
+    ("rate", "RollupFunc", "linear", (("vector", "range", False),)),
+    ("rate_over_sum", "RollupFunc", "linear", (("vector", "range", False),)),
+    ("resets", "RollupFunc", "linear", (("vector", "range", False),)),
+    ("rollup", "RollupFunc", "linear", (("vector", "range", False),)),
+    ("rollup_candlestick", "RollupFunc", "linear", (("vector", "range", False),)),
+    ("rollup_delta", "RollupFunc", "linear", (("vector", "range", False),)),
+    ("rollup_deriv", "RollupFunc", "linear", (("vector", "range", False),)),
+    ("rollup_increase", "RollupFunc", "linear", (("vector", "range", False),)),
+    ("rollup_rate", "RollupFunc", "linear", (("vector", "range", False),)),
+    ("rollup_scrape_interval", "RollupFunc", "linear", (("vector", "range", False),)),
+    ("scrape_interval", "RollupFunc", "linear", (("vector", "range", False),)),
+    (
+        "share_gt_over_time",
+        "RollupFunc",
+        "linear",
+        (("vector", "range", False), ("gt", "scalar", False)),
+    ),
+    (
+        "share_le_over_time",
+        "RollupFunc",
+        "linear",
+        (("vector", "range", False), ("le", "scalar", False)),
+    ),
+    (
+        "share_eq_over_time",
+        "RollupFunc",
+        "linear",
+        (("vector", "range", False), ("eq", "scalar", False)),
+    ),
+    ("stale_samples_over_time", "RollupFunc", "linear", (("vector", "range", False),)),
+    ("stddev_over_time", "RollupFunc", "linear", (("vector", "range", False),)),
+    ("stdvar_over_time", "RollupFunc", "linear", (("vector", "range", False),)),
+    (
+        "sum_eq_over_time",
+        "RollupFunc",
+        "linear",
+        (("vector", "range", False), ("eq", "scalar", False)),
+    ),
+    (
+        "sum_gt_over_time",
+        "RollupFunc",
+        "linear",
+        (("vector", "range", False), ("gt", "scalar", False)),
+    ),
+    (
+        "sum_le_over_time",
+        "RollupFunc",
+        "linear",
+        (("vector", "range", False), ("le", "scalar", False)),
+    ),
+    ("sum_over_time", "RollupFunc", "linear", (("vector", "range", False),)),
+    ("sum2_over_time", "RollupFunc", "linear", (("vector", "range", False),)),
+    ("timestamp", "RollupFunc", "linear", (("vector", "range", False),)),
+    ("timestamp_with_name", "RollupFunc", "linear", (("vector", "range", False),)),
+    ("tfirst_over_time", "RollupFunc", "linear", (("vector", "range", False),)),
+    ("tlast_change_over_time", "RollupFunc", "linear", (("vector", "range", False),)),
+    ("tlast_over_time", "RollupFunc", "linear", (("vector", "range", False),)),
+    ("tmax_over_time", "RollupFunc", "linear", (("vector", "range", False),)),
+    ("tmin_over_time", "RollupFunc", "linear", (("vector", "range", False),)),
+    ("zscore_over_time", "RollupFunc", "linear", (("vector", "range", False),)),
+    ("any", "AggrFunc", "linear", (("vector", "instant_or_range", True),)),
+    ("avg", "AggrFunc", "linear", (("vector", "instant_or_range", True),)),
+    (
+        "bottomk",
+        "AggrFunc",
+        "linear",
+        (("k", "scalar", False), ("vector", "instant_or_range", False)),
+    ),
+    (
+        "bottomk_avg",
+        "AggrFunc",
+        "linear",
+        (
+            ("k", "scalar", False),
+            ("vector", "instant_or_range", False),
+            ("other_label", "optional_string", False),
+        ),
+    ),
+    (
+        "bottomk_last",
+        "AggrFunc",
+        "linear",
+        (
+            ("k", "scalar", False),
+            ("vector", "instant_or_range", False),
+            ("other_label", "optional_string", False),
+        ),
+    ),
+    (
+        "bottomk_max",
+        "AggrFunc",
+        "linear",
+        (
+            ("k", "scalar", False),
+            ("vector", "instant_or_range", False),
+            ("other_label", "optional_string", False),
+        ),
+    ),
+    (
+        "bottomk_median",
+        "AggrFunc",
+        "linear",
+        (
+            ("k", "scalar", False),
+            ("vector", "instant_or_range", False),
+            ("other_label", "optional_string", False),
+        ),
+    ),
+    (
+        "bottomk_min",
+        "AggrFunc",
+        "linear",
+        (
+            ("k", "scalar", False),
+            ("vector", "instant_or_range", False),
+            ("other_label", "optional_string", False),
+        ),
+    ),
+    ("count", "AggrFunc", "linear", (("vector", "instant_or_range", True),)),
+    (
+        "count_values",
+        "AggrFunc",
+        "linear",
+        (("label", "string", False), ("vector", "instant_or_range", True)),
+    ),
+    ("distinct", "AggrFunc", "linear", (("vector", "instant_or_range", True),)),
+    ("geomean", "AggrFunc", "linear", (("vector", "instant_or_range", True),)),
+    ("group", "AggrFunc", "linear", (("vector", "instant_or_range", True),)),
+    ("histogram", "AggrFunc", "linear", (("vector", "instant_or_range", True),)),
+    (
+        "limitk",
+        "AggrFunc",
+        "linear",
+        (("k", "scalar", False), ("vector", "instant_or_range", True)),
+    ),
+    ("mad", "AggrFunc", "linear", (("vector", "instant_or_range", True),)),
+    ("max", "AggrFunc", "linear", (("vector", "instant_or_range", True),)),
+    ("median", "AggrFunc", "linear", (("vector", "instant_or_range", True),)),
+    ("min", "AggrFunc", "linear", (("vector", "instant_or_range", True),)),
+    ("mode", "AggrFunc", "linear", (("vector", "instant_or_range", True),)),
+    ("outliers_iqr", "AggrFunc", "linear", (("vector", "instant_or_range", True),)),
+    (
+        "outliers_mad",
+        "AggrFunc",
+        "linear",
+        (("tolerance", "scalar", False), ("vector", "instant_or_range", True)),
+    ),
+    (
+        "outliersk",
+        "AggrFunc",
+        "linear",
+        (("k", "scalar", False), ("vector", "instant_or_range", True)),
+    ),
+    (
+        "quantile",
+        "AggrFunc",
+        "linear",
+        (("phi", "scalar", False), ("vector", "instant_or_range", True)),
+    ),
+    ("share", "AggrFunc", "linear", (("vector", "instant_or_range", True),)),
+    ("stddev", "AggrFunc", "linear", (("vector", "instant_or_range", True),)),
+    ("stdvar", "AggrFunc", "linear", (("vector", "instant_or_range", True),)),
+    ("sum", "AggrFunc", "linear", (("vector", "instant_or_range", True),)),
+    ("sum2", "AggrFunc", "linear", (("vector", "instant_or_range", True),)),
+    (
+        "topk",
+        "AggrFunc",
+        "linear",
+        (("k", "scalar", False), ("vector", "instant_or_range", False)),
+    ),
+    (
+        "topk_avg",
+        "AggrFunc",
+        "linear",
+        (
+            ("k", "scalar", False),
+            ("vector", "instant_or_range", False),
+            ("other_label", "optional_string", False),
+        ),
+    ),
+    (
+        "topk_last",
+        "AggrFunc",
+        "linear",
+        (
+            ("k", "scalar", False),
+            ("vector", "instant_or_range", False),
+            ("other_label", "optional_string", False),
+        ),
+    ),
+    (
+        "topk_max",
+        "AggrFunc",
+        "linear",
+        (
+            ("k", "scalar", False),
+            ("vector", "instant_or_range", False),
+            ("other_label", "optional_string", False),
+        ),
+    ),
+    (
+        "topk_median",
+        "AggrFunc",
+        "linear",
+        (
+            ("k", "scalar", False),
+            ("vector", "instant_or_range", False),
+            ("other_label", "optional_string", False),
+        ),
+    ),
+    (
+        "topk_min",
+        "AggrFunc",
+        "linear",
+        (
+            ("k", "scalar", False),
+            ("vector", "instant_or_range", False),
+            ("other_label", "optional_string", False),
+        ),
+    ),
+    ("zscore", "AggrFunc", "linear", (("vector", "instant_or_range", True),)),
+    ("abs", "TransformFunc", "linear", (("vector", "instant_or_range", False),)),
+    ("absent", "TransformFunc", "linear", (("vector", "instant_or_range", False),)),
+    ("acos", "TransformFunc", "linear", (("vector", "instant_or_range", False),)),
+    ("acosh", "TransformFunc", "linear", (("vector", "instant_or_range", False),)),
+    ("asin", "TransformFunc", "linear", (("vector", "instant_or_range", False),)),
+    ("asinh", "TransformFunc", "linear", (("vector", "instant_or_range", False),)),
+    ("atan", "TransformFunc", "linear", (("vector", "instant_or_range", False),)),
+    ("atanh", "TransformFunc", "linear", (("vector", "instant_or_range", False),)),
+    (
+        "bitmap_and",
+        "TransformFunc",
+        "linear",
+        (("vector", "instant_or_range", False), ("mask", "scalar", False)),
+    ),
+    (
+        "bitmap_or",
+        "TransformFunc",
+        "linear",
+        (("vector", "instant_or_range", False), ("mask", "scalar", False)),
+    ),
+    (
+        "bitmap_xor",
+        "TransformFunc",
+        "linear",
+        (("vector", "instant_or_range", False), ("mask", "scalar", False)),
+    ),
+    (
+        "buckets_limit",
+        "TransformFunc",
+        "linear",
+        (("limit", "scalar", False), ("buckets", "scalar", False)),
+    ),
+    ("ceil", "TransformFunc", "linear", (("vector", "instant_or_range", False),)),
+    (
+        "clamp",
+        "TransformFunc",
+        "linear",
+        (
+            ("vector", "instant_or_range", False),
+            ("min", "scalar", False),
+            ("max", "scalar", False),
+        ),
+    ),
+    (
+        "clamp_max",
+        "TransformFunc",
+        "linear",
+        (("vector", "instant_or_range", False), ("max", "scalar", False)),
+    ),
+    (
+        "clamp_min",
+        "TransformFunc",
+        "linear",
+        (("vector", "instant_or_range", False), ("min", "scalar", False)),
+    ),
+    ("cos", "TransformFunc", "linear", (("vector", "instant_or_range", False),)),
+    ("cosh", "TransformFunc", "linear", (("vector", "instant_or_range", False),)),
+    (
+        "day_of_month",
+        "TransformFunc",
+        "linear",
+        (("vector", "instant_or_range", False),),
+    ),
+    (
+        "day_of_week",
+        "TransformFunc",
+        "linear",
+        (("vector", "instant_or_range", False),),
+    ),
+    (
+        "day_of_year",
+        "TransformFunc",
+        "linear",
+        (("vector", "instant_or_range", False),),
+    ),
+    (
+        "days_in_month",
+        "TransformFunc",
+        "linear",
+        (("vector", "instant_or_range", False),),
+    ),
+    ("deg", "TransformFunc", "linear", (("vector", "instant_or_range", False),)),
+    (
+        "drop_empty_series",
+        "TransformFunc",
+        "linear",
+        (("vector", "instant_or_range", False),),
+    ),
+    ("end", "TransformFunc", "linear", ()),
+    ("exp", "TransformFunc", "linear", (("vector", "instant_or_range", False),)),
+    ("floor", "TransformFunc", "linear", (("vector", "instant_or_range", False),)),
+    ("histogram_avg", "TransformFunc", "linear", (("buckets", "scalar", False),)),
+    (
+        "histogram_quantile",
+        "TransformFunc",
+        "linear",
+        (("phi", "scalar", False), ("buckets", "scalar", False)),
+    ),
+    (
+        "histogram_share",
+        "TransformFunc",
+        "linear",
+        (("le", "scalar", False), ("buckets", "scalar", False)),
+    ),
+    ("histogram_stddev", "TransformFunc", "linear", (("buckets", "scalar", False),)),
+    ("histogram_stdvar", "TransformFunc", "linear", (("buckets", "scalar", False),)),
+    ("hour", "TransformFunc", "linear", (("vector", "instant_or_range", False),)),
+    (
+        "interpolate",
+        "TransformFunc",
+        "linear",
+        (("vector", "instant_or_range", False),),
+    ),
+    (
+        "keep_last_value",
+        "TransformFunc",
+        "linear",
+        (("vector", "instant_or_range", False),),
+    ),
+    (
+        "keep_next_value",
+        "TransformFunc",
+        "linear",
+        (("vector", "instant_or_range", False),),
+    ),
+    (
+        "limit_offset",
+        "TransformFunc",
+        "linear",
+        (
+            ("limit", "scalar", False),
+            ("offset", "scalar", False),
+            ("vector", "instant_or_range", False),
+        ),
+    ),
+    ("ln", "TransformFunc", "linear", (("vector", "instant_or_range", False),)),
+    ("log2", "TransformFunc", "linear", (("vector", "instant_or_range", False),)),
+    ("log10", "TransformFunc", "linear", (("vector", "instant_or_range", False),)),
+    ("minute", "TransformFunc", "linear", (("vector", "instant_or_range", False),)),
+    ("month", "TransformFunc", "linear", (("vector", "instant_or_range", False),)),
+    ("now", "TransformFunc", "linear", ()),
+    ("pi", "TransformFunc", "linear", ()),
+    ("rad", "TransformFunc", "linear", (("vector", "instant_or_range", False),)),
+    ("prometheus_buckets", "TransformFunc", "linear", (("buckets", "scalar", False),)),
+    ("rand", "TransformFunc", "linear", (("seed", "scalar", False),)),
+    ("rand_exponential", "TransformFunc", "linear", (("seed", "scalar", False),)),
+    ("rand_normal", "TransformFunc", "linear", (("seed", "scalar", False),)),
+    ("range_avg", "TransformFunc", "linear", (("vector", "instant_or_range", False),)),
+    (
+        "range_first",
+        "TransformFunc",
+        "linear",
+        (("vector", "instant_or_range", False),),
+    ),
+    ("range_last", "TransformFunc", "linear", (("vector", "instant_or_range", False),)),
+    (
+        "range_linear_regression",
+        "TransformFunc",
+        "linear",
+        (("vector", "instant_or_range", False),),
+    ),
+    ("range_mad", "TransformFunc", "linear", (("vector", "instant_or_range", False),)),
+    ("range_max", "TransformFunc", "linear", (("vector", "instant_or_range", False),)),
+    (
+        "range_median",
+        "TransformFunc",
+        "linear",
+        (("vector", "instant_or_range", False),),
+    ),
+    ("range_min", "TransformFunc", "linear", (("vector", "instant_or_range", False),)),
+    (
+        "range_normalize",
+        "TransformFunc",
+        "linear",
+        (("vector", "instant_or_range", True),),
+    ),
+    (
+        "range_quantile",
+        "TransformFunc",
+        "linear",
+        (("phi", "scalar", False), ("vector", "instant_or_range", False)),
+    ),
+    (
+        "range_stddev",
+        "TransformFunc",
+        "linear",
+        (("vector", "instant_or_range", False),),
+    ),
+    (
+        "range_stdvar",
+        "TransformFunc",
+        "linear",
+        (("vector", "instant_or_range", False),),
+    ),
+    ("range_sum", "TransformFunc", "linear", (("vector", "instant_or_range", False),)),
+    (
+        "range_trim_outliers",
+        "TransformFunc",
+        "linear",
+        (("k", "scalar", False), ("vector", "instant_or_range", False)),
+    ),
+    (
+        "range_trim_spikes",
+        "TransformFunc",
+        "linear",
+        (("phi", "scalar", False), ("vector", "instant_or_range", False)),
+    ),
+    (
+        "range_trim_zscore",
+        "TransformFunc",
+        "linear",
+        (("z", "scalar", False), ("vector", "instant_or_range", False)),
+    ),
+    (
+        "range_zscore",
+        "TransformFunc",
+        "linear",
+        (("vector", "instant_or_range", False),),
+    ),
+    (
+        "remove_resets",
+        "TransformFunc",
+        "linear",
+        (("vector", "instant_or_range", False),),
+    ),
+    (
+        "round",
+        "TransformFunc",
+        "linear",
+        (("vector", "instant_or_range", False), ("nearest", "scalar", False)),
+    ),
+    (
+        "ru",
+        "TransformFunc",
+        "linear",
+        (("free", "scalar", False), ("max", "scalar", False)),
+    ),
+    (
+        "running_avg",
+        "TransformFunc",
+        "linear",
+        (("vector", "instant_or_range", False),),
+    ),
+    (
+        "running_max",
+        "TransformFunc",
+        "linear",
+        (("vector", "instant_or_range", False),),
+    ),
+    (
+        "running_min",
+        "TransformFunc",
+        "linear",
+        (("vector", "instant_or_range", False),),
+    ),
+    (
+        "running_sum",
+        "TransformFunc",
+        "linear",
+        (("vector", "instant_or_range", False),),
+    ),
+    ("scalar", "TransformFunc", "linear", (("vector", "instant_or_range", False),)),
+    ("sgn", "TransformFunc", "linear", (("vector", "instant_or_range", False),)),
+    ("sin", "TransformFunc", "linear", (("vector", "instant_or_range", False),)),
+    ("sinh", "TransformFunc", "linear", (("vector", "instant_or_range", False),)),
+    ("tan", "TransformFunc", "linear", (("vector", "instant_or_range", False),)),
+    ("tanh", "TransformFunc", "linear", (("vector", "instant_or_range", False),)),
+    (
+        "smooth_exponential",
+        "TransformFunc",
+        "linear",
+        (("vector", "instant_or_range", False), ("sf", "scalar", False)),
+    ),
+    ("sort", "TransformFunc", "linear", (("vector", "instant_or_range", False),)),
+    ("sort_desc", "TransformFunc", "linear", (("vector", "instant_or_range", False),)),
+    ("sqrt", "TransformFunc", "linear", (("vector", "instant_or_range", False),)),
+    ("start", "TransformFunc", "linear", ()),
+    ("step", "TransformFunc", "linear", ()),
+    ("time", "TransformFunc", "linear", ()),
+    ("timezone_offset", "TransformFunc", "linear", (("tz", "scalar", False),)),
+    ("ttf", "TransformFunc", "linear", (("free", "scalar", False),)),
+    ("union", "TransformFunc", "linear", (("vector", "instant_or_range", True),)),
+    ("vector", "TransformFunc", "linear", (("vector", "instant_or_range", False),)),
+    ("year", "TransformFunc", "linear", (("vector", "instant_or_range", False),)),
+    (
+        "alias",
+        "LabelManipulationFunc",
+        "linear",
+        (("vector", "instant_or_range", False), ("name", "string", False)),
+    ),
+    (
+        "drop_common_labels",
+        "LabelManipulationFunc",
+        "linear",
+        (("vector", "instant_or_range", True),),
+    ),
+    (
+        "label_del",
+        "LabelManipulationFunc",
+        "linear",
+        (("vector", "instant_or_range", False), ("label1", "string", True)),
+    ),
+    (
+        "label_graphite_group",
+        "LabelManipulationFunc",
+        "linear",
+        (("vector", "instant_or_range", False), ("groupNum1", "scalar", True)),
+    ),
+    (
+        "label_join",
+        "LabelManipulationFunc",
+        "linear",
+        (
+            ("vector", "instant_or_range", False),
+            ("dst_label", "string", False),
+            ("separator", "string", False),
+            ("src_label1", "string", True),
+        ),
+    ),
+    (
+        "label_keep",
+        "LabelManipulationFunc",
+        "linear",
+        (("vector", "instant_or_range", False), ("label1", "string", True)),
+    ),
+    (
+        "label_lowercase",
+        "LabelManipulationFunc",
+        "linear",
+        (("vector", "instant_or_range", False), ("label1", "string", True)),
+    ),
+    (
+        "label_match",
+        "LabelManipulationFunc",
+        "linear",
+        (
+            ("vector", "instant_or_range", False),
+            ("label", "string", False),
+            ("regexp", "string", False),
+        ),
+    ),
+    (
+        "label_mismatch",
+        "LabelManipulationFunc",
+        "linear",
+        (
+            ("vector", "instant_or_range", False),
+            ("label", "string", False),
+            ("regexp", "string", False),
+        ),
+    ),
+    (
+        "label_replace",
+        "LabelManipulationFunc",
+        "linear",
+        (
+            ("vector", "instant_or_range", False),
+            ("dst_label", "string", False),
+            ("replacement", "string", False),
+            ("src_label", "string", False),
+            ("regex", "string", False),
+        ),
+    ),
+    (
+        "label_transform",
+        "LabelManipulationFunc",
+        "linear",
+        (
+            ("vector", "instant_or_range", False),
+            ("label", "string", False),
+            ("regexp", "string", False),
+            ("replacement", "string", False),
+        ),
+    ),
+    (
+        "label_uppercase",
+        "LabelManipulationFunc",
+        "linear",
+        (("vector", "instant_or_range", False), ("label1", "string", True)),
+    ),
+    (
+        "label_value",
+        "LabelManipulationFunc",
+        "linear",
+        (("vector", "instant_or_range", False), ("label", "string", False)),
+    ),
+    (
+        "labels_equal",
+        "LabelManipulationFunc",
+        "linear",
+        (
+            ("vector", "instant_or_range", False),
+            ("label1", "string", False),
+            ("label2", "string", True),
+        ),
+    ),
+    (
+        "sort_by_label",
+        "LabelManipulationFunc",
+        "linear",
+        (("vector", "instant_or_range", False), ("label1", "string", True)),
+    ),
+    (
+        "sort_by_label_desc",
+        "LabelManipulationFunc",
+        "linear",
+        (("vector", "instant_or_range", False), ("label1", "string", True)),
+    ),
+    (
+        "sort_by_label_numeric",
+        "LabelManipulationFunc",
+        "linear",
+        (("vector", "instant_or_range", False), ("label1", "string", True)),
+    ),
+    (
+        "sort_by_label_numeric_desc",
+        "LabelManipulationFunc",
+        "linear",
+        (("vector", "instant_or_range", False), ("label1", "string", True)),
+    ),
+)
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import functools
+import os
+from collections.abc import Callable, Sequence
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import ctypes
+
+# the shared library built from formatter/, which wraps VictoriaMetrics' metricsql
+LIBRARY_PATH = os.path.join(os.path.dirname(__file__), "../../pkg/formatter.so")
+
+# a function taking an input buffer and its length, which returns a buffer allocated
+# by the library and writes its length to the pointer
+BufferFunc = Callable[..., int | None]
+
+
+@functools.cache
+def library() -> ctypes.CDLL | None:
+    """
+    Returns the library, or None if it hasn't been built. It's loaded on first
+    use, since importing heracles.ql shouldn't pay for ctypes and the Go runtime.
+    """
+    import ctypes
+
+    try:
+        lib = ctypes.cdll.LoadLibrary(LIBRARY_PATH)
+        lib.Format.argtypes = [ctypes.c_char_p]
+        lib.Format.restype = ctypes.c_void_p
+        lib.FreeStr.argtypes = [ctypes.c_char_p]
+    except (OSError, AttributeError):
+        return None
+    return lib
+
+
+@functools.cache
+def buffer_func(name: str) -> BufferFunc | None:
+    """
+    Returns the library's function called name, which takes and returns buffers,
+    or None if the library isn't loaded or was built before the function was added.
+    """
+    import ctypes
+
+    func = getattr(library(), name, None)
+    if func is None:
+        return None
+    func.argtypes = [ctypes.c_char_p, ctypes.c_int, ctypes.POINTER(ctypes.c_int)]
+    func.restype = ctypes.c_void_p
+    return func  # type: ignore[no-any-return]
+
+
+def call_string_func(name: str, data: str) -> str | None:
+    """
+    Calls the library's function called name, which takes a NUL terminated string
+    and returns one, or NULL on failure. The returned string is released.
+    """
+    import ctypes
+
+    lib = library()
+    assert lib is not None
+    res = getattr(lib, name)(data.encode())
+    if not res:
+        return None
+    cast_result = ctypes.cast(res, ctypes.c_char_p)
+    try:
+        return cast_result.value.decode()  # type: ignore
+    except UnicodeDecodeError:
+        return None
+    finally:
+        lib.FreeStr(cast_result)
+
+
+def call_buffer_func(func: BufferFunc, data: bytes) -> bytes | None:
+    """
+    Calls func with data, returning a copy of the buffer it returns and releasing
+    the original.
+    """
+    import ctypes
+
+    lib = library()
+    assert lib is not None
+    out_length = ctypes.c_int()
+    res = func(data, len(data), ctypes.byref(out_length))
+    if not res:
+        return None
+    try:
+        return ctypes.string_at(res, out_length.value)
+    finally:
+        lib.FreeStr(ctypes.cast(res, ctypes.c_char_p))
+
+
+def pack_strings(items: Sequence[str]) -> bytes:
+    """
+    Packs items for the library's batch functions. Each is written as a little
+    endian uint32 length followed by its UTF-8 bytes, so that no NUL terminated
+    copies are needed.
+    """
+    parts = []
+    for i in items:
+        encoded = i.encode()
+        parts.append(len(encoded).to_bytes(4, "little"))
+        parts.append(encoded)
+    return b"".join(parts)
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import dataclasses
+
+from heracles.ql import prelude
+
+__all__ = ["AlignmentWarning", "align_subqueries", "misaligned_subqueries"]
+
+
+@dataclasses.dataclass(frozen=True)
+class AlignmentWarning:
+    """
+    AlignmentWarning flags a subquery, or an offset applied to one, whose timing
+    isn't aligned to the evaluation interval of its rule. Its results are computed
+    at different points in time on every evaluation, so they can't be reused from
+    the rollup result cache.
+    """
+
+    node: prelude.Timeseries
+    reason: str
+
+    def __str__(self) -> str:
+        return f"{self.node.render()}: {self.reason}"
+
+
+def align_subqueries(
+    root: prelude.Timeseries, interval: prelude.Duration
+) -> prelude.Timeseries:
+    """
+    Returns the expression with its subqueries aligned to interval, the evaluation
+    interval of the rule:
+      - subqueries without a resolution get interval as their step, rather than
+        whatever step the evaluator would pick,
+      - subquery lookbacks are rounded up to a multiple of their step, which only
+        widens the range they cover.
+
+    Explicit resolutions are kept, even if they aren't aligned (see
+    misaligned_subqueries), as are durations counted in intervals (like 5i),
+    which are already aligned. Offsets are kept too: changing one would change
+    which points in time the query reads, so misaligned offsets are only
+    reported by misaligned_subqueries. root is never modified.
+    """
+    if not _is_time(interval) or interval.time_value <= 0:
+        raise ValueError(f"can't align to an interval of {interval.render()}")
+
+    def align(node: prelude.Timeseries) -> prelude.Timeseries:
+        if isinstance(node, prelude.SubqueryRangeVector):
+            step = node.resolution or interval
+            if not _is_time(node.lookback) or not _is_time(step):
+                return node
+            lookback = _round_up(node.lookback, step)
+            if lookback == node.lookback and step is node.resolution:
+                return node
+            aligned = node._copy()
+            aligned.lookback = lookback
+            aligned.resolution = step
+            return aligned
+        return node
+
+    return prelude._rewrite(root, align)
+
+
+def misaligned_subqueries(
+    root: prelude.Timeseries, interval: prelude.Duration
+) -> list[AlignmentWarning]:
+    """
+    Returns a warning for every subquery in the expression whose step isn't a
+    multiple of interval or whose lookback isn't a multiple of its step, and for
+    every offset applied to a subquery which isn't a multiple of interval.
+    """
+    warnings: list[AlignmentWarning] = []
+
+    def check_subquery(t: prelude.SubqueryRangeVector) -> None:
+        if t.resolution is None:
+            warnings.append(
+                AlignmentWarning(t, "subquery has no step, so the evaluator picks it")
+            )
+        elif not _is_multiple(t.resolution, interval):
+            warnings.append(
+                AlignmentWarning(
+                    t,
+                    f"step {t.resolution.render()} isn't a multiple of the "
+                    f"evaluation interval {interval.render()}",
+                )
+            )
+        elif not _is_multiple(t.lookback, t.resolution):
+            warnings.append(
+                AlignmentWarning(
+                    t,
+                    f"lookback {t.lookback.render()} isn't a multiple of the step "
+                    f"{t.resolution.render()}",
+                )
+            )
+
+    def check_offset(t: prelude.OffsetOp) -> None:
+        if _contains_subquery(t) and not _is_multiple(t.offset_duration, interval):
+            warnings.append(
+                AlignmentWarning(
+                    t,
+                    f"offset {t.offset_duration.render()} isn't a multiple of the "
+                    f"evaluation interval {interval.render()}",
+                )
+            )
+
+    root.accept_visitor(check_subquery)
+    root.accept_visitor(check_offset)
+    return warnings
+
+
+def _is_time(d: prelude.Duration) -> bool:
+    return not d.interval_value
+
+
+def _is_multiple(d: prelude.Duration, of: prelude.Duration) -> bool:
+    if not _is_time(d) or not _is_time(of):
+        # durations counted in intervals are aligned to the evaluation interval
+        return bool(d.interval_value) and not d.time_value
+    return of.time_value > 0 and d.time_value % of.time_value == 0
+
+
+def _round_up(d: prelude.Duration, step: prelude.Duration) -> prelude.Duration:
+    steps = -(-d.time_value // step.time_value)
+    return prelude.Duration(max(1, steps) * step.time_value, 0)
+
+
+def _contains_subquery(root: prelude.Timeseries) -> bool:
+    found = False
+
+    def find(t: prelude.SubqueryRangeVector) -> prelude.VisitorAction:
+        nonlocal found
+        found = True
+        return prelude.VisitorAction.STOP
+
+    root.accept_visitor(find)
+    return found
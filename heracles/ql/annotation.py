@@ -1,6 +1,7 @@
 import abc
+import functools
 from collections.abc import Callable
-from typing import Generic, TypeVar
+from typing import Any, Generic, ParamSpec, TypeVar
 
 from heracles import ql
 
@@ -25,6 +26,47 @@ def assertion() -> Callable[
             def assertion(self) -> ql.InstantVector:
                 return f(self.target)
 
+        # Wrapper replaces f, so give it f's name. This lets annotations defined at
+        # module level be found by import when expressions are deserialized.
+        Wrapper.__module__ = f.__module__
+        Wrapper.__name__ = f.__name__
+        Wrapper.__qualname__ = f.__qualname__
+        Wrapper.__doc__ = f.__doc__
         return Wrapper
 
     return annotation_func
+
+
+_P = ParamSpec("_P")
+_A = TypeVar("_A")
+
+
+def annotation_factory(f: Callable[_P, _A]) -> Callable[_P, _A]:
+    """
+    annotation_factory marks a module level function which builds annotations from
+    its arguments, like assertions.assert_exactly_one. The annotations it returns
+    record the call which created them, so expressions which use them can be
+    serialized and re-created. Calls with the same arguments return the same
+    annotation, so the expressions they're applied to remain structurally equal.
+    """
+    created: dict[Any, _A] = {}
+
+    @functools.wraps(f)
+    def wrapper(*args: _P.args, **kwargs: _P.kwargs) -> _A:
+        key: Any = (args, tuple(sorted(kwargs.items())))
+        try:
+            return created[key]
+        except KeyError:
+            pass
+        except TypeError:
+            # unhashable arguments
+            key = None
+        annotation = f(*args, **kwargs)
+        factory_call: tuple[Any, ...] = (wrapper, args, kwargs)
+        setattr(annotation, "_factory_call", factory_call)
+        if key is not None:
+            created[key] = annotation
+        return annotation
+
+    setattr(wrapper, "_annotation_factory", True)
+    return wrapper
@@ -20,6 +20,7 @@ def no_cardinality_change(
     return ql.absent(ql.count(base_count) == ql.count(vector))
 
 
+@annotation.annotation_factory
 def assert_exactly_one(
     *by_labels: str,
 ) -> Callable[[ql.InstantVector], annotation.AssertionAnnotation[ql.InstantVector]]:
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import dataclasses
+from collections.abc import Mapping
+
+from heracles.ql import duration, matchers, prelude, registry
+
+__all__ = ["CostModel", "estimate_cost"]
+
+# functions which do more than a constant amount of work per sample, usually
+# because they sort or bucket the samples of each series
+_DEFAULT_FUNCTION_WEIGHTS: Mapping[str, float] = dict.fromkeys(
+    registry.func_names(registry.CostClass.sorting), 4.0
+)
+
+
+@dataclasses.dataclass(frozen=True)
+class CostModel:
+    """
+    CostModel estimates how much work one evaluation of an expression does, per
+    series it selects. Costs are unitless and only meant to be compared with each
+    other, but roughly count the samples read:
+      - an instant selector reads one sample, plus the cost of looking up its
+        series in the index, which grows with its regex and negative matchers.
+        Regexes without a literal prefix (see unindexed_matchers) cost the most,
+      - a range selector reads one sample per scrape_interval of its lookback,
+      - a subquery evaluates its expression once per step of its lookback, using
+        evaluation_interval when it has no explicit resolution,
+      - functions multiply the cost of their arguments by their weight in
+        function_weights, which defaults to 1,
+      - every other node costs 1 plus the cost of its children.
+    Rollups nested through subqueries multiply out, which is what makes them
+    expensive in practice.
+    """
+
+    scrape_interval: prelude.Duration = 15 * duration.Second
+    evaluation_interval: prelude.Duration = duration.Minute
+    regex_matcher_cost: float = 4.0
+    unindexed_regex_matcher_cost: float = 50.0
+    negative_matcher_cost: float = 2.0
+    function_weights: Mapping[str, float] = dataclasses.field(
+        default_factory=lambda: dict(_DEFAULT_FUNCTION_WEIGHTS)
+    )
+
+    def cost(self, root: prelude.Timeseries) -> float:
+        """
+        Returns the estimated cost of one evaluation of root.
+        """
+        costs: dict[int, float] = {}
+        stack = [root]
+        while stack:
+            node = stack[-1]
+            if id(node) in costs:
+                stack.pop()
+                continue
+            pending = [
+                c
+                for c in node._children_to_visit()
+                if isinstance(c, prelude.Timeseries) and id(c) not in costs
+            ]
+            if pending:
+                stack.extend(pending)
+                continue
+            stack.pop()
+            children = sum(
+                costs[id(c)]
+                for c in node._children_to_visit()
+                if isinstance(c, prelude.Timeseries)
+            )
+            costs[id(node)] = self._node_cost(node, children)
+        return costs[id(root)]
+
+    def _node_cost(self, node: prelude.Timeseries, children: float) -> float:
+        if isinstance(node, prelude.SelectedInstantVector):
+            return 1 + self._lookup_cost(node)
+        if isinstance(node, prelude.SelectedRangeVector):
+            # the instant selector's single sample is replaced by the whole range
+            samples = self._steps(node.lookback, self.scrape_interval)
+            return children - 1 + samples
+        if isinstance(node, prelude.SubqueryRangeVector):
+            step = node.resolution or self.evaluation_interval
+            return children * self._steps(node.lookback, step)
+        if isinstance(node, prelude.OffsetOp | prelude.AtOp):
+            return children
+        if isinstance(node, prelude.BuiltinFunc):
+            return 1 + children * self.function_weights.get(node.name, 1.0)
+        return 1 + children
+
+    def _lookup_cost(self, node: prelude.SelectedInstantVector) -> float:
+        cost = 0.0
+        for expr in node._selectors.values():
+            for m in expr if isinstance(expr, tuple) else (expr,):
+                if isinstance(m, str):
+                    continue
+                if m.kind == prelude.MatcherKind.Regex:
+                    if matchers.unindexed_reason(m.value):
+                        cost += self.unindexed_regex_matcher_cost
+                    else:
+                        cost += self.regex_matcher_cost
+                elif m.is_negative():
+                    cost += self.negative_matcher_cost
+        return cost
+
+    def resolve(self, d: prelude.Duration) -> prelude.Duration:
+        """
+        Returns d with its interval units (see duration.I) converted to time, using
+        evaluation_interval.
+        """
+        if not d.interval_value:
+            return d
+        evaluation = self.evaluation_interval.time_value
+        return prelude.Duration(d.time_value + d.interval_value * evaluation, 0)
+
+    def _steps(self, lookback: prelude.Duration, step: prelude.Duration) -> float:
+        return max(1.0, self._milliseconds(lookback) / self._milliseconds(step))
+
+    def _milliseconds(self, d: prelude.Duration) -> float:
+        return max(1, self.resolve(d).time_value)
+
+
+def estimate_cost(root: prelude.Timeseries, model: CostModel | None = None) -> float:
+    """
+    Returns the estimated cost of one evaluation of root under model, or the
+    default CostModel.
+    """
+    return (model or _DEFAULT_MODEL).cost(root)
+
+
+_DEFAULT_MODEL = CostModel()
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import dataclasses
+import enum
+
+from heracles.ql import prelude
+
+__all__ = ["Edit", "EditKind", "diff"]
+
+
+class EditKind(enum.Enum):
+    # the node was replaced by a node of a different type or shape
+    replace = "replace"
+    # the node's own fields (op, labels, function name, annotations, ...) changed.
+    # Its children are compared separately.
+    update = "update"
+
+
+@dataclasses.dataclass(frozen=True)
+class Edit:
+    """
+    Edit is one step of the edit script returned by diff.
+
+    path is the position of the edited node, as the index of each child taken from
+    the root, in the order the children appear in the node's fields. old and new are
+    the node before and after the edit.
+    """
+
+    kind: EditKind
+    path: tuple[int, ...]
+    old: prelude.Timeseries
+    new: prelude.Timeseries
+
+    def __str__(self) -> str:
+        return (
+            f"{self.kind.value} at {list(self.path)}: "
+            f"{self.old.render()} -> {self.new.render()}"
+        )
+
+
+def diff(a: prelude.Timeseries, b: prelude.Timeseries) -> list[Edit]:
+    """
+    Returns the edits which turn tree a into tree b, in preorder. An empty list
+    means the trees are structurally equal.
+
+    Nodes are matched by position. When two matched nodes have the same type and
+    the same number of children, any difference in their own fields is reported as
+    an update and their children are compared in turn. Otherwise the whole subtree
+    is reported as replaced. Subtrees which are structurally equal are skipped
+    without being walked, using their cached structural hashes, so the cost of a
+    diff depends on the size of the change rather than the size of the trees.
+
+    Since children are paired by position rather than aligned, the result is not a
+    minimal edit script: inserting an argument into a function call, for example,
+    reports the whole call as replaced rather than a single insertion.
+    """
+    edits: list[Edit] = []
+    stack: list[tuple[tuple[int, ...], prelude.Timeseries, prelude.Timeseries]] = [
+        ((), a, b)
+    ]
+    while stack:
+        path, old, new = stack.pop()
+        if old.structurally_equal(new):
+            continue
+        old_desc, old_children = old._structure()
+        new_desc, new_children = new._structure()
+        if type(old) is not type(new) or len(old_children) != len(new_children):
+            edits.append(Edit(EditKind.replace, path, old, new))
+            continue
+        if old_desc != new_desc:
+            edits.append(Edit(EditKind.update, path, old, new))
+        # pushed in reverse so that edits come out in preorder
+        for i in reversed(range(len(old_children))):
+            stack.append(((*path, i), old_children[i], new_children[i]))
+    return edits
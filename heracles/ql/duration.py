@@ -1,5 +1,16 @@
 from heracles.ql import prelude
 
+__all__ = [
+    "Day",
+    "Hour",
+    "I",
+    "Millisecond",
+    "Minute",
+    "Second",
+    "Week",
+    "Year",
+]
+
 # Time constants
 Millisecond = prelude.Duration.from_units(1, prelude.DurationUnit.millisecond)
 Second = prelude.Duration.from_units(1, prelude.DurationUnit.second)
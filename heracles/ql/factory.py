@@ -1,5 +1,9 @@
 from heracles.ql import assertions, prelude
 
+__all__ = [
+    "Selector",
+]
+
 
 class Selector:
     """
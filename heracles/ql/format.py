@@ -1,32 +1,266 @@
-import ctypes
+import atexit
+import collections
+import json
 import os
+import threading
+from collections.abc import Sequence
+from typing import NamedTuple
 
-try:
-    _formatter_so = ctypes.cdll.LoadLibrary(
-        os.path.join(os.path.dirname(__file__), "../../pkg/formatter.so")
-    )
-    _format_func = _formatter_so.Format
-    _format_func.argtypes = [ctypes.c_char_p]
-    _format_func.restype = ctypes.c_void_p
-
-    _free_func = _formatter_so.FreeStr
-    _free_func.argtypes = [ctypes.c_char_p]
-
-    def format(input: str) -> str | None:
-        res: ctypes.c_char_p = _format_func(input.encode())
-        if not res:
-            return None
-        cast_result = ctypes.cast(res, ctypes.c_char_p)
-        try:
-            real_result = cast_result.value.decode()  # type: ignore
-        except:  # noqa
-            return None
-        finally:
-            _free_func(cast_result)
-        return real_result
+from heracles.ql import _native
+
+__all__ = [
+    "FormatCache",
+    "FormatCacheInfo",
+    "format",
+    "format_many",
+    "get_format_cache",
+    "set_format_cache",
+]
 
-except:  # noqa
-    # if we can't load the so, just make format a no-op
+# the length written in place of a result which couldn't be formatted
+_FORMAT_FAILED = 0xFFFFFFFF
 
-    def format(input: str) -> str | None:
+
+def _format_uncached(input: str) -> str | None:
+    if _native.library() is None:
+        # if we can't load the so, format is a no-op
         return input
+    return _native.call_string_func("Format", input)
+
+
+def _format_many_uncached(inputs: Sequence[str]) -> list[str | None]:
+    if _native.library() is None:
+        return list(inputs)
+    if not inputs:
+        return []
+    # None if the library was built before FormatMany was added
+    format_many_func = _native.buffer_func("FormatMany")
+    if format_many_func is None:
+        return [_format_uncached(i) for i in inputs]
+    data = _native.call_buffer_func(format_many_func, _native.pack_strings(inputs))
+    if data is None:
+        return [None] * len(inputs)
+
+    results: list[str | None] = []
+    pos = 0
+    for _ in inputs:
+        length = int.from_bytes(data[pos : pos + 4], "little")
+        pos += 4
+        if length == _FORMAT_FAILED:
+            results.append(None)
+            continue
+        try:
+            results.append(data[pos : pos + length].decode())
+        except UnicodeDecodeError:
+            results.append(None)
+        pos += length
+    return results
+
+
+class FormatCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+# distinguishes a cached None, for an input which couldn't be formatted, from a
+# missing entry
+_MISSING = object()
+
+
+class FormatCache:
+    """
+    FormatCache is a bounded, thread-safe LRU cache of formatter results, keyed by
+    the formatter's input. Results which are already cached skip the call into the
+    formatter entirely.
+
+    If path is given, the cache is loaded from it when created and written back
+    to it when the interpreter exits (or when save is called), so results are
+    reused across runs. The file records which build of the formatter produced
+    it, and is ignored if the formatter has changed since.
+    """
+
+    def __init__(
+        self, maxsize: int = 4096, path: str | os.PathLike[str] | None = None
+    ) -> None:
+        if maxsize < 0:
+            raise ValueError(f"maxsize must be non-negative, got {maxsize}")
+        self.maxsize = maxsize
+        self.path = path
+        self._entries: collections.OrderedDict[str, str | None] = (
+            collections.OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        if path is not None:
+            self.load()
+            atexit.register(self._save_at_exit)
+
+    def _get(self, query: str) -> object:
+        """
+        Returns the cached result for query, or _MISSING if there isn't one.
+        """
+        with self._lock:
+            result = self._entries.get(query, _MISSING)
+            if result is _MISSING:
+                self._misses += 1
+            else:
+                self._hits += 1
+                self._entries.move_to_end(query)
+            return result
+
+    def _set(self, query: str, result: str | None) -> None:
+        with self._lock:
+            self._insert(query, result)
+
+    def _insert(self, query: str, result: str | None) -> None:
+        if not self.maxsize:
+            return
+        self._entries[query] = result
+        self._entries.move_to_end(query)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def info(self) -> FormatCacheInfo:
+        with self._lock:
+            return FormatCacheInfo(
+                self._hits, self._misses, self.maxsize, len(self._entries)
+            )
+
+    def clear(self) -> None:
+        """
+        Drops every entry and resets the statistics.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def load(self) -> None:
+        """
+        Adds the entries saved at path, unless they were produced by a different
+        build of the formatter. A missing, unreadable or malformed file is
+        ignored.
+        """
+        if self.path is None:
+            return
+        try:
+            with open(self.path) as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return
+        if not isinstance(saved, dict) or saved.get("version") != _formatter_version():
+            return
+        entries = saved.get("entries")
+        if not isinstance(entries, list) or not all(map(_is_entry, entries)):
+            return
+        with self._lock:
+            for query, result in entries:
+                self._insert(query, result)
+
+    def save(self) -> None:
+        """
+        Writes the entries to path, least recently used first.
+        """
+        if self.path is None:
+            return
+        with self._lock:
+            entries = list(self._entries.items())
+        tmp = f"{os.fspath(self.path)}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"version": _formatter_version(), "entries": entries}, f)
+        # replacing the file keeps concurrent runs from reading a partial write
+        os.replace(tmp, self.path)
+
+    def _save_at_exit(self) -> None:
+        # a cache which can't be written is only a missed optimization
+        try:
+            self.save()
+        except OSError:
+            pass
+
+
+def _is_entry(entry: object) -> bool:
+    return (
+        isinstance(entry, list)
+        and len(entry) == 2
+        and isinstance(entry[0], str)
+        and (entry[1] is None or isinstance(entry[1], str))
+    )
+
+
+_version: str | None = None
+
+
+def _formatter_version() -> str:
+    """
+    Identifies the loaded build of the formatter by the hash of its library.
+    """
+    global _version
+    if _version is None:
+        if _native.library() is None:
+            _version = "none"
+        else:
+            import hashlib
+
+            with open(_native.LIBRARY_PATH, "rb") as f:
+                _version = hashlib.sha256(f.read()).hexdigest()
+    return _version
+
+
+_cache: FormatCache | None = FormatCache()
+
+
+def get_format_cache() -> FormatCache | None:
+    """
+    Returns the cache used by format and format_many, or None if caching is
+    disabled.
+    """
+    return _cache
+
+
+def set_format_cache(cache: FormatCache | None) -> None:
+    """
+    Replaces the cache used by format and format_many. Passing None disables
+    caching.
+    """
+    global _cache
+    _cache = cache
+
+
+def format(input: str) -> str | None:
+    """
+    Pretty prints a query. Returns None if it can't be parsed.
+    """
+    cache = _cache
+    if cache is None:
+        return _format_uncached(input)
+    result = cache._get(input)
+    if result is _MISSING:
+        result = _format_uncached(input)
+        cache._set(input, result)
+    return result  # type: ignore
+
+
+def format_many(inputs: Sequence[str]) -> list[str | None]:
+    """
+    Formats every input with a single call into the formatter, which formats them
+    in parallel. Returns None in place of inputs which can't be parsed, like
+    format. Only inputs which aren't cached are passed to the formatter.
+    """
+    cache = _cache
+    if cache is None:
+        return _format_many_uncached(inputs)
+    results: list[object] = [cache._get(i) for i in inputs]
+    # each distinct input which isn't cached is only formatted once
+    missing = list(dict.fromkeys(i for i, r in zip(inputs, results) if r is _MISSING))
+    if missing:
+        formatted = dict(zip(missing, _format_many_uncached(missing)))
+        for input, result in formatted.items():
+            cache._set(input, result)
+        results = [
+            formatted[i] if r is _MISSING else r for i, r in zip(inputs, results)
+        ]
+    return results  # type: ignore
@@ -0,0 +1,416 @@
+from heracles.ql import prelude
+
+def absent_over_time(vector: prelude.RangeVector) -> prelude.RollupFunc: ...
+def ascent_over_time(vector: prelude.RangeVector) -> prelude.RollupFunc: ...
+def avg_over_time(vector: prelude.RangeVector) -> prelude.RollupFunc: ...
+def changes(vector: prelude.RangeVector) -> prelude.RollupFunc: ...
+def changes_prometheus(vector: prelude.RangeVector) -> prelude.RollupFunc: ...
+def count_eq_over_time(
+    vector: prelude.RangeVector, eq: int | float | prelude.InstantVector
+) -> prelude.RollupFunc: ...
+def count_gt_over_time(
+    vector: prelude.RangeVector, gt: int | float | prelude.InstantVector
+) -> prelude.RollupFunc: ...
+def count_le_over_time(
+    vector: prelude.RangeVector, le: int | float | prelude.InstantVector
+) -> prelude.RollupFunc: ...
+def count_ne_over_time(
+    vector: prelude.RangeVector, ne: int | float | prelude.InstantVector
+) -> prelude.RollupFunc: ...
+def count_over_time(vector: prelude.RangeVector) -> prelude.RollupFunc: ...
+def count_values_over_time(
+    label: str, vector: prelude.RangeVector
+) -> prelude.RollupFunc: ...
+def decreases_over_time(vector: prelude.RangeVector) -> prelude.RollupFunc: ...
+def default_rollup(vector: prelude.RangeVector) -> prelude.RollupFunc: ...
+def delta(vector: prelude.RangeVector) -> prelude.RollupFunc: ...
+def delta_prometheus(vector: prelude.RangeVector) -> prelude.RollupFunc: ...
+def deriv(vector: prelude.RangeVector) -> prelude.RollupFunc: ...
+def deriv_fast(vector: prelude.RangeVector) -> prelude.RollupFunc: ...
+def descent_over_time(vector: prelude.RangeVector) -> prelude.RollupFunc: ...
+def distinct_over_time(vector: prelude.RangeVector) -> prelude.RollupFunc: ...
+def duration_over_time(
+    vector: prelude.RangeVector, max_interval: int | float | prelude.InstantVector
+) -> prelude.RollupFunc: ...
+def first_over_time(vector: prelude.RangeVector) -> prelude.RollupFunc: ...
+def geomean_over_time(vector: prelude.RangeVector) -> prelude.RollupFunc: ...
+def histogram_over_time(vector: prelude.RangeVector) -> prelude.RollupFunc: ...
+def hoeffding_bound_lower(
+    phi: int | float | prelude.InstantVector, vector: prelude.RangeVector
+) -> prelude.RollupFunc: ...
+def hoeffding_bound_upper(
+    phi: int | float | prelude.InstantVector, vector: prelude.RangeVector
+) -> prelude.RollupFunc: ...
+def holt_winters(
+    vector: prelude.RangeVector,
+    sf: int | float | prelude.InstantVector,
+    tf: int | float | prelude.InstantVector,
+) -> prelude.RollupFunc: ...
+def idelta(vector: prelude.RangeVector) -> prelude.RollupFunc: ...
+def ideriv(vector: prelude.RangeVector) -> prelude.RollupFunc: ...
+def increase(vector: prelude.RangeVector) -> prelude.RollupFunc: ...
+def increase_prometheus(vector: prelude.RangeVector) -> prelude.RollupFunc: ...
+def increase_pure(vector: prelude.RangeVector) -> prelude.RollupFunc: ...
+def increases_over_time(vector: prelude.RangeVector) -> prelude.RollupFunc: ...
+def integrate(vector: prelude.RangeVector) -> prelude.RollupFunc: ...
+def irate(vector: prelude.RangeVector) -> prelude.RollupFunc: ...
+def lag(vector: prelude.RangeVector) -> prelude.RollupFunc: ...
+def last_over_time(vector: prelude.RangeVector) -> prelude.RollupFunc: ...
+def lifetime(vector: prelude.RangeVector) -> prelude.RollupFunc: ...
+def mad_over_time(vector: prelude.RangeVector) -> prelude.RollupFunc: ...
+def max_over_time(vector: prelude.RangeVector) -> prelude.RollupFunc: ...
+def median_over_time(vector: prelude.RangeVector) -> prelude.RollupFunc: ...
+def min_over_time(vector: prelude.RangeVector) -> prelude.RollupFunc: ...
+def mode_over_time(vector: prelude.RangeVector) -> prelude.RollupFunc: ...
+def outlier_iqr_over_time(vector: prelude.RangeVector) -> prelude.RollupFunc: ...
+def predict_linear(
+    vector: prelude.RangeVector, t: int | float | prelude.InstantVector
+) -> prelude.RollupFunc: ...
+def present_over_time(vector: prelude.RangeVector) -> prelude.RollupFunc: ...
+def quantile_over_time(
+    phi: int | float | prelude.InstantVector, vector: prelude.RangeVector
+) -> prelude.RollupFunc: ...
+def range_over_time(vector: prelude.RangeVector) -> prelude.RollupFunc: ...
+def rate(vector: prelude.RangeVector) -> prelude.RollupFunc: ...
+def rate_over_sum(vector: prelude.RangeVector) -> prelude.RollupFunc: ...
+def resets(vector: prelude.RangeVector) -> prelude.RollupFunc: ...
+def rollup(vector: prelude.RangeVector) -> prelude.RollupFunc: ...
+def rollup_candlestick(vector: prelude.RangeVector) -> prelude.RollupFunc: ...
+def rollup_delta(vector: prelude.RangeVector) -> prelude.RollupFunc: ...
+def rollup_deriv(vector: prelude.RangeVector) -> prelude.RollupFunc: ...
+def rollup_increase(vector: prelude.RangeVector) -> prelude.RollupFunc: ...
+def rollup_rate(vector: prelude.RangeVector) -> prelude.RollupFunc: ...
+def rollup_scrape_interval(vector: prelude.RangeVector) -> prelude.RollupFunc: ...
+def scrape_interval(vector: prelude.RangeVector) -> prelude.RollupFunc: ...
+def share_gt_over_time(
+    vector: prelude.RangeVector, gt: int | float | prelude.InstantVector
+) -> prelude.RollupFunc: ...
+def share_le_over_time(
+    vector: prelude.RangeVector, le: int | float | prelude.InstantVector
+) -> prelude.RollupFunc: ...
+def share_eq_over_time(
+    vector: prelude.RangeVector, eq: int | float | prelude.InstantVector
+) -> prelude.RollupFunc: ...
+def stale_samples_over_time(vector: prelude.RangeVector) -> prelude.RollupFunc: ...
+def stddev_over_time(vector: prelude.RangeVector) -> prelude.RollupFunc: ...
+def stdvar_over_time(vector: prelude.RangeVector) -> prelude.RollupFunc: ...
+def sum_eq_over_time(
+    vector: prelude.RangeVector, eq: int | float | prelude.InstantVector
+) -> prelude.RollupFunc: ...
+def sum_gt_over_time(
+    vector: prelude.RangeVector, gt: int | float | prelude.InstantVector
+) -> prelude.RollupFunc: ...
+def sum_le_over_time(
+    vector: prelude.RangeVector, le: int | float | prelude.InstantVector
+) -> prelude.RollupFunc: ...
+def sum_over_time(vector: prelude.RangeVector) -> prelude.RollupFunc: ...
+def sum2_over_time(vector: prelude.RangeVector) -> prelude.RollupFunc: ...
+def timestamp(vector: prelude.RangeVector) -> prelude.RollupFunc: ...
+def timestamp_with_name(vector: prelude.RangeVector) -> prelude.RollupFunc: ...
+def tfirst_over_time(vector: prelude.RangeVector) -> prelude.RollupFunc: ...
+def tlast_change_over_time(vector: prelude.RangeVector) -> prelude.RollupFunc: ...
+def tlast_over_time(vector: prelude.RangeVector) -> prelude.RollupFunc: ...
+def tmax_over_time(vector: prelude.RangeVector) -> prelude.RollupFunc: ...
+def tmin_over_time(vector: prelude.RangeVector) -> prelude.RollupFunc: ...
+def zscore_over_time(vector: prelude.RangeVector) -> prelude.RollupFunc: ...
+def any(*vector: prelude.InstantOrRangeVector) -> prelude.AggrFunc: ...
+def avg(*vector: prelude.InstantOrRangeVector) -> prelude.AggrFunc: ...
+def bottomk(
+    k: int | float | prelude.InstantVector, vector: prelude.InstantOrRangeVector
+) -> prelude.AggrFunc: ...
+def bottomk_avg(
+    k: int | float | prelude.InstantVector,
+    vector: prelude.InstantOrRangeVector,
+    other_label: str | None,
+) -> prelude.AggrFunc: ...
+def bottomk_last(
+    k: int | float | prelude.InstantVector,
+    vector: prelude.InstantOrRangeVector,
+    other_label: str | None,
+) -> prelude.AggrFunc: ...
+def bottomk_max(
+    k: int | float | prelude.InstantVector,
+    vector: prelude.InstantOrRangeVector,
+    other_label: str | None,
+) -> prelude.AggrFunc: ...
+def bottomk_median(
+    k: int | float | prelude.InstantVector,
+    vector: prelude.InstantOrRangeVector,
+    other_label: str | None,
+) -> prelude.AggrFunc: ...
+def bottomk_min(
+    k: int | float | prelude.InstantVector,
+    vector: prelude.InstantOrRangeVector,
+    other_label: str | None,
+) -> prelude.AggrFunc: ...
+def count(*vector: prelude.InstantOrRangeVector) -> prelude.AggrFunc: ...
+def count_values(
+    label: str, *vector: prelude.InstantOrRangeVector
+) -> prelude.AggrFunc: ...
+def distinct(*vector: prelude.InstantOrRangeVector) -> prelude.AggrFunc: ...
+def geomean(*vector: prelude.InstantOrRangeVector) -> prelude.AggrFunc: ...
+def group(*vector: prelude.InstantOrRangeVector) -> prelude.AggrFunc: ...
+def histogram(*vector: prelude.InstantOrRangeVector) -> prelude.AggrFunc: ...
+def limitk(
+    k: int | float | prelude.InstantVector, *vector: prelude.InstantOrRangeVector
+) -> prelude.AggrFunc: ...
+def mad(*vector: prelude.InstantOrRangeVector) -> prelude.AggrFunc: ...
+def max(*vector: prelude.InstantOrRangeVector) -> prelude.AggrFunc: ...
+def median(*vector: prelude.InstantOrRangeVector) -> prelude.AggrFunc: ...
+def min(*vector: prelude.InstantOrRangeVector) -> prelude.AggrFunc: ...
+def mode(*vector: prelude.InstantOrRangeVector) -> prelude.AggrFunc: ...
+def outliers_iqr(*vector: prelude.InstantOrRangeVector) -> prelude.AggrFunc: ...
+def outliers_mad(
+    tolerance: int | float | prelude.InstantVector,
+    *vector: prelude.InstantOrRangeVector,
+) -> prelude.AggrFunc: ...
+def outliersk(
+    k: int | float | prelude.InstantVector, *vector: prelude.InstantOrRangeVector
+) -> prelude.AggrFunc: ...
+def quantile(
+    phi: int | float | prelude.InstantVector, *vector: prelude.InstantOrRangeVector
+) -> prelude.AggrFunc: ...
+def share(*vector: prelude.InstantOrRangeVector) -> prelude.AggrFunc: ...
+def stddev(*vector: prelude.InstantOrRangeVector) -> prelude.AggrFunc: ...
+def stdvar(*vector: prelude.InstantOrRangeVector) -> prelude.AggrFunc: ...
+def sum(*vector: prelude.InstantOrRangeVector) -> prelude.AggrFunc: ...
+def sum2(*vector: prelude.InstantOrRangeVector) -> prelude.AggrFunc: ...
+def topk(
+    k: int | float | prelude.InstantVector, vector: prelude.InstantOrRangeVector
+) -> prelude.AggrFunc: ...
+def topk_avg(
+    k: int | float | prelude.InstantVector,
+    vector: prelude.InstantOrRangeVector,
+    other_label: str | None,
+) -> prelude.AggrFunc: ...
+def topk_last(
+    k: int | float | prelude.InstantVector,
+    vector: prelude.InstantOrRangeVector,
+    other_label: str | None,
+) -> prelude.AggrFunc: ...
+def topk_max(
+    k: int | float | prelude.InstantVector,
+    vector: prelude.InstantOrRangeVector,
+    other_label: str | None,
+) -> prelude.AggrFunc: ...
+def topk_median(
+    k: int | float | prelude.InstantVector,
+    vector: prelude.InstantOrRangeVector,
+    other_label: str | None,
+) -> prelude.AggrFunc: ...
+def topk_min(
+    k: int | float | prelude.InstantVector,
+    vector: prelude.InstantOrRangeVector,
+    other_label: str | None,
+) -> prelude.AggrFunc: ...
+def zscore(*vector: prelude.InstantOrRangeVector) -> prelude.AggrFunc: ...
+def abs(vector: prelude.InstantOrRangeVector) -> prelude.TransformFunc: ...
+def absent(vector: prelude.InstantOrRangeVector) -> prelude.TransformFunc: ...
+def acos(vector: prelude.InstantOrRangeVector) -> prelude.TransformFunc: ...
+def acosh(vector: prelude.InstantOrRangeVector) -> prelude.TransformFunc: ...
+def asin(vector: prelude.InstantOrRangeVector) -> prelude.TransformFunc: ...
+def asinh(vector: prelude.InstantOrRangeVector) -> prelude.TransformFunc: ...
+def atan(vector: prelude.InstantOrRangeVector) -> prelude.TransformFunc: ...
+def atanh(vector: prelude.InstantOrRangeVector) -> prelude.TransformFunc: ...
+def bitmap_and(
+    vector: prelude.InstantOrRangeVector, mask: int | float | prelude.InstantVector
+) -> prelude.TransformFunc: ...
+def bitmap_or(
+    vector: prelude.InstantOrRangeVector, mask: int | float | prelude.InstantVector
+) -> prelude.TransformFunc: ...
+def bitmap_xor(
+    vector: prelude.InstantOrRangeVector, mask: int | float | prelude.InstantVector
+) -> prelude.TransformFunc: ...
+def buckets_limit(
+    limit: int | float | prelude.InstantVector,
+    buckets: int | float | prelude.InstantVector,
+) -> prelude.TransformFunc: ...
+def ceil(vector: prelude.InstantOrRangeVector) -> prelude.TransformFunc: ...
+def clamp(
+    vector: prelude.InstantOrRangeVector,
+    min: int | float | prelude.InstantVector,
+    max: int | float | prelude.InstantVector,
+) -> prelude.TransformFunc: ...
+def clamp_max(
+    vector: prelude.InstantOrRangeVector, max: int | float | prelude.InstantVector
+) -> prelude.TransformFunc: ...
+def clamp_min(
+    vector: prelude.InstantOrRangeVector, min: int | float | prelude.InstantVector
+) -> prelude.TransformFunc: ...
+def cos(vector: prelude.InstantOrRangeVector) -> prelude.TransformFunc: ...
+def cosh(vector: prelude.InstantOrRangeVector) -> prelude.TransformFunc: ...
+def day_of_month(vector: prelude.InstantOrRangeVector) -> prelude.TransformFunc: ...
+def day_of_week(vector: prelude.InstantOrRangeVector) -> prelude.TransformFunc: ...
+def day_of_year(vector: prelude.InstantOrRangeVector) -> prelude.TransformFunc: ...
+def days_in_month(vector: prelude.InstantOrRangeVector) -> prelude.TransformFunc: ...
+def deg(vector: prelude.InstantOrRangeVector) -> prelude.TransformFunc: ...
+def drop_empty_series(
+    vector: prelude.InstantOrRangeVector,
+) -> prelude.TransformFunc: ...
+def end() -> prelude.TransformFunc: ...
+def exp(vector: prelude.InstantOrRangeVector) -> prelude.TransformFunc: ...
+def floor(vector: prelude.InstantOrRangeVector) -> prelude.TransformFunc: ...
+def histogram_avg(
+    buckets: int | float | prelude.InstantVector,
+) -> prelude.TransformFunc: ...
+def histogram_quantile(
+    phi: int | float | prelude.InstantVector,
+    buckets: int | float | prelude.InstantVector,
+) -> prelude.TransformFunc: ...
+def histogram_share(
+    le: int | float | prelude.InstantVector,
+    buckets: int | float | prelude.InstantVector,
+) -> prelude.TransformFunc: ...
+def histogram_stddev(
+    buckets: int | float | prelude.InstantVector,
+) -> prelude.TransformFunc: ...
+def histogram_stdvar(
+    buckets: int | float | prelude.InstantVector,
+) -> prelude.TransformFunc: ...
+def hour(vector: prelude.InstantOrRangeVector) -> prelude.TransformFunc: ...
+def interpolate(vector: prelude.InstantOrRangeVector) -> prelude.TransformFunc: ...
+def keep_last_value(vector: prelude.InstantOrRangeVector) -> prelude.TransformFunc: ...
+def keep_next_value(vector: prelude.InstantOrRangeVector) -> prelude.TransformFunc: ...
+def limit_offset(
+    limit: int | float | prelude.InstantVector,
+    offset: int | float | prelude.InstantVector,
+    vector: prelude.InstantOrRangeVector,
+) -> prelude.TransformFunc: ...
+def ln(vector: prelude.InstantOrRangeVector) -> prelude.TransformFunc: ...
+def log2(vector: prelude.InstantOrRangeVector) -> prelude.TransformFunc: ...
+def log10(vector: prelude.InstantOrRangeVector) -> prelude.TransformFunc: ...
+def minute(vector: prelude.InstantOrRangeVector) -> prelude.TransformFunc: ...
+def month(vector: prelude.InstantOrRangeVector) -> prelude.TransformFunc: ...
+def now() -> prelude.TransformFunc: ...
+def pi() -> prelude.TransformFunc: ...
+def rad(vector: prelude.InstantOrRangeVector) -> prelude.TransformFunc: ...
+def prometheus_buckets(
+    buckets: int | float | prelude.InstantVector,
+) -> prelude.TransformFunc: ...
+def rand(seed: int | float | prelude.InstantVector) -> prelude.TransformFunc: ...
+def rand_exponential(
+    seed: int | float | prelude.InstantVector,
+) -> prelude.TransformFunc: ...
+def rand_normal(seed: int | float | prelude.InstantVector) -> prelude.TransformFunc: ...
+def range_avg(vector: prelude.InstantOrRangeVector) -> prelude.TransformFunc: ...
+def range_first(vector: prelude.InstantOrRangeVector) -> prelude.TransformFunc: ...
+def range_last(vector: prelude.InstantOrRangeVector) -> prelude.TransformFunc: ...
+def range_linear_regression(
+    vector: prelude.InstantOrRangeVector,
+) -> prelude.TransformFunc: ...
+def range_mad(vector: prelude.InstantOrRangeVector) -> prelude.TransformFunc: ...
+def range_max(vector: prelude.InstantOrRangeVector) -> prelude.TransformFunc: ...
+def range_median(vector: prelude.InstantOrRangeVector) -> prelude.TransformFunc: ...
+def range_min(vector: prelude.InstantOrRangeVector) -> prelude.TransformFunc: ...
+def range_normalize(*vector: prelude.InstantOrRangeVector) -> prelude.TransformFunc: ...
+def range_quantile(
+    phi: int | float | prelude.InstantVector, vector: prelude.InstantOrRangeVector
+) -> prelude.TransformFunc: ...
+def range_stddev(vector: prelude.InstantOrRangeVector) -> prelude.TransformFunc: ...
+def range_stdvar(vector: prelude.InstantOrRangeVector) -> prelude.TransformFunc: ...
+def range_sum(vector: prelude.InstantOrRangeVector) -> prelude.TransformFunc: ...
+def range_trim_outliers(
+    k: int | float | prelude.InstantVector, vector: prelude.InstantOrRangeVector
+) -> prelude.TransformFunc: ...
+def range_trim_spikes(
+    phi: int | float | prelude.InstantVector, vector: prelude.InstantOrRangeVector
+) -> prelude.TransformFunc: ...
+def range_trim_zscore(
+    z: int | float | prelude.InstantVector, vector: prelude.InstantOrRangeVector
+) -> prelude.TransformFunc: ...
+def range_zscore(vector: prelude.InstantOrRangeVector) -> prelude.TransformFunc: ...
+def remove_resets(vector: prelude.InstantOrRangeVector) -> prelude.TransformFunc: ...
+def round(
+    vector: prelude.InstantOrRangeVector, nearest: int | float | prelude.InstantVector
+) -> prelude.TransformFunc: ...
+def ru(
+    free: int | float | prelude.InstantVector, max: int | float | prelude.InstantVector
+) -> prelude.TransformFunc: ...
+def running_avg(vector: prelude.InstantOrRangeVector) -> prelude.TransformFunc: ...
+def running_max(vector: prelude.InstantOrRangeVector) -> prelude.TransformFunc: ...
+def running_min(vector: prelude.InstantOrRangeVector) -> prelude.TransformFunc: ...
+def running_sum(vector: prelude.InstantOrRangeVector) -> prelude.TransformFunc: ...
+def scalar(vector: prelude.InstantOrRangeVector) -> prelude.TransformFunc: ...
+def sgn(vector: prelude.InstantOrRangeVector) -> prelude.TransformFunc: ...
+def sin(vector: prelude.InstantOrRangeVector) -> prelude.TransformFunc: ...
+def sinh(vector: prelude.InstantOrRangeVector) -> prelude.TransformFunc: ...
+def tan(vector: prelude.InstantOrRangeVector) -> prelude.TransformFunc: ...
+def tanh(vector: prelude.InstantOrRangeVector) -> prelude.TransformFunc: ...
+def smooth_exponential(
+    vector: prelude.InstantOrRangeVector, sf: int | float | prelude.InstantVector
+) -> prelude.TransformFunc: ...
+def sort(vector: prelude.InstantOrRangeVector) -> prelude.TransformFunc: ...
+def sort_desc(vector: prelude.InstantOrRangeVector) -> prelude.TransformFunc: ...
+def sqrt(vector: prelude.InstantOrRangeVector) -> prelude.TransformFunc: ...
+def start() -> prelude.TransformFunc: ...
+def step() -> prelude.TransformFunc: ...
+def time() -> prelude.TransformFunc: ...
+def timezone_offset(
+    tz: int | float | prelude.InstantVector,
+) -> prelude.TransformFunc: ...
+def ttf(free: int | float | prelude.InstantVector) -> prelude.TransformFunc: ...
+def union(*vector: prelude.InstantOrRangeVector) -> prelude.TransformFunc: ...
+def vector(vector: prelude.InstantOrRangeVector) -> prelude.TransformFunc: ...
+def year(vector: prelude.InstantOrRangeVector) -> prelude.TransformFunc: ...
+def alias(
+    vector: prelude.InstantOrRangeVector, name: str
+) -> prelude.LabelManipulationFunc: ...
+def drop_common_labels(
+    *vector: prelude.InstantOrRangeVector,
+) -> prelude.LabelManipulationFunc: ...
+def label_del(
+    vector: prelude.InstantOrRangeVector, *label1: str
+) -> prelude.LabelManipulationFunc: ...
+def label_graphite_group(
+    vector: prelude.InstantOrRangeVector,
+    *groupNum1: int | float | prelude.InstantVector,
+) -> prelude.LabelManipulationFunc: ...
+def label_join(
+    vector: prelude.InstantOrRangeVector,
+    dst_label: str,
+    separator: str,
+    *src_label1: str,
+) -> prelude.LabelManipulationFunc: ...
+def label_keep(
+    vector: prelude.InstantOrRangeVector, *label1: str
+) -> prelude.LabelManipulationFunc: ...
+def label_lowercase(
+    vector: prelude.InstantOrRangeVector, *label1: str
+) -> prelude.LabelManipulationFunc: ...
+def label_match(
+    vector: prelude.InstantOrRangeVector, label: str, regexp: str
+) -> prelude.LabelManipulationFunc: ...
+def label_mismatch(
+    vector: prelude.InstantOrRangeVector, label: str, regexp: str
+) -> prelude.LabelManipulationFunc: ...
+def label_replace(
+    vector: prelude.InstantOrRangeVector,
+    dst_label: str,
+    replacement: str,
+    src_label: str,
+    regex: str,
+) -> prelude.LabelManipulationFunc: ...
+def label_transform(
+    vector: prelude.InstantOrRangeVector, label: str, regexp: str, replacement: str
+) -> prelude.LabelManipulationFunc: ...
+def label_uppercase(
+    vector: prelude.InstantOrRangeVector, *label1: str
+) -> prelude.LabelManipulationFunc: ...
+def label_value(
+    vector: prelude.InstantOrRangeVector, label: str
+) -> prelude.LabelManipulationFunc: ...
+def labels_equal(
+    vector: prelude.InstantOrRangeVector, label1: str, *label2: str
+) -> prelude.LabelManipulationFunc: ...
+def sort_by_label(
+    vector: prelude.InstantOrRangeVector, *label1: str
+) -> prelude.LabelManipulationFunc: ...
+def sort_by_label_desc(
+    vector: prelude.InstantOrRangeVector, *label1: str
+) -> prelude.LabelManipulationFunc: ...
+def sort_by_label_numeric(
+    vector: prelude.InstantOrRangeVector, *label1: str
+) -> prelude.LabelManipulationFunc: ...
+def sort_by_label_numeric_desc(
+    vector: prelude.InstantOrRangeVector, *label1: str
+) -> prelude.LabelManipulationFunc: ...
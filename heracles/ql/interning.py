@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from typing import Any, TypeVar
+
+from heracles.ql import prelude
+
+__all__ = ["Interner"]
+
+_N = TypeVar("_N", bound=prelude.Timeseries)
+
+
+class Interner:
+    """
+    Interner makes structurally identical subtrees share a single instance.
+
+    Rule libraries tend to build the same selectors and sub-expressions many times
+    over, for example `v.up(job="x")` or `ql.rate(v.foo[5 * ql.Minute])` in every
+    alert for a service. Passing each expression through the same Interner returns
+    an equivalent tree in which every repeated subtree is one shared object. This
+    reduces memory, lets the render cache and structural hash cache be reused, and
+    makes shared subtrees detectable by identity.
+
+    Interning never modifies the trees passed in. A node is reused as-is when its
+    children are already canonical. Otherwise a copy is made which points at the
+    canonical children. The interner keeps every canonical node alive, so it should
+    be discarded once the trees it produced are no longer being built up.
+    """
+
+    def __init__(self) -> None:
+        # keyed by a node's structure with its children replaced by the ids of their
+        # canonical instances. Those instances are kept alive by this table, so
+        # their ids can't be reused while the table exists.
+        self._table: dict[tuple[Any, ...], prelude.Timeseries] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    def intern(self, root: _N) -> _N:
+        """
+        Returns the canonical instance of the tree rooted at root.
+        """
+        # maps the id of each node in this tree to its canonical node. The original
+        # nodes are kept alive by root for the duration of the call.
+        canonical: dict[int, prelude.Timeseries] = {}
+        stack: list[prelude.Timeseries] = [root]
+        while stack:
+            node = stack[-1]
+            if id(node) in canonical:
+                stack.pop()
+                continue
+            pending = [
+                c
+                for c in node._children_to_visit()
+                if isinstance(c, prelude.Timeseries) and id(c) not in canonical
+            ]
+            if pending:
+                stack.extend(pending)
+                continue
+            stack.pop()
+
+            replaced = node._map_children(lambda c: canonical[id(c)])
+            desc, children = replaced._structure()
+            key = (desc, tuple(id(c) for c in children))
+            if existing := self._table.get(key):
+                self.hits += 1
+                canonical[id(node)] = existing
+            else:
+                self.misses += 1
+                self._table[key] = replaced
+                canonical[id(node)] = replaced
+        return canonical[id(root)]  # type: ignore
@@ -0,0 +1,483 @@
+from __future__ import annotations
+
+import array
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any
+
+from heracles.ql import prelude
+
+__all__ = ["ExprIR", "ExprIRVisitor", "NodeRef"]
+
+# Each field value of a node is encoded as one or more operand words. The low bits of
+# a word are a tag and the remaining bits are its payload. Containers are encoded as
+# a header word holding their length, followed by their encoded elements (or
+# key/value pairs, for dicts).
+_TAG_BITS = 3
+_TAG_MASK = (1 << _TAG_BITS) - 1
+_TAG_CHILD = 0  # payload is the index of a node
+_TAG_CONST = 1  # payload is an index into the constant table
+_TAG_TUPLE = 2
+_TAG_LIST = 3
+_TAG_DICT = 4
+
+
+class NodeRef(prelude.Timeseries):
+    """
+    NodeRef stands in for a child node in nodes decoded by ExprIR.node. It only
+    records the index of the child within the IR.
+    """
+
+    __slots__ = ("index",)
+
+    def __init__(self, index: int) -> None:
+        super().__init__()
+        self.index = index
+
+    def _render_parts(self) -> tuple[str | prelude.Timeseries, ...]:
+        raise TypeError("NodeRef can only be rendered through ExprIR.render")
+
+    def __repr__(self) -> str:
+        return f"NodeRef({self.index})"
+
+
+class ExprIR:
+    """
+    ExprIR is a flat, array-backed form of one or more expression trees.
+
+    Nodes are stored in postorder, so every node appears after its children, and
+    roots holds the index of each tree's root. For each node:
+      - types[ops[i]] is the node's class,
+      - operands[spans[i]:spans[i + 1]] encodes the node's fields, in _fields
+        order, with children referenced by index and every other value referenced
+        by its index in consts.
+    Subtrees which are shared by identity in the original tree are stored once.
+    Annotations, which almost no nodes have, are kept in a dict keyed by node index.
+
+    An ExprIR holds no references to the tree it was compiled from, and pickles as
+    a handful of arrays and lists, which makes it cheap to send between processes.
+    It can be traversed with an ExprIRVisitor and rendered without building nodes,
+    except for node types defined outside heracles.ql.prelude, which render
+    through a node built with NodeRef children.
+    """
+
+    __slots__ = ("annotations", "consts", "operands", "ops", "roots", "spans", "types")
+
+    def __init__(
+        self,
+        types: list[type[prelude.Timeseries]],
+        ops: array.array[int],
+        spans: array.array[int],
+        operands: array.array[int],
+        consts: list[Any],
+        annotations: dict[int, tuple[prelude.AppliableAnnotation[Any], ...]],
+        roots: array.array[int],
+    ) -> None:
+        self.types = types
+        self.ops = ops
+        self.spans = spans
+        self.operands = operands
+        self.consts = consts
+        self.annotations = annotations
+        self.roots = roots
+
+    @classmethod
+    def compile(cls, root: prelude.Timeseries) -> ExprIR:
+        """
+        Compiles the tree rooted at root into its flat form.
+        """
+        return _Compiler().compile((root,))
+
+    @classmethod
+    def compile_many(cls, roots: Iterable[prelude.Timeseries]) -> ExprIR:
+        """
+        Compiles several trees into one IR. Subtrees and constants shared between
+        the trees are stored once.
+        """
+        return _Compiler().compile(roots)
+
+    def __len__(self) -> int:
+        return len(self.ops)
+
+    @property
+    def root(self) -> int:
+        """
+        The index of the root node of an IR compiled from a single tree.
+        """
+        if len(self.roots) != 1:
+            raise ValueError(f"IR has {len(self.roots)} roots, expected 1")
+        return self.roots[0]
+
+    def node_type(self, i: int) -> type[prelude.Timeseries]:
+        return self.types[self.ops[i]]
+
+    def children(self, i: int) -> list[int]:
+        """
+        Returns the indices of node i's direct children, in field order.
+        """
+        return [
+            word >> _TAG_BITS
+            for word in self.operands[self.spans[i] : self.spans[i + 1]]
+            if word & _TAG_MASK == _TAG_CHILD
+        ]
+
+    def indices_of(self, node_type: type[prelude.Timeseries]) -> Iterator[int]:
+        """
+        Yields the indices of every node which is an instance of node_type, in
+        postorder.
+        """
+        matching = {i for i, t in enumerate(self.types) if issubclass(t, node_type)}
+        if not matching:
+            return
+        for i, op in enumerate(self.ops):
+            if op in matching:
+                yield i
+
+    def fields(self, i: int) -> dict[str, Any]:
+        """
+        Returns the decoded fields of node i, with children as NodeRefs.
+        """
+        node_type = self.node_type(i)
+        values = self._decode_fields(i, NodeRef)
+        return dict(zip(node_type._fields, values))
+
+    def node(self, i: int) -> prelude.Timeseries:
+        """
+        Returns node i on its own, with its children replaced by NodeRefs.
+        """
+        return self._build(i, NodeRef)
+
+    def to_timeseries(self) -> prelude.Timeseries:
+        """
+        Rebuilds the expression tree. Nodes which were shared in the original tree
+        are shared in the rebuilt tree as well.
+        """
+        self.root  # raises if there's more than one tree
+        return self.to_timeseries_many()[0]
+
+    def to_timeseries_many(self) -> list[prelude.Timeseries]:
+        """
+        Rebuilds every expression tree, in the order they were compiled.
+        """
+        built: list[prelude.Timeseries] = []
+        for i in range(len(self.ops)):
+            built.append(self._build(i, built.__getitem__))
+        return [built[r] for r in self.roots]
+
+    def accept_visitor(
+        self, visitor: ExprIRVisitor, root: int | None = None
+    ) -> prelude.VisitorAction | None:
+        """
+        Traverses the tree rooted at node root, or the only tree if root is None,
+        depth first, calling the visitor on each node's index. Shared nodes are
+        visited once for each place they appear in the tree, like
+        Timeseries.accept_visitor.
+        """
+        # handlers are resolved once per node type, rather than once per node
+        handlers = [visitor._handler(t) for t in self.types]
+        ops = self.ops
+
+        def handle(i: int) -> prelude.VisitorAction | None:
+            handler = handlers[ops[i]]
+            return handler(self, i) if handler is not None else None
+
+        start = self.root if root is None else root
+        if action := handle(start):
+            return action
+        stack = [iter(self.children(start))]
+        while stack:
+            child = next(stack[-1], None)
+            if child is None:
+                stack.pop()
+                continue
+            action = handle(child)
+            if action == prelude.VisitorAction.STOP:
+                return prelude.VisitorAction.STOP
+            if action == prelude.VisitorAction.CONTINUE:
+                continue
+            stack.append(iter(self.children(child)))
+        return prelude.VisitorAction.RECURSE
+
+    def render(self, root: int | None = None) -> str:
+        """
+        Renders the tree rooted at node root, or the only tree if root is None,
+        directly from its flat form without rebuilding the tree. The output is
+        identical to rendering the original tree.
+        """
+        out: list[str] = []
+        templates = [_parts_template(t) for t in self.types]
+        # the parts of each node only depend on its own fields, so they're computed
+        # once even if a node is shared
+        parts_cache: dict[int, tuple[str | prelude.Timeseries, ...]] = {}
+        refs: dict[int, NodeRef] = {}
+
+        def child(j: int) -> NodeRef:
+            ref = refs.get(j)
+            if ref is None:
+                ref = refs[j] = NodeRef(j)
+            return ref
+
+        def parts(i: int) -> Iterator[str | prelude.Timeseries]:
+            if i not in parts_cache:
+                template = templates[self.ops[i]]
+                if template is None:
+                    parts_cache[i] = tuple(self.node(i)._render_parts())
+                else:
+                    parts_cache[i] = tuple(template(*self._decode_fields(i, child)))
+            return iter(parts_cache[i])
+
+        stack = [parts(self.root if root is None else root)]
+        while stack:
+            for part in stack[-1]:
+                if isinstance(part, str):
+                    out.append(part)
+                else:
+                    stack.append(parts(part.index))  # type: ignore[attr-defined]
+                    break
+            else:
+                stack.pop()
+        return "".join(out)
+
+    def _build(
+        self, i: int, child: Callable[[int], prelude.Timeseries]
+    ) -> prelude.Timeseries:
+        node_type = self.node_type(i)
+        node = node_type.__new__(node_type)
+        # equivalent to Timeseries.__init__, which is too slow to call for every
+        # node of a large IR
+        annotations = self.annotations.get(i)
+        node._annotations = list(annotations) if annotations else None
+        node._rendered = None
+        node._structural_hash = None
+        for field, value in zip(node_type._fields, self._decode_fields(i, child)):
+            setattr(node, field, value)
+        return node
+
+    def _decode_fields(
+        self, i: int, child: Callable[[int], prelude.Timeseries]
+    ) -> list[Any]:
+        operands = self.operands
+        consts = self.consts
+        pos = self.spans[i]
+        end = self.spans[i + 1]
+
+        def decode() -> Any:
+            nonlocal pos
+            word = operands[pos]
+            pos += 1
+            tag = word & _TAG_MASK
+            payload = word >> _TAG_BITS
+            if tag == _TAG_CONST:
+                return consts[payload]
+            if tag == _TAG_CHILD:
+                return child(payload)
+            if tag == _TAG_DICT:
+                return {decode(): decode() for _ in range(payload)}
+            items = [decode() for _ in range(payload)]
+            return tuple(items) if tag == _TAG_TUPLE else items
+
+        values = []
+        while pos < end:
+            # most fields are constants or children, which are decoded inline
+            word = operands[pos]
+            tag = word & _TAG_MASK
+            if tag == _TAG_CONST:
+                values.append(consts[word >> _TAG_BITS])
+                pos += 1
+            elif tag == _TAG_CHILD:
+                values.append(child(word >> _TAG_BITS))
+                pos += 1
+            else:
+                values.append(decode())
+        return values
+
+
+class ExprIRVisitor:
+    """
+    ExprIRVisitor visits the nodes of an ExprIR by index, without building them.
+
+    Subclasses define any of TimeseriesVisitor's visit_* methods, which take the IR
+    and a node index rather than a node. The method which handles a node is picked
+    by the node's type, falling back along the same chain as TimeseriesVisitor's
+    defaults, and may return a VisitorAction to control traversal.
+    """
+
+    def visit_node(self, ir: ExprIR, i: int) -> prelude.VisitorAction | None:
+        return None
+
+    def _handler(
+        self, node_type: type[prelude.Timeseries]
+    ) -> Callable[[ExprIR, int], prelude.VisitorAction | None] | None:
+        name: str | None = getattr(node_type, "_visit_method", "visit_node")
+        while name is not None:
+            method = getattr(type(self), name, None)
+            if method is not None and method is not ExprIRVisitor.visit_node:
+                return getattr(self, name)  # type: ignore[no-any-return]
+            name = prelude._VISIT_FALLBACKS.get(name)
+        return None
+
+
+_PartsTemplate = Callable[..., Iterable[str | prelude.Timeseries]]
+_PARTS_TEMPLATES: dict[type[prelude.Timeseries], _PartsTemplate | None] = {}
+
+
+def _parts_template(node_type: type[prelude.Timeseries]) -> _PartsTemplate | None:
+    """
+    Returns the function which computes the render parts of a node_type from its
+    field values, or None if its nodes have to be built to be rendered. Only node
+    types whose _render_parts comes from a class defining _parts_of for the same
+    fields have one.
+    """
+    try:
+        return _PARTS_TEMPLATES[node_type]
+    except KeyError:
+        pass
+    template = None
+    for cls in node_type.__mro__:
+        if "_render_parts" in cls.__dict__:
+            fields = getattr(cls, "_fields", None)
+            if "_parts_of" in cls.__dict__ and fields == node_type._fields:
+                template = node_type._parts_of  # type: ignore[attr-defined]
+            break
+    _PARTS_TEMPLATES[node_type] = template
+    return template
+
+
+class _Compiler:
+    def __init__(self) -> None:
+        self.types: list[type[prelude.Timeseries]] = []
+        self.type_ids: dict[type[prelude.Timeseries], int] = {}
+        self.ops = array.array("H")
+        self.spans = array.array("I", [0])
+        self.operands = array.array("q")
+        self.consts: list[Any] = []
+        self.const_ids: dict[Any, int] = {}
+        self.annotations: dict[int, tuple[prelude.AppliableAnnotation[Any], ...]] = {}
+        # maps the id of each compiled node to its index
+        self.indices: dict[int, int] = {}
+
+    def compile(self, roots: Iterable[prelude.Timeseries]) -> ExprIR:
+        # the trees are kept alive until compilation finishes, since nodes are
+        # tracked by id
+        trees = list(roots)
+        root_indices = array.array("I")
+        for root in trees:
+            self._compile_tree(root)
+            root_indices.append(self.indices[id(root)])
+        return ExprIR(
+            self.types,
+            self.ops,
+            self.spans,
+            self.operands,
+            self.consts,
+            self.annotations,
+            root_indices,
+        )
+
+    def _compile_tree(self, root: prelude.Timeseries) -> None:
+        indices = self.indices
+        # each entry is a node and whether its children have already been pushed
+        stack = [(root, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if id(node) in indices:
+                continue
+            if expanded:
+                self._emit(node)
+                continue
+            stack.append((node, True))
+            pending: list[prelude.Timeseries] = []
+            for field in node._fields:
+                _collect_nodes(getattr(node, field), pending)
+            # children are pushed in reverse so that they're emitted in field order
+            stack.extend((c, False) for c in reversed(pending) if id(c) not in indices)
+
+    def _emit(self, node: prelude.Timeseries) -> None:
+        node_type = type(node)
+        type_id = self.type_ids.get(node_type)
+        if type_id is None:
+            type_id = self.type_ids[node_type] = len(self.types)
+            self.types.append(node_type)
+        index = len(self.ops)
+        self.ops.append(type_id)
+        for field in node_type._fields:
+            self._encode(getattr(node, field))
+        self.spans.append(len(self.operands))
+        if node._annotations:
+            self.annotations[index] = tuple(node._annotations)
+        self.indices[id(node)] = index
+
+    def _encode(self, value: Any) -> None:
+        # values are dispatched on their exact type: this is the hot loop of
+        # compilation, and subclasses of the container types (like DurationUnit,
+        # which is a tuple) must be stored as constants
+        value_type = type(value)
+        if value_type in _SCALAR_TYPES:
+            self.operands.append(
+                self._scalar(value_type, value) << _TAG_BITS | _TAG_CONST
+            )
+        elif value_type is tuple or value_type is list:
+            tag = _TAG_TUPLE if value_type is tuple else _TAG_LIST
+            self.operands.append(len(value) << _TAG_BITS | tag)
+            for v in value:
+                self._encode(v)
+        elif value_type is dict:
+            self.operands.append(len(value) << _TAG_BITS | _TAG_DICT)
+            for k, v in value.items():
+                self._encode(k)
+                self._encode(v)
+        elif _is_node_type(value_type):
+            self.operands.append(self.indices[id(value)] << _TAG_BITS | _TAG_CHILD)
+        else:
+            self.operands.append(self._const(value) << _TAG_BITS | _TAG_CONST)
+
+    def _scalar(self, value_type: type, value: Any) -> int:
+        # constants are keyed by type so that 1, 1.0 and True stay distinct, and
+        # zero floats by repr so that 0.0 and -0.0 do
+        key = (value_type, value if value or value_type is not float else repr(value))
+        const_id = self.const_ids.get(key)
+        if const_id is None:
+            const_id = self.const_ids[key] = len(self.consts)
+            self.consts.append(value)
+        return const_id
+
+    def _const(self, value: Any) -> int:
+        key = (type(value), prelude._freeze_field(value, []))
+        try:
+            const_id = self.const_ids.get(key)
+        except TypeError:
+            # unhashable values are stored without being interned
+            self.consts.append(value)
+            return len(self.consts) - 1
+        if const_id is None:
+            const_id = self.const_ids[key] = len(self.consts)
+            self.consts.append(value)
+        return const_id
+
+
+_SCALAR_TYPES = frozenset((str, int, float, bool, type(None)))
+
+# caches whether each type seen during compilation is a node type, since isinstance
+# checks against abstract base classes are slow
+_NODE_TYPES: dict[type, bool] = {}
+
+
+def _is_node_type(t: type) -> bool:
+    try:
+        return _NODE_TYPES[t]
+    except KeyError:
+        is_node = _NODE_TYPES[t] = issubclass(t, prelude.Timeseries)
+        return is_node
+
+
+def _collect_nodes(value: Any, out: list[prelude.Timeseries]) -> None:
+    value_type = type(value)
+    if value_type in _SCALAR_TYPES:
+        return
+    if value_type is tuple or value_type is list:
+        for v in value:
+            _collect_nodes(v, out)
+    elif value_type is dict:
+        for v in value.values():
+            _collect_nodes(v, out)
+    elif _is_node_type(value_type):
+        out.append(value)
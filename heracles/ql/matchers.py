@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import dataclasses
+
+from heracles.ql import prelude
+
+__all__ = [
+    "MatcherWarning",
+    "normalize_matcher_expr",
+    "normalize_matchers",
+    "unindexed_matchers",
+    "unindexed_reason",
+]
+
+# characters with a special meaning in RE2 syntax
+_REGEX_META = frozenset(".^$*+?()[]{}|\\")
+
+# matchers are ordered so that the most selective kinds come first
+_KIND_ORDER = {
+    prelude.MatcherKind.Equal: 0,
+    prelude.MatcherKind.Regex: 1,
+    prelude.MatcherKind.NotEqual: 2,
+    prelude.MatcherKind.NotRegex: 3,
+}
+
+
+@dataclasses.dataclass(frozen=True)
+class MatcherWarning:
+    """
+    MatcherWarning flags a label matcher which can't be answered from the index
+    and makes the storage scan every value of the label.
+    """
+
+    selector: prelude.SelectedInstantVector
+    label: str
+    matcher: prelude.Matcher
+    reason: str
+
+    def __str__(self) -> str:
+        return (
+            f"{self.label}{self.matcher.kind.value}{self.matcher.value!r} in "
+            f"{self.selector.render()}: {self.reason}"
+        )
+
+
+def normalize_matcher_expr(expr: prelude.MatcherExpr) -> prelude.MatcherExpr:
+    """
+    Returns the canonical form of the matchers for one label:
+      - duplicate matchers are removed,
+      - regexes which only match literals are replaced by equality, so =~"a"
+        becomes ="a" and !~"a" becomes !="a", and literal alternations are
+        sorted, so =~"b|a|a" becomes =~"a|b",
+      - compatible matchers are merged: equality makes other literal matchers
+        redundant, literal alternations are intersected, and several literal
+        negative matchers are combined into a single !~.
+
+    Matchers which can never match together, like ="a" and ="b", are left as
+    they are rather than hidden. The matchers come out ordered by kind (=, =~,
+    !=, !~) and then by value, and a single equality matcher comes out as a str.
+    """
+    matchers = [
+        prelude.EQ(m) if isinstance(m, str) else m
+        for m in (expr if isinstance(expr, tuple) else (expr,))
+    ]
+    # literal values of each kind, and the matchers which aren't literal
+    equal: set[str] = set()
+    # a dict rather than a set, so that the matchers keep a deterministic order
+    regex_sets: dict[frozenset[str], None] = {}
+    negated: set[str] = set()
+    others: dict[tuple[prelude.MatcherKind, str], prelude.Matcher] = {}
+    for m in matchers:
+        literals = _literal_values(m)
+        if m.kind == prelude.MatcherKind.Equal:
+            equal.add(m.value)
+        elif m.kind == prelude.MatcherKind.NotEqual:
+            negated.add(m.value)
+        elif literals is None:
+            others[(m.kind, m.value)] = m
+        elif m.kind == prelude.MatcherKind.Regex:
+            regex_sets[literals] = None
+        else:
+            negated.update(literals)
+
+    merged: list[prelude.Matcher] = []
+    if len(equal) == 1:
+        (value,) = equal
+        if value in negated or not all(value in s for s in regex_sets):
+            # never matches, keep every matcher so that it's visible
+            merged.extend(_literal_matcher(s, positive=True) for s in regex_sets)
+            merged.extend(_negated_matchers(negated))
+        merged.append(prelude.EQ(value))
+    elif equal:
+        merged.extend(prelude.EQ(v) for v in equal)
+        merged.extend(_literal_matcher(s, positive=True) for s in regex_sets)
+        merged.extend(_negated_matchers(negated))
+    elif regex_sets:
+        allowed = frozenset.intersection(*regex_sets) - negated
+        if allowed:
+            merged.append(_literal_matcher(allowed, positive=True))
+        else:
+            merged.extend(_literal_matcher(s, positive=True) for s in regex_sets)
+            merged.extend(_negated_matchers(negated))
+    else:
+        merged.extend(_negated_matchers(negated))
+    merged.extend(others.values())
+
+    merged.sort(key=lambda m: (_KIND_ORDER[m.kind], m.value))
+    if len(merged) == 1:
+        (m,) = merged
+        return m.value if m.kind == prelude.MatcherKind.Equal else m
+    return tuple(m.value if m.kind == prelude.MatcherKind.Equal else m for m in merged)
+
+
+def normalize_matchers(root: prelude.Timeseries) -> prelude.Timeseries:
+    """
+    Returns the expression with the matchers of every selector normalized by
+    normalize_matcher_expr. Selectors which are already normalized are returned
+    as-is, and root is never modified.
+    """
+    return prelude._rewrite(root, _normalize_selector)
+
+
+def unindexed_matchers(root: prelude.Timeseries) -> list[MatcherWarning]:
+    """
+    Returns a warning for every regex matcher in the expression which can't use
+    the label index, because it doesn't start with a literal prefix or a literal
+    alternation. For example =~".*foo" makes the storage check every value of the
+    label, while =~"foo.*" only checks values starting with foo.
+    """
+    warnings: list[MatcherWarning] = []
+
+    def check(t: prelude.SelectedInstantVector) -> None:
+        for label, expr in t._selectors.items():
+            for m in expr if isinstance(expr, tuple) else (expr,):
+                if not isinstance(m, prelude.Matcher):
+                    continue
+                if m.kind != prelude.MatcherKind.Regex:
+                    continue
+                reason = unindexed_reason(m.value)
+                if reason:
+                    warnings.append(MatcherWarning(t, label, m, reason))
+
+    root.accept_visitor(check)
+    return warnings
+
+
+def _normalize_selector(node: prelude.Timeseries) -> prelude.Timeseries:
+    if not isinstance(node, prelude.SelectedInstantVector):
+        return node
+    normalized = {
+        label: normalize_matcher_expr(expr) for label, expr in node._selectors.items()
+    }
+    if all(
+        _same_matchers(normalized[label], expr)
+        for label, expr in node._selectors.items()
+    ):
+        return node
+    copied = node._copy()
+    copied._selectors = normalized
+    return copied
+
+
+def _same_matchers(a: prelude.MatcherExpr, b: prelude.MatcherExpr) -> bool:
+    a_items = a if isinstance(a, tuple) else (a,)
+    b_items = b if isinstance(b, tuple) else (b,)
+    return len(a_items) == len(b_items) and all(
+        _matcher_key(x) == _matcher_key(y) for x, y in zip(a_items, b_items)
+    )
+
+
+def _matcher_key(m: str | prelude.Matcher) -> tuple[prelude.MatcherKind, str]:
+    if isinstance(m, str):
+        return (prelude.MatcherKind.Equal, m)
+    return (m.kind, m.value)
+
+
+def _literal_values(m: prelude.Matcher) -> frozenset[str] | None:
+    """
+    Returns the set of literal values a matcher matches (or, for negative
+    matchers, excludes), or None if it isn't a literal or literal alternation.
+    """
+    if m.kind in (prelude.MatcherKind.Equal, prelude.MatcherKind.NotEqual):
+        return frozenset((m.value,))
+    values = []
+    current: list[str] = []
+    chars = iter(m.value)
+    for c in chars:
+        if c == "|":
+            values.append("".join(current))
+            current = []
+        elif c == "\\":
+            escaped = next(chars, None)
+            # \d, \w and friends are character classes, not escaped literals
+            if escaped is None or escaped.isalnum():
+                return None
+            current.append(escaped)
+        elif c in _REGEX_META:
+            return None
+        else:
+            current.append(c)
+    values.append("".join(current))
+    return frozenset(values)
+
+
+def _literal_matcher(values: frozenset[str], *, positive: bool) -> prelude.Matcher:
+    if len(values) == 1:
+        (value,) = values
+        return prelude.EQ(value) if positive else prelude.NE(value)
+    pattern = "|".join(_escape(v) for v in sorted(values))
+    return prelude.RE(pattern) if positive else prelude.NR(pattern)
+
+
+def _negated_matchers(values: set[str]) -> list[prelude.Matcher]:
+    # != "" means that the label is set, which reads better on its own than as
+    # an empty alternative of a regex
+    matchers = []
+    if "" in values:
+        matchers.append(prelude.NE(""))
+    rest = frozenset(values - {""})
+    if rest:
+        matchers.append(_literal_matcher(rest, positive=False))
+    return matchers
+
+
+def _escape(value: str) -> str:
+    return "".join(f"\\{c}" if c in _REGEX_META else c for c in value)
+
+
+def unindexed_reason(pattern: str) -> str | None:
+    """
+    Returns why a regex matcher's pattern can't be answered from the index, or
+    None if it can.
+    """
+    if pattern in (".*", ".+"):
+        # matching any value (or any non-empty value) is answered by the index
+        return None
+    for prefix in (".*", ".+", "(?i)"):
+        if pattern.startswith(prefix):
+            return f"regex starts with {prefix}, so it has no literal prefix"
+    return None
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import math
+from collections.abc import Iterator, Sequence
+
+from heracles.ql import prelude
+
+__all__ = ["format_number", "render_minimal"]
+
+# binding strength of each binary operator, following MetricsQL. Operators which
+# bind more tightly have higher values.
+_PRECEDENCE: dict[str, int] = {
+    prelude.BinopKind.or_: 1,
+    prelude.BinopKind.and_: 2,
+    prelude.BinopKind.unless: 2,
+    prelude.BinopKind.eq: 3,
+    prelude.BinopKind.ne: 3,
+    prelude.BinopKind.gt: 3,
+    prelude.BinopKind.ge: 3,
+    prelude.BinopKind.lt: 3,
+    prelude.BinopKind.le: 3,
+    prelude.BinopKind.add: 4,
+    prelude.BinopKind.sub: 4,
+    prelude.BinopKind.mul: 5,
+    prelude.BinopKind.truediv: 5,
+    prelude.BinopKind.mod: 5,
+    prelude.BinopKind.atan2: 5,
+    prelude.BinopKind.pow: 6,
+}
+
+# nodes whose rendered form delimits their children, so a binary operation can be
+# a child without parentheses
+_DELIMITING_TYPES = (prelude.BuiltinFunc, prelude.SubqueryRangeVector)
+
+
+def format_number(v: float) -> str:
+    """
+    Returns the shortest string which parses back to exactly v, such as 5 for 5.0
+    or 1e-07 for 0.0000001.
+    """
+    if v.is_integer() and abs(v) < 1e16:
+        # int() would drop the sign of -0.0
+        return str(int(v)) if v or math.copysign(1, v) > 0 else "-0"
+    return repr(v)
+
+
+def render_minimal(root: prelude.Timeseries) -> str:
+    """
+    Renders root with as few characters as possible while parsing to the same
+    query: binary operations are only parenthesized where MetricsQL's operator
+    precedence and associativity require it, and scalar literals are printed in
+    their shortest exact form (see format_number). For example
+
+        (((a{} + b{}) * 2.0) > 1.5)
+
+    renders as
+
+        (a{} + b{}) * 2 > 1.5
+
+    Every other node renders as it does with render(). Nothing is cached, since
+    the minimal form of a subtree depends on where it appears.
+    """
+    out: list[str] = []
+    stack: list[Iterator[str | prelude.Timeseries]] = [iter(_parts(root))]
+    while stack:
+        for part in stack[-1]:
+            if isinstance(part, str):
+                out.append(part)
+            else:
+                stack.append(iter(_parts(part)))
+                break
+        else:
+            stack.pop()
+    return "".join(out)
+
+
+def _parts(node: prelude.Timeseries) -> Sequence[str | prelude.Timeseries]:
+    if isinstance(node, prelude.ScalarLiteral):
+        return (format_number(node.v),)
+    if isinstance(node, prelude.BinaryOp):
+        return _binop_parts(node)
+    delimits = isinstance(node, _DELIMITING_TYPES)
+    parts: list[str | prelude.Timeseries] = []
+    for part in node._render_parts():
+        if not delimits and isinstance(part, prelude.BinaryOp):
+            parts.extend(("(", part, ")"))
+        else:
+            parts.append(part)
+    return parts
+
+
+def _binop_parts(node: prelude.BinaryOp) -> Sequence[str | prelude.Timeseries]:
+    # the parts of the default rendering are "(", left, " op [modifiers] ", right
+    # and ")". Only the operands need to be wrapped.
+    default = list(node._render_parts())
+    operator = "".join(p for p in default[2:-2] if isinstance(p, str))
+    precedence = _PRECEDENCE[node.op]
+    # ^ is right associative and every other operator is left associative, so an
+    # operand with the same precedence needs parentheses on the other side
+    right_assoc = node.op == prelude.BinopKind.pow
+    parts: list[str | prelude.Timeseries] = []
+    _append_operand(
+        parts,
+        node.left,
+        precedence,
+        wrap_equal=right_assoc,
+        wrap_negative=right_assoc,
+    )
+    parts.append(operator)
+    _append_operand(parts, node.right, precedence, wrap_equal=not right_assoc)
+    return parts
+
+
+def _append_operand(
+    parts: list[str | prelude.Timeseries],
+    operand: prelude.Timeseries,
+    precedence: int,
+    *,
+    wrap_equal: bool,
+    wrap_negative: bool = False,
+) -> None:
+    if isinstance(operand, prelude.BinaryOp):
+        operand_precedence = _PRECEDENCE[operand.op]
+        wrap = operand_precedence < precedence or (
+            wrap_equal and operand_precedence == precedence
+        )
+    else:
+        # unary minus binds less tightly than ^, so -a ^ b is -(a ^ b)
+        wrap = wrap_negative and (
+            isinstance(operand, prelude.UnaryOp)
+            or (isinstance(operand, prelude.ScalarLiteral) and operand.v < 0)
+        )
+    if wrap:
+        parts.extend(("(", operand, ")"))
+    else:
+        parts.append(operand)
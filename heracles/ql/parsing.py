@@ -0,0 +1,339 @@
+from __future__ import annotations
+
+import dataclasses
+import struct
+from collections.abc import Sequence
+from typing import Any
+
+from heracles.ql import _native, prelude, registry
+
+__all__ = ["ParseError", "QuerySyntaxError", "parse", "validate_many"]
+
+# node tags written by Parse in formatter/formatter.go
+_TAG_NUMBER = 1
+_TAG_STRING = 2
+_TAG_DURATION = 3
+_TAG_SELECTOR = 4
+_TAG_ROLLUP = 5
+_TAG_FUNC = 6
+_TAG_AGGR = 7
+_TAG_BINARY_OP = 8
+
+# flags of a rollup node
+_ROLLUP_WINDOW = 1
+_ROLLUP_STEP = 2
+_ROLLUP_INHERIT_STEP = 4
+_ROLLUP_OFFSET = 8
+_ROLLUP_AT = 16
+
+_MATCHER_KINDS = (
+    prelude.MatcherKind.Equal,
+    prelude.MatcherKind.Regex,
+    prelude.MatcherKind.NotEqual,
+    prelude.MatcherKind.NotRegex,
+)
+
+_BINOP_KINDS = {k.value: k for k in prelude.BinopKind}
+
+
+class ParseError(ValueError):
+    """
+    ParseError is raised for queries which MetricsQL can't parse, or which use
+    features heracles can't represent (like the bool modifier).
+    """
+
+    def __init__(self, query: str, message: str) -> None:
+        super().__init__(f"can't parse {query!r}: {message}")
+        self.query = query
+        self.message = message
+
+
+def parse(query: str) -> prelude.Timeseries:
+    """
+    Parses a MetricsQL query into heracles nodes, so that queries written as text
+    can be analyzed and rewritten like any other expression. For example
+
+        sum(rate(http_requests_total{job="api"}[5m])) by (code) > 1
+
+    parses to the expression built by
+
+        ql.sum(ql.rate(v.http_requests_total(job="api")[5 * ql.Minute])).by("code") > 1
+
+    Parsing is done by the metricsql package in the formatter library, which
+    expands WITH templates, so the result is equivalent to the query but may not
+    render the same way. Raises ParseError if the query is invalid or can't be
+    represented, and RuntimeError if the formatter library isn't available.
+    """
+    parse_func = _native.buffer_func("Parse")
+    if parse_func is None:
+        raise RuntimeError("parsing queries requires the formatter library")
+    data = _native.call_buffer_func(parse_func, query.encode())
+    if not data:
+        raise ParseError(query, "the formatter library returned no result")
+    if data[0]:
+        raise ParseError(query, data[1:].decode(errors="replace"))
+    return _decode(query, data, 1)
+
+
+@dataclasses.dataclass(frozen=True)
+class QuerySyntaxError:
+    """
+    QuerySyntaxError describes why MetricsQL can't parse a query. offset is the
+    byte offset into the UTF-8 encoded query at which parsing failed, or None if
+    it isn't known.
+    """
+
+    message: str
+    offset: int | None
+
+    def __str__(self) -> str:
+        if self.offset is None:
+            return self.message
+        return f"at byte {self.offset}: {self.message}"
+
+
+def validate_many(queries: Sequence[str]) -> list[QuerySyntaxError | None]:
+    """
+    Checks that every query can be parsed by MetricsQL, with a single call into
+    the formatter library which parses them in parallel. Returns None for each
+    valid query and a QuerySyntaxError for each invalid one. Unlike parse, this
+    accepts every query MetricsQL does, including ones heracles can't represent.
+    Raises RuntimeError if the formatter library isn't available.
+    """
+    validate_many_func = _native.buffer_func("ValidateMany")
+    if validate_many_func is None:
+        raise RuntimeError("validating queries requires the formatter library")
+    if not queries:
+        return []
+    data = _native.call_buffer_func(validate_many_func, _native.pack_strings(queries))
+    if data is None:
+        raise RuntimeError("the formatter library rejected the batch of queries")
+
+    results: list[QuerySyntaxError | None] = []
+    pos = 0
+    for _ in queries:
+        length, offset = struct.unpack_from("<Ii", data, pos)
+        pos += 8
+        if not length:
+            results.append(None)
+            continue
+        message = data[pos : pos + length].decode(errors="replace")
+        pos += length
+        results.append(QuerySyntaxError(message, None if offset < 0 else offset))
+    return results
+
+
+def _decode(query: str, data: bytes, pos: int) -> prelude.Timeseries:
+    """
+    Builds the nodes described by the AST in data, starting at pos. Nodes are
+    written after their children, so each is built from the values on top of the
+    stack.
+    """
+    reader = _Reader(data, pos)
+    stack: list[Any] = []
+    try:
+        while not reader.done():
+            tag = reader.byte()
+            if tag == _TAG_NUMBER:
+                stack.append(prelude.ScalarLiteral(reader.float()))
+            elif tag == _TAG_STRING:
+                stack.append(reader.string())
+            elif tag == _TAG_DURATION:
+                stack.append(reader.duration())
+            elif tag == _TAG_SELECTOR:
+                stack.append(_selector(reader))
+            elif tag == _TAG_ROLLUP:
+                _rollup(reader, stack)
+            elif tag == _TAG_FUNC:
+                _func(reader, stack)
+            elif tag == _TAG_AGGR:
+                _aggr(reader, stack)
+            elif tag == _TAG_BINARY_OP:
+                _binary_op(reader, stack)
+            else:
+                raise ValueError(f"unknown node tag {tag}")
+        if len(stack) != 1:
+            raise ValueError(f"expected 1 expression, got {len(stack)}")
+        return _as_instant(stack[0])
+    except (ValueError, IndexError, struct.error) as e:
+        raise ParseError(query, str(e)) from e
+
+
+class _Reader:
+    __slots__ = ("data", "pos")
+
+    def __init__(self, data: bytes, pos: int) -> None:
+        self.data = data
+        self.pos = pos
+
+    def done(self) -> bool:
+        return self.pos >= len(self.data)
+
+    def byte(self) -> int:
+        b = self.data[self.pos]
+        self.pos += 1
+        return b
+
+    def uint32(self) -> int:
+        (v,) = struct.unpack_from("<I", self.data, self.pos)
+        self.pos += 4
+        return v  # type: ignore[no-any-return]
+
+    def float(self) -> float:
+        (v,) = struct.unpack_from("<d", self.data, self.pos)
+        self.pos += 8
+        return v  # type: ignore[no-any-return]
+
+    def string(self) -> str:
+        length = self.uint32()
+        end = self.pos + length
+        if end > len(self.data):
+            raise ValueError("truncated string")
+        s = self.data[self.pos : end].decode()
+        self.pos = end
+        return s
+
+    def duration(self) -> prelude.Duration:
+        millis, steps = struct.unpack_from("<qd", self.data, self.pos)
+        self.pos += 16
+        return prelude.Duration(millis, steps)
+
+    def modifier(self) -> tuple[str, list[str]]:
+        op = self.string()
+        return op, [self.string() for _ in range(self.uint32())]
+
+
+def _pop(stack: list[Any], count: int) -> list[Any]:
+    if count > len(stack):
+        raise ValueError("missing operands")
+    if not count:
+        return []
+    values = stack[-count:]
+    del stack[-count:]
+    return values
+
+
+def _as_instant(value: Any) -> prelude.Timeseries:
+    # durations used as numbers, like x > 5m, stand for their length in seconds
+    if isinstance(value, prelude.Duration):
+        if value.interval_value:
+            raise ValueError(f"{value.render()} can't be used as a number")
+        return prelude.ScalarLiteral(value.time_value / 1000)
+    if not isinstance(value, prelude.Timeseries):
+        raise ValueError(f"{value!r} can't be used as an expression")
+    return value
+
+
+def _selector(reader: _Reader) -> prelude.SelectedInstantVector:
+    name: str | None = None
+    selectors: dict[str, prelude.MatcherExpr] = {}
+    for _ in range(reader.uint32()):
+        label = reader.string()
+        kind = _MATCHER_KINDS[reader.byte()]
+        value = reader.string()
+        if label == "__name__" and kind == prelude.MatcherKind.Equal and name is None:
+            name = value
+            continue
+        matcher: str | prelude.Matcher = (
+            value if kind == prelude.MatcherKind.Equal else prelude.Matcher(value, kind)
+        )
+        existing = selectors.get(label)
+        if existing is None:
+            selectors[label] = matcher
+        elif isinstance(existing, tuple):
+            selectors[label] = (*existing, matcher)
+        else:
+            selectors[label] = (existing, matcher)
+    # labels are set directly, since one may be called name
+    vector = prelude.SelectedInstantVector(name=name)
+    vector._selectors = selectors
+    return vector
+
+
+def _rollup(reader: _Reader, stack: list[Any]) -> None:
+    flags = reader.byte()
+    window = reader.duration() if flags & _ROLLUP_WINDOW else None
+    step = reader.duration() if flags & _ROLLUP_STEP else None
+    offset = reader.duration() if flags & _ROLLUP_OFFSET else None
+    at = _as_instant(stack.pop()) if flags & _ROLLUP_AT else None
+    node = _as_instant(stack.pop())
+
+    if window is not None:
+        is_subquery = flags & (_ROLLUP_STEP | _ROLLUP_INHERIT_STEP)
+        if is_subquery or not isinstance(node, prelude.SelectedInstantVector):
+            # a window applied to anything but a series selector is a subquery
+            # with the default step
+            node = prelude.SubqueryRangeVector(_instant(node), window, step)
+        else:
+            node = prelude.SelectedRangeVector(node, window)
+    if offset is not None:
+        if isinstance(node, prelude.RangeVector):
+            node = prelude.OffsetRangeVector(node, offset)
+        else:
+            node = prelude.OffsetInstantVector(node, offset)
+    if at is not None:
+        if isinstance(node, prelude.RangeVector):
+            node = prelude.RangeVectorAt(node, at)
+        else:
+            node = prelude.InstantVectorAt(node, at)
+    stack.append(node)
+
+
+def _instant(node: prelude.Timeseries) -> prelude.InstantVector:
+    if not isinstance(node, prelude.InstantVector):
+        raise ValueError(f"{node.render()} isn't an instant vector")
+    return node
+
+
+def _func(reader: _Reader, stack: list[Any]) -> None:
+    is_rollup = reader.byte()
+    name = reader.string()
+    args = _pop(stack, reader.uint32())
+    # build the node heracles.ql.funcs would, which isn't always the kind of
+    # function MetricsQL parses it as (e.g. label_set is a transform to MetricsQL)
+    spec = registry.func_spec(name)
+    func_type: type[prelude.BuiltinFunc]
+    if spec is not None:
+        func_type = spec.node_type
+    elif is_rollup:
+        func_type = prelude.RollupFunc
+    else:
+        func_type = prelude.TransformFunc
+    stack.append(func_type(name, *args))
+
+
+def _aggr(reader: _Reader, stack: list[Any]) -> None:
+    name = reader.string()
+    op, labels = reader.modifier()
+    args = _pop(stack, reader.uint32())
+    if op == "by" and labels:
+        stack.append(
+            prelude.FinalizedAggrFunc(name, args, by_labels=labels, without_labels=None)
+        )
+    elif op == "without":
+        if not labels:
+            raise ValueError(f"{name} without () isn't supported")
+        stack.append(
+            prelude.FinalizedAggrFunc(name, args, by_labels=None, without_labels=labels)
+        )
+    else:
+        # by () groups everything together, like no modifier at all
+        stack.append(prelude.AggrFunc(name, *args))
+
+
+def _binary_op(reader: _Reader, stack: list[Any]) -> None:
+    op = reader.string()
+    group_op, group_labels = reader.modifier()
+    join_op, join_labels = reader.modifier()
+    left, right = (_as_instant(v) for v in _pop(stack, 2))
+    kind = _BINOP_KINDS.get(op)
+    if kind is None:
+        raise ValueError(f"the {op} operator isn't supported")
+    node = prelude.BinaryOp(left, right, kind)
+    if group_op == "on":
+        node.on_labels = group_labels
+    elif group_op == "ignoring":
+        node.ignoring_labels = group_labels
+    if join_op in ("group_left", "group_right"):
+        node.group_by = (join_op, join_labels)
+    stack.append(node)
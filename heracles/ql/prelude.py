@@ -6,8 +6,62 @@ import enum
 import inspect
 import json
 import operator
-from collections.abc import Callable, Generator, Iterable
-from typing import TYPE_CHECKING, Any, Generic, Self, TypeVar
+import struct
+from collections.abc import Callable, Iterable
+from typing import TYPE_CHECKING, Any, ClassVar, Generic, Protocol, Self, TypeVar
+
+__all__ = [
+    "EQ",
+    "NE",
+    "NR",
+    "RE",
+    "AcceptsVisitor",
+    "AggrFunc",
+    "Annotation",
+    "AppliableAnnotation",
+    "AtOp",
+    "BaseAggrFunc",
+    "BinaryOp",
+    "BinopKind",
+    "BuiltinFunc",
+    "Constant",
+    "ConstantOrVector",
+    "Duration",
+    "DurationUnit",
+    "FinalizedAggrFunc",
+    "InstantOrRangeVector",
+    "InstantUnaryOp",
+    "InstantVector",
+    "InstantVectorAt",
+    "LabelManipulationFunc",
+    "Matcher",
+    "MatcherExpr",
+    "MatcherKind",
+    "OffsetInstantVector",
+    "OffsetOp",
+    "OffsetRangeVector",
+    "RangeVector",
+    "RangeVectorAt",
+    "RenderBuffer",
+    "RenderWriter",
+    "Renderable",
+    "RollupFunc",
+    "ScalarLiteral",
+    "SelectedInstantVector",
+    "SelectedRangeVector",
+    "StructuralKey",
+    "Subquery",
+    "SubqueryRangeVector",
+    "SubquerySliceExpr",
+    "Timeseries",
+    "TimeseriesVisitor",
+    "TransformFunc",
+    "UnaryOp",
+    "UnopKind",
+    "VisitorAction",
+    "VisitorFunc",
+    "VisitorHandler",
+]
 
 
 class UnopKind(str, enum.Enum):
@@ -112,8 +166,91 @@ class TimeseriesVisitor(abc.ABC):
         return self.visit_node(v)
 
 
+# _VISIT_FALLBACKS mirrors the default visit_* implementations of
+# TimeseriesVisitor: each method's default delegates to the method it maps to.
+# It's used to resolve which method actually handles a node without walking the
+# chain of default methods for every node.
+_VISIT_FALLBACKS = {
+    "visit_scalar_literal": "visit_instant_vector",
+    "visit_instant_vector": "visit_node",
+    "visit_range_vector": "visit_node",
+    "visit_selected_instant_vector": "visit_instant_vector",
+    "visit_selected_range_vector": "visit_range_vector",
+    "visit_subquery_range_vector": "visit_range_vector",
+    "visit_binary_op": "visit_instant_vector",
+    "visit_unary_op": "visit_instant_vector",
+    "visit_builtin_function": "visit_instant_vector",
+    "visit_aggr_function": "visit_builtin_function",
+    "visit_at_op": "visit_node",
+    "visit_offset_op": "visit_node",
+}
+
+# maps (visitor class, node class) to the name of the method which handles that
+# node, or None if the visitor ignores it
+_DISPATCH_CACHE: dict[tuple[type, type], str | None] = {}
+
+
+def _resolve_visit_method(visitor_cls: type, node_cls: type) -> str | None:
+    key = (visitor_cls, node_cls)
+    try:
+        return _DISPATCH_CACHE[key]
+    except KeyError:
+        pass
+    # values which aren't nodes (float, str, etc) are visited with visit_node
+    name: str | None = getattr(node_cls, "_visit_method", "visit_node")
+    while name is not None:
+        if getattr(visitor_cls, name) is not getattr(TimeseriesVisitor, name):
+            break
+        name = _VISIT_FALLBACKS.get(name)
+    _DISPATCH_CACHE[key] = name
+    return name
+
+
 _T = TypeVar("_T", bound="AcceptsVisitor")
 VisitorFunc = Callable[[_T], VisitorAction | None]
+VisitorHandler = Callable[[Any], VisitorAction | None]
+
+
+def _dispatch(visitor: TimeseriesVisitor, node_cls: type) -> VisitorHandler | None:
+    """
+    Returns the callable which handles nodes of type node_cls for this visitor, or
+    None if the visitor ignores them.
+    """
+    if isinstance(visitor, _VisitorFuncWrapper):
+        if visitor.accepted_type is None or issubclass(node_cls, visitor.accepted_type):
+            return visitor.func
+        return None
+    name = _resolve_visit_method(type(visitor), node_cls)
+    if name is None:
+        return None
+    return getattr(visitor, name)  # type: ignore[no-any-return]
+
+
+# maps (code, annotations) of visitor functions to the type they accept. Visitor
+# functions are usually closures which are re-created for every traversal, so
+# their signatures are cached by code rather than by function.
+_ACCEPTED_TYPE_CACHE: dict[tuple[Any, ...], type | None] = {}
+
+
+def _accepted_type(func: VisitorFunc) -> type | None:
+    try:
+        key: tuple[Any, ...] | None = (
+            func.__code__,  # type: ignore[attr-defined]
+            tuple(func.__annotations__.items()),
+        )
+        if key in _ACCEPTED_TYPE_CACHE:
+            return _ACCEPTED_TYPE_CACHE[key]
+    except (AttributeError, TypeError):
+        key = None
+
+    sig = inspect.signature(func, eval_str=True)
+    (param,) = sig.parameters.values()
+    # an unannotated parameter leaves Parameter.empty here, which no node is an
+    # instance of, so such functions are never called
+    accepted: type | None = param.annotation
+    if key is not None:
+        _ACCEPTED_TYPE_CACHE[key] = accepted
+    return accepted
 
 
 class _VisitorFuncWrapper(TimeseriesVisitor):
@@ -126,10 +263,7 @@ class _VisitorFuncWrapper(TimeseriesVisitor):
     def __init__(self, func: VisitorFunc) -> None:
         super().__init__()
         self.func = func
-
-        sig = inspect.signature(func, eval_str=True)
-        (param,) = sig.parameters.values()
-        self.accepted_type: type | None = param.annotation
+        self.accepted_type = _accepted_type(func)
 
     def visit_node(self, v: Any) -> VisitorAction | None:
         if not self.accepted_type or isinstance(v, self.accepted_type):
@@ -143,41 +277,114 @@ def _wrap_visitor(v: TimeseriesVisitor | VisitorFunc) -> TimeseriesVisitor:
     return v
 
 
+_EXHAUSTED = object()
+
+
 class AcceptsVisitor(abc.ABC):
+    __slots__ = ()
+
+    # _visit_method is the name of the TimeseriesVisitor method for this node type
+    _visit_method: ClassVar[str] = "visit_node"
+
     def accept_visitor(
         self, visitor: TimeseriesVisitor | VisitorFunc
     ) -> VisitorAction | None:
+        """
+        Traverses the tree rooted at this node depth first, calling the visitor on
+        each node.
+
+        Traversal uses an explicit stack of child iterators rather than recursion,
+        so arbitrarily deep trees (for example, long chains of or_ built with
+        functools.reduce) can be visited without hitting the recursion limit.
+
+        The method which handles each node type is resolved once per traversal
+        rather than walking the chain of visit_* methods for every node. Nodes
+        which the visitor ignores, including nodes which don't match the parameter
+        annotation of a visitor function, are skipped without calling the visitor.
+        """
         visitor = _wrap_visitor(visitor)
-        if action := self._accept_self_visitor(visitor):
+        handlers: dict[type, VisitorHandler | None] = {}
+
+        def handle(node: Any) -> VisitorAction | None:
+            cls = type(node)
+            try:
+                handler = handlers[cls]
+            except KeyError:
+                handler = handlers[cls] = _dispatch(visitor, cls)
+            return handler(node) if handler is not None else None
+
+        if action := handle(self):
             return action
-        for child in self._children_to_visit():
-            if isinstance(child, AcceptsVisitor):
-                action = child.accept_visitor(visitor)
-            else:
-                # hack to avoid wrapping float, int, str, etc in AcceptsVisitor
-                action = visitor.visit_node(child)
+        stack = [iter(self._children_to_visit())]
+        while stack:
+            child = next(stack[-1], _EXHAUSTED)
+            if child is _EXHAUSTED:
+                stack.pop()
+                continue
+            action = handle(child)
             if action == VisitorAction.STOP:
                 # propogate STOP up the stack
                 return VisitorAction.STOP
             if action == VisitorAction.CONTINUE:
-                # do not propogate CONTINUE from child nodes
+                # skip this node's children, but do not propogate CONTINUE
                 continue
+            if isinstance(child, AcceptsVisitor):
+                stack.append(iter(child._children_to_visit()))
         return VisitorAction.RECURSE
 
-    @abc.abstractmethod
-    def _accept_self_visitor(
-        self, visitor: TimeseriesVisitor
-    ) -> VisitorAction | None: ...
+    def _accept_self_visitor(self, visitor: TimeseriesVisitor) -> VisitorAction | None:
+        """
+        Visits only this node, without its children.
+        """
+        handler = _dispatch(visitor, type(self))
+        return handler(self) if handler is not None else None
+
+    def _children_to_visit(self) -> Iterable[Any]:
+        return ()
+
+
+class RenderWriter(Protocol):
+    """
+    RenderWriter is anything rendered output can be streamed into, such as an
+    io.StringIO, an open file, or a RenderBuffer.
+    """
+
+    def write(self, s: str, /) -> Any: ...
+
+
+class RenderBuffer:
+    """
+    RenderBuffer is a list-of-parts RenderWriter. Parts are only joined once, when
+    getvalue() is called. When a tree is rendered into a RenderBuffer, the render
+    caches of the nodes along the way are populated as well.
+    """
+
+    __slots__ = ("parts",)
+
+    def __init__(self) -> None:
+        self.parts: list[str] = []
+
+    def write(self, s: str, /) -> None:
+        self.parts.append(s)
 
-    def _children_to_visit(self) -> Generator[Any]:
-        return
-        yield
+    def getvalue(self) -> str:
+        if len(self.parts) > 1:
+            self.parts[:] = ["".join(self.parts)]
+        return self.parts[0] if self.parts else ""
 
 
 class Renderable(abc.ABC):
+    __slots__ = ()
+
     @abc.abstractmethod
     def render(self) -> str: ...
 
+    def render_into(self, writer: RenderWriter) -> None:
+        """
+        Writes the rendered form of this object into writer.
+        """
+        writer.write(self.render())
+
 
 _TARGET = TypeVar("_TARGET", contravariant=True)
 
@@ -191,16 +398,185 @@ AppliableAnnotation = Callable[[_TARGET], Annotation[_TARGET]]
 
 
 class Timeseries(AcceptsVisitor, Renderable, abc.ABC):
+    """
+    Timeseries is the base class for all expression tree nodes.
+
+    Nodes are treated as immutable once they are part of a tree: methods which
+    "modify" a node (on, ignoring, group_left, selecting labels, etc.) return a
+    modified copy. This allows each node to cache its rendered form and structural
+    hash, so shared subtrees are only processed once no matter how many trees they
+    appear in.
+    """
+
+    # Nodes are slotted to keep them small: large projects build hundreds of
+    # thousands of them. Annotation storage is only allocated once a node is
+    # annotated, since almost no nodes are.
+    __slots__ = ("_annotations", "_rendered", "_structural_hash")
+
+    # _fields names the attributes which define a node's structure, in the order
+    # they're compared. Child nodes may appear directly or inside tuples and lists.
+    _fields: ClassVar[tuple[str, ...]] = ()
+
     def __init__(self) -> None:
         super().__init__()
-        self._annotations: list[AppliableAnnotation[Self]] = []
+        self._annotations: list[AppliableAnnotation[Self]] | None = None
+        self._rendered: str | None = None
+        self._structural_hash: int | None = None
+
+    def render(self) -> str:
+        if self._rendered is None:
+            buffer = RenderBuffer()
+            self.render_into(buffer)
+            self._rendered = buffer.getvalue()
+        return self._rendered
+
+    def render_into(self, writer: RenderWriter) -> None:
+        """
+        Writes the rendered form of this tree into writer without building the
+        intermediate strings for each subtree.
+
+        Subtrees with a populated render cache are written from the cache. Rendering
+        into a RenderBuffer also populates the caches of small subtrees along the
+        way. Other writers receive the output as a stream of small pieces and no
+        caches are populated.
+        """
+        if self._rendered is not None:
+            writer.write(self._rendered)
+        elif isinstance(writer, RenderBuffer):
+            _render_tree(self, writer.parts)
+        else:
+            _stream_tree(self, writer)
+
+    @abc.abstractmethod
+    def _render_parts(self) -> Iterable[str | Timeseries]:
+        """
+        Returns the pieces which make up this node's rendered form, in order.
+        Strings are emitted as-is and child nodes are rendered in their place.
+        Returning children instead of rendering them directly lets rendering use an
+        explicit stack instead of recursion.
+
+        Node types in this module compute their parts with a static _parts_of,
+        which takes the values of _fields in order, so that ExprIR can render
+        them from their encoded fields without building nodes.
+        """
+
+    def _invalidate_caches(self) -> None:
+        self._rendered = None
+        self._structural_hash = None
+
+    def _copy(self) -> Self:
+        """
+        Returns a shallow copy of this node with empty caches. Use this instead of
+        copy.copy when the copy is about to be modified.
+        """
+        copied = copy.copy(self)
+        copied._invalidate_caches()
+        return copied
+
+    def _map_children(self, fn: Callable[[Timeseries], Timeseries]) -> Self:
+        """
+        Returns a copy of this node with each direct child replaced by fn(child).
+        If fn returns every child unchanged, this node is returned as-is.
+        """
+        changes = {}
+        for field in self._fields:
+            value = getattr(self, field)
+            mapped = _map_field(value, fn)
+            if mapped is not value:
+                changes[field] = mapped
+        if not changes:
+            return self
+        copied = self._copy()
+        for field, value in changes.items():
+            setattr(copied, field, value)
+        return copied
+
+    def _structure(self) -> tuple[tuple[Any, ...], list[Timeseries]]:
+        """
+        Returns a hashable description of this node with every child node replaced
+        by a placeholder, along with the children in the order they were replaced.
+        Two nodes are structurally equal when their descriptions are equal and
+        their children are pairwise structurally equal.
+        """
+        children: list[Timeseries] = []
+        fields = tuple(_freeze_field(getattr(self, f), children) for f in self._fields)
+        return (type(self), fields, tuple(self._annotations or ())), children
+
+    def structural_hash(self) -> int:
+        """
+        Returns a hash of this tree's structure. Structurally equal trees have the
+        same hash, regardless of whether they share any instances.
+
+        Annotations aren't hashed, only compared by structurally_equal, so that
+        annotating a node in place doesn't change the hashes its ancestors have
+        already cached.
+        """
+        if self._structural_hash is None:
+            _compute_structural_hashes(self)
+        return self._structural_hash  # type: ignore
+
+    def structurally_equal(self, other: Any) -> bool:
+        """
+        Returns True if other is a tree with the same structure as this one: the
+        same node types, with the same fields and annotations, all the way down.
+
+        This is separate from __eq__, which builds a BinaryOp for instant vectors.
+        """
+        stack: list[tuple[Timeseries, Any]] = [(self, other)]
+        while stack:
+            left, right = stack.pop()
+            if left is right:
+                continue
+            if not isinstance(right, Timeseries):
+                return False
+            if left.structural_hash() != right.structural_hash():
+                return False
+            left_desc, left_children = left._structure()
+            right_desc, right_children = right._structure()
+            if left_desc != right_desc or len(left_children) != len(right_children):
+                return False
+            stack.extend(zip(left_children, right_children))
+        return True
+
+    def structural_key(self) -> StructuralKey:
+        """
+        Returns a hashable wrapper around this tree which compares by structure.
+        Useful for detecting repeated subtrees with dicts and sets.
+        """
+        return StructuralKey(self)
+
+    def dumps(self, *, drop_unserializable_annotations: bool = False) -> bytes:
+        """
+        Serializes this tree, including its annotations, into a compact binary form.
+        See heracles.ql.serialization.dumps.
+        """
+        from heracles.ql import serialization
+
+        return serialization.dumps(
+            self, drop_unserializable_annotations=drop_unserializable_annotations
+        )
+
+    @staticmethod
+    def loads(data: bytes) -> Timeseries:
+        """
+        Loads a tree serialized with dumps.
+        """
+        from heracles.ql import serialization
+
+        return serialization.loads(data)
 
     def annotate(self, annotation: AppliableAnnotation[Self]) -> Self:
+        # neither the rendered form nor the structural hash include annotations, so
+        # no caches need to be dropped
+        if self._annotations is None:
+            self._annotations = []
         self._annotations.append(annotation)
         return self
 
     @property
     def annotations(self) -> list[Annotation[Self]]:
+        if not self._annotations:
+            return []
         return [a(self) for a in self._annotations]
 
     def is_annotated(self) -> bool:
@@ -208,10 +584,111 @@ class Timeseries(AcceptsVisitor, Renderable, abc.ABC):
 
     def without_annotations(self) -> Self:
         copied = copy.copy(self)
-        copied._annotations = []
+        copied._annotations = None
+        copied._structural_hash = None
         return copied
 
-    pass
+
+class StructuralKey:
+    """
+    StructuralKey wraps a tree so it can be used as a dict key or set member,
+    comparing by structure rather than by identity.
+    """
+
+    __slots__ = ("node",)
+
+    def __init__(self, node: Timeseries) -> None:
+        self.node = node
+
+    def __hash__(self) -> int:
+        return self.node.structural_hash()
+
+    def __eq__(self, o: Any) -> bool:
+        if not isinstance(o, StructuralKey):
+            return False
+        return self.node.structurally_equal(o.node)
+
+
+# placeholder for child nodes in Timeseries._structure
+_CHILD = object()
+
+
+def _freeze_field(value: Any, children: list[Timeseries]) -> Any:
+    if isinstance(value, Timeseries):
+        children.append(value)
+        return _CHILD
+    if isinstance(value, tuple | list):
+        return tuple(_freeze_field(v, children) for v in value)
+    if isinstance(value, dict):
+        return tuple((k, _freeze_field(v, children)) for k, v in value.items())
+    if isinstance(value, Duration):
+        # durations are immutable and hashable
+        return value
+    if isinstance(value, Matcher):
+        return (Matcher, value.value, value.kind)
+    if type(value) is float:
+        # floats compare by bits, so that 0.0 and -0.0 stay distinct and NaN is
+        # equal to itself
+        return (float, struct.pack("<d", value))
+    if isinstance(value, int):
+        # so that True, 1 and 1.0 stay distinct
+        return (type(value), value)
+    return value
+
+
+def _map_field(value: Any, fn: Callable[[Timeseries], Timeseries]) -> Any:
+    if isinstance(value, Timeseries):
+        return fn(value)
+    if isinstance(value, tuple | list):
+        mapped = [_map_field(v, fn) for v in value]
+        if all(m is v for m, v in zip(mapped, value)):
+            return value
+        return type(value)(mapped)
+    return value
+
+
+def _rewrite(root: Timeseries, fn: Callable[[Timeseries], Timeseries]) -> Timeseries:
+    """
+    Rewrites the tree bottom-up: each node has its children rewritten, then is
+    replaced by fn(node). Nodes shared within the tree are rewritten once, and
+    unchanged subtrees are returned as-is.
+    """
+    done: dict[int, Timeseries] = {}
+    # each entry is a node and whether its children have already been pushed
+    stack: list[tuple[Timeseries, bool]] = [(root, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if id(node) in done:
+            continue
+        if expanded:
+            done[id(node)] = fn(node._map_children(lambda c: done.get(id(c), c)))
+            continue
+        stack.append((node, True))
+        stack.extend(
+            (c, False) for c in node._children_to_visit() if isinstance(c, Timeseries)
+        )
+    return done[id(root)]
+
+
+def _compute_structural_hashes(root: Timeseries) -> None:
+    # children are hashed before their parents, using an explicit stack so that
+    # deep trees don't hit the recursion limit
+    stack = [root]
+    while stack:
+        node = stack[-1]
+        if node._structural_hash is not None:
+            stack.pop()
+            continue
+        desc, children = node._structure()
+        pending = [c for c in children if c._structural_hash is None]
+        if pending:
+            stack.extend(pending)
+            continue
+        stack.pop()
+        child_hashes = tuple(c._structural_hash for c in children)
+        # the annotations at the end of the description aren't hashed
+        type_and_fields = desc[:2]
+        node._structural_hash = hash((type_and_fields, child_hashes))
 
 
 if TYPE_CHECKING:
@@ -221,6 +698,8 @@ else:
 
 
 class Subquery:
+    __slots__ = ("lookback", "step")
+
     def __init__(self, lookback: Duration, step: Duration | None) -> None:
         self.lookback = lookback
         self.step = step
@@ -233,6 +712,8 @@ class Subquery:
 
 
 class InstantVector(Timeseries, abc.ABC):
+    __slots__ = ()
+
     def __add__(self, o: InstantVector | float | int) -> BinaryOp:
         return _instant_vector_binop(self, o, BinopKind.add)
 
@@ -333,6 +814,11 @@ def _instant_vector_binop(
 
 
 class SelectedInstantVector(InstantVector):
+    __slots__ = ("_selectors", "name")
+    _visit_method = "visit_selected_instant_vector"
+
+    _fields = ("name", "_selectors")
+
     def __init__(
         self,
         /,
@@ -358,12 +844,20 @@ class SelectedInstantVector(InstantVector):
         res_vec = SelectedInstantVector(name=self.name, **self._selectors)
         # SelectedInstantVector is special - selecting causes this node to be
         # replaced with the selector, so the annotations should propogate
-        res_vec._annotations = self._annotations  # type: ignore
+        if self._annotations:
+            # copied, so that annotating the new selector doesn't annotate this one
+            res_vec._annotations = list(self._annotations)  # type: ignore
         for name, value in kwargs.items():
             res_vec._selectors[name] = value
         return res_vec
 
-    def render(self) -> str:
+    def _render_parts(self) -> Iterable[str | Timeseries]:
+        return self._parts_of(self.name, self._selectors)
+
+    @staticmethod
+    def _parts_of(
+        name: str | None, _selectors: dict[str, MatcherExpr]
+    ) -> Iterable[str | Timeseries]:
         selectors = []
 
         def render_matcher(k: str, v: str | Matcher) -> str:
@@ -373,7 +867,7 @@ class SelectedInstantVector(InstantVector):
                 v = v.value
             return f"{k}{op}{json.dumps(v)}"
 
-        for k, v in self._selectors.items():
+        for k, v in _selectors.items():
             if isinstance(v, tuple):
                 for inner_v in v:
                     selectors.append(render_matcher(k, inner_v))
@@ -381,16 +875,15 @@ class SelectedInstantVector(InstantVector):
                 selectors.append(render_matcher(k, v))
 
         matchers = f"{{{','.join(selectors)}}}"
-        if self.name:
-            return self.name + matchers
+        if name:
+            return (name, matchers)
         else:
-            return matchers
-
-    def _accept_self_visitor(self, visitor: TimeseriesVisitor) -> VisitorAction | None:
-        return visitor.visit_selected_instant_vector(self)
+            return (matchers,)
 
 
 class RangeVector(Timeseries, abc.ABC):
+    __slots__ = ()
+
     def __matmul__(self, o: InstantVector | float | int) -> RangeVectorAt:
         if isinstance(o, _scalar_promotion_types):
             o = _promote_scaler(o)
@@ -401,22 +894,35 @@ class RangeVector(Timeseries, abc.ABC):
 
 
 class SelectedRangeVector(RangeVector):
+    __slots__ = ("instant_vector", "lookback")
+    _visit_method = "visit_selected_range_vector"
+
+    _fields = ("instant_vector", "lookback")
+
     def __init__(self, instant: InstantVector, lookback: Duration) -> None:
         super().__init__()
         self.instant_vector = instant
         self.lookback = lookback
 
-    def render(self) -> str:
-        return f"{self.instant_vector.render()}[{self.lookback.render()}]"
+    def _render_parts(self) -> Iterable[str | Timeseries]:
+        return self._parts_of(self.instant_vector, self.lookback)
 
-    def _accept_self_visitor(self, visitor: TimeseriesVisitor) -> VisitorAction | None:
-        return visitor.visit_selected_range_vector(self)
+    @staticmethod
+    def _parts_of(
+        instant_vector: InstantVector, lookback: Duration
+    ) -> Iterable[str | Timeseries]:
+        return (instant_vector, f"[{lookback.render()}]")
 
-    def _children_to_visit(self) -> Generator[Any]:
-        yield self.instant_vector
+    def _children_to_visit(self) -> Iterable[Any]:
+        return (self.instant_vector,)
 
 
 class SubqueryRangeVector(RangeVector):
+    __slots__ = ("lookback", "resolution", "subquery_expr")
+    _visit_method = "visit_subquery_range_vector"
+
+    _fields = ("subquery_expr", "lookback", "resolution")
+
     def __init__(
         self,
         subquery_expr: InstantVector,
@@ -428,33 +934,58 @@ class SubqueryRangeVector(RangeVector):
         self.lookback = lookback
         self.resolution = resolution
 
-    def render(self) -> str:
-        resolution_str = self.resolution.render() if self.resolution else ""
-        return (
-            f"({self.subquery_expr.render()})"
-            f"[{self.lookback.render()}:{resolution_str}]"
-        )
+    def _render_parts(self) -> Iterable[str | Timeseries]:
+        return self._parts_of(self.subquery_expr, self.lookback, self.resolution)
 
-    def _accept_self_visitor(self, visitor: TimeseriesVisitor) -> VisitorAction | None:
-        return visitor.visit_subquery_range_vector(self)
+    @staticmethod
+    def _parts_of(
+        subquery_expr: InstantVector, lookback: Duration, resolution: Duration | None
+    ) -> Iterable[str | Timeseries]:
+        resolution_str = resolution.render() if resolution else ""
+        return ("(", subquery_expr, f")[{lookback.render()}:{resolution_str}]")
 
-    def _children_to_visit(self) -> Generator[Any]:
-        yield self.subquery_expr
+    def _children_to_visit(self) -> Iterable[Any]:
+        return (self.subquery_expr,)
 
 
 class ScalarLiteral(InstantVector):
+    __slots__ = ("v",)
+    _visit_method = "visit_scalar_literal"
+
+    _fields = ("v",)
+
     def __init__(self, v: float | int) -> None:
         super().__init__()
         self.v = float(v)
 
-    def render(self) -> str:
-        return str(self.v)
+    def _render_parts(self) -> Iterable[str | Timeseries]:
+        return (str(self.v),)
 
-    def _accept_self_visitor(self, visitor: TimeseriesVisitor) -> VisitorAction | None:
-        return visitor.visit_scalar_literal(self)
+    @staticmethod
+    def _parts_of(v: float) -> Iterable[str | Timeseries]:
+        return (str(v),)
 
 
 class BinaryOp(InstantVector):
+    __slots__ = (
+        "group_by",
+        "ignoring_labels",
+        "left",
+        "on_labels",
+        "op",
+        "right",
+    )
+    _visit_method = "visit_binary_op"
+
+    _fields = (
+        "left",
+        "right",
+        "op",
+        "on_labels",
+        "ignoring_labels",
+        "group_by",
+    )
+
     def __init__(self, left: Any, right: Any, op: str) -> None:
         super().__init__()
         self.left = left
@@ -465,155 +996,200 @@ class BinaryOp(InstantVector):
         self.group_by: tuple[str, Iterable[str]] | None = None
 
     def on(self, *labels: str) -> Self:
-        copied = copy.copy(self)
-        copied.on_labels.extend(labels)
+        copied = self._copy()
+        # the label lists must not be shared with the original node
+        copied.on_labels = [*self.on_labels, *labels]
         return copied
 
     def ignoring(self, *labels: str) -> Self:
-        copied = copy.copy(self)
-        copied.ignoring_labels.extend(labels)
+        copied = self._copy()
+        copied.ignoring_labels = [*self.ignoring_labels, *labels]
         return copied
 
     def group_left(self, *labels: str) -> Self:
-        copied = copy.copy(self)
+        copied = self._copy()
         copied.group_by = ("group_left", labels)
         return copied
 
     def group_right(self, *labels: str) -> Self:
-        copied = copy.copy(self)
+        copied = self._copy()
         copied.group_by = ("group_right", labels)
         return copied
 
-    def render(self) -> str:
-        exprs = [self.left.render(), self.op]
-        if self.on_labels:
-            on_expr = f"on ({','.join(self.on_labels)})"
-            exprs.append(on_expr)
-        elif self.ignoring_labels:
-            ignoring_expr = f"ignoring ({','.join(self.ignoring_labels)})"
-            exprs.append(ignoring_expr)
-
-        if self.group_by:
-            group_by_expr = f"{self.group_by[0]}({','.join(self.group_by[1])})"
-            exprs.append(group_by_expr)
-
-        exprs.append(self.right.render())
+    def _render_parts(self) -> Iterable[str | Timeseries]:
+        return self._parts_of(
+            self.left,
+            self.right,
+            self.op,
+            self.on_labels,
+            self.ignoring_labels,
+            self.group_by,
+        )
 
-        return "(" + " ".join(exprs) + ")"
+    @staticmethod
+    def _parts_of(
+        left: Any,
+        right: Any,
+        op: str,
+        on_labels: list[str],
+        ignoring_labels: list[str],
+        group_by: tuple[str, Iterable[str]] | None,
+    ) -> Iterable[str | Timeseries]:
+        parts: list[str | Timeseries] = ["(", left, " ", op, " "]
+        if on_labels:
+            parts.append(f"on ({','.join(on_labels)}) ")
+        elif ignoring_labels:
+            parts.append(f"ignoring ({','.join(ignoring_labels)}) ")
+
+        if group_by:
+            parts.append(f"{group_by[0]}({','.join(group_by[1])}) ")
+
+        parts.append(right)
+        parts.append(")")
+        return parts
+
+    def _children_to_visit(self) -> Iterable[Any]:
+        return (self.left, self.right)
 
-    def _accept_self_visitor(self, visitor: TimeseriesVisitor) -> VisitorAction | None:
-        return visitor.visit_binary_op(self)
 
-    def _children_to_visit(self) -> Generator[Any]:
-        yield self.left
-        yield self.right
+class UnaryOp(InstantVector):
+    __slots__ = ("arg", "op")
+    _visit_method = "visit_unary_op"
 
+    _fields = ("arg", "op")
 
-class UnaryOp(InstantVector):
     def __init__(self, arg: Any, op: UnopKind) -> None:
         super().__init__()
         self.arg = arg
         self.op = op
 
-    def render(self) -> str:
-        return f"{self.op}{self.arg.render()}"
+    def _render_parts(self) -> Iterable[str | Timeseries]:
+        return (self.op, self.arg)
 
-    def _accept_self_visitor(self, visitor: TimeseriesVisitor) -> VisitorAction | None:
-        return visitor.visit_unary_op(self)
+    @staticmethod
+    def _parts_of(arg: Any, op: UnopKind) -> Iterable[str | Timeseries]:
+        return (op, arg)
 
-    def _children_to_visit(self) -> Generator[Any]:
-        yield self.arg
+    def _children_to_visit(self) -> Iterable[Any]:
+        return (self.arg,)
 
 
 class InstantUnaryOp(UnaryOp, InstantVector):
-    pass
+    __slots__ = ()
 
 
 class AtOp(Timeseries, abc.ABC):
+    __slots__ = ("timestamp", "vector")
+    _visit_method = "visit_at_op"
+
+    _fields = ("vector", "timestamp")
+
     def __init__(self, vector: Timeseries, timestamp: Any) -> None:
         super().__init__()
         self.vector = vector
         self.timestamp = timestamp
 
-    def render(self) -> str:
-        return f"({self.vector.render()} @ {_render_any(self.timestamp)})"
+    def _render_parts(self) -> Iterable[str | Timeseries]:
+        return self._parts_of(self.vector, self.timestamp)
 
-    def _accept_self_visitor(self, visitor: TimeseriesVisitor) -> VisitorAction | None:
-        return visitor.visit_at_op(self)
+    @staticmethod
+    def _parts_of(vector: Timeseries, timestamp: Any) -> Iterable[str | Timeseries]:
+        return ("(", vector, " @ ", _render_part(timestamp), ")")
 
-    def _children_to_visit(self) -> Generator[Any]:
-        yield self.vector
-        yield self.timestamp
+    def _children_to_visit(self) -> Iterable[Any]:
+        return (self.vector, self.timestamp)
 
 
 class InstantVectorAt(AtOp, InstantVector):
-    pass
+    __slots__ = ()
 
 
 class RangeVectorAt(AtOp, RangeVector):
-    pass
+    __slots__ = ()
 
 
 class OffsetOp(Timeseries, abc.ABC):
+    __slots__ = ("offset_duration", "vector")
+    _visit_method = "visit_offset_op"
+
+    _fields = ("vector", "offset_duration")
+
     def __init__(self, vector: Timeseries, offset: Duration) -> None:
         super().__init__()
         self.vector = vector
         self.offset_duration = offset
 
-    def render(self) -> str:
-        return f"({self.vector.render()} offset {self.offset_duration.render()})"
+    def _render_parts(self) -> Iterable[str | Timeseries]:
+        return self._parts_of(self.vector, self.offset_duration)
 
-    def _accept_self_visitor(self, visitor: TimeseriesVisitor) -> VisitorAction | None:
-        return visitor.visit_offset_op(self)
+    @staticmethod
+    def _parts_of(
+        vector: Timeseries, offset_duration: Duration
+    ) -> Iterable[str | Timeseries]:
+        return ("(", vector, f" offset {offset_duration.render()})")
 
-    def _children_to_visit(self) -> Generator[Any]:
-        yield self.vector
+    def _children_to_visit(self) -> Iterable[Any]:
+        return (self.vector,)
 
 
 class OffsetInstantVector(OffsetOp, InstantVector):
-    pass
+    __slots__ = ()
 
 
 class OffsetRangeVector(OffsetOp, RangeVector):
-    pass
+    __slots__ = ()
 
 
 class BuiltinFunc(InstantVector, abc.ABC):
+    __slots__ = ("args", "name")
+    _visit_method = "visit_builtin_function"
+
+    _fields: ClassVar[tuple[str, ...]] = ("name", "args")
+
     def __init__(self, name: str, *args: Any) -> None:
         super().__init__()
         self.name = name
         self.args = args
 
-    def render(self) -> str:
-        rendered_args = []
-        for a in self.args:
-            rendered_args.append(_render_any(a))
-        return f"{self.name}({', '.join(rendered_args)})"
+    def _render_parts(self) -> Iterable[str | Timeseries]:
+        return self._parts_of(self.name, self.args)
 
-    def _accept_self_visitor(self, visitor: TimeseriesVisitor) -> VisitorAction | None:
-        return visitor.visit_builtin_function(self)
+    @staticmethod
+    def _parts_of(name: str, args: tuple[Any, ...]) -> list[str | Timeseries]:
+        parts: list[str | Timeseries] = [name, "("]
+        for i, a in enumerate(args):
+            if i:
+                parts.append(", ")
+            parts.append(_render_part(a))
+        parts.append(")")
+        return parts
 
-    def _children_to_visit(self) -> Generator[Any]:
-        yield from self.args
+    def _children_to_visit(self) -> Iterable[Any]:
+        return self.args
 
 
 class RollupFunc(BuiltinFunc):
-    pass
+    __slots__ = ()
 
 
 class TransformFunc(BuiltinFunc):
-    pass
+    __slots__ = ()
 
 
 class LabelManipulationFunc(BuiltinFunc):
-    pass
+    __slots__ = ()
 
 
 class BaseAggrFunc(BuiltinFunc):
-    pass
+    __slots__ = ()
 
 
 class AggrFunc(BaseAggrFunc):
+    __slots__ = ("_by_labels", "_without_labels")
+    _visit_method = "visit_aggr_function"
+
+    _fields = ("name", "args", "_by_labels", "_without_labels")
+
     def __init__(self, name: str, *args: Any) -> None:
         super().__init__(name, *args)
         self._by_labels: Iterable[str] = []
@@ -632,20 +1208,29 @@ class AggrFunc(BaseAggrFunc):
             without_labels=labels,
         )
 
-    def render(self) -> str:
-        rendered_args = []
-        for a in self.args:
-            rendered_args.append(_render_any(a))
-        res = f"{self.name}({', '.join(rendered_args)})"
-        if self._by_labels:
-            res += f" by ({','.join(self._by_labels)})"
-        return res
+    def _render_parts(self) -> Iterable[str | Timeseries]:
+        return self._parts_of(
+            self.name, self.args, self._by_labels, self._without_labels
+        )
 
-    def _accept_self_visitor(self, visitor: TimeseriesVisitor) -> VisitorAction | None:
-        return visitor.visit_aggr_function(self)
+    @staticmethod
+    def _parts_of(  # type: ignore[override]
+        name: str,
+        args: tuple[Any, ...],
+        _by_labels: Iterable[str],
+        _without_labels: Iterable[str],
+    ) -> list[str | Timeseries]:
+        parts = BuiltinFunc._parts_of(name, args)
+        if _by_labels:
+            parts.append(f" by ({','.join(_by_labels)})")
+        return parts
 
 
 class FinalizedAggrFunc(BaseAggrFunc):
+    __slots__ = ("_by_labels", "_without_labels")
+
+    _fields = ("name", "args", "_by_labels", "_without_labels")
+
     def __init__(
         self,
         name: str,
@@ -657,13 +1242,26 @@ class FinalizedAggrFunc(BaseAggrFunc):
         self._by_labels = by_labels
         self._without_labels = without_labels
 
-    def render(self) -> str:
-        main_call = super().render()
-        if self._by_labels:
-            return main_call + f" by ({','.join(self._by_labels)})"
-        if self._without_labels:
-            return main_call + f" without ({','.join(self._without_labels)})"
-        raise Exception("poorly constructed aggr func")
+    def _render_parts(self) -> Iterable[str | Timeseries]:
+        return self._parts_of(
+            self.name, self.args, self._by_labels, self._without_labels
+        )
+
+    @staticmethod
+    def _parts_of(  # type: ignore[override]
+        name: str,
+        args: tuple[Any, ...],
+        _by_labels: Iterable[str] | None,
+        _without_labels: Iterable[str] | None,
+    ) -> list[str | Timeseries]:
+        parts = BuiltinFunc._parts_of(name, args)
+        if _by_labels:
+            parts.append(f" by ({','.join(_by_labels)})")
+        elif _without_labels:
+            parts.append(f" without ({','.join(_without_labels)})")
+        else:
+            raise Exception("poorly constructed aggr func")
+        return parts
 
 
 def _render_any(a: Any) -> str:
@@ -674,6 +1272,77 @@ def _render_any(a: Any) -> str:
     return str(a)
 
 
+def _render_part(a: Any) -> str | Timeseries:
+    # nodes are left for the render engine to expand, everything else is rendered
+    # immediately
+    if isinstance(a, Timeseries):
+        return a
+    return _render_any(a)
+
+
+# Nodes whose rendered form is longer than this are not cached when they are
+# rendered as part of a larger tree. Caching a node means copying its output into a
+# single string, and doing that at every level of a deep tree copies the output
+# once per level. Smaller subtrees, which are the ones that get shared between
+# rules, are still cached.
+_RENDER_CACHE_MAX_LEN = 8192
+
+
+def _render_tree(root: Timeseries, out: list[str]) -> None:
+    """
+    Renders the tree rooted at root onto the end of out using an explicit stack.
+
+    Nodes with a populated render cache are not expanded again, and small nodes
+    rendered along the way have their cache populated. Each stack frame holds the
+    node, an iterator over its remaining parts, and the position in the output at
+    which the node's own output starts.
+    """
+    out_len = 0
+    stack = [(root, iter(root._render_parts()), len(out), 0)]
+    while stack:
+        node, parts, start, start_len = stack[-1]
+        for part in parts:
+            if isinstance(part, str):
+                out.append(part)
+                out_len += len(part)
+            elif part._rendered is not None:
+                out.append(part._rendered)
+                out_len += len(part._rendered)
+            else:
+                stack.append((part, iter(part._render_parts()), len(out), out_len))
+                break
+        else:
+            stack.pop()
+            if stack and out_len - start_len > _RENDER_CACHE_MAX_LEN:
+                continue
+            # collapse the node's output into a single string so that the parent
+            # does not copy it piece by piece
+            rendered = "".join(out[start:])
+            del out[start:]
+            out.append(rendered)
+            node._rendered = rendered
+
+
+def _stream_tree(root: Timeseries, writer: RenderWriter) -> None:
+    """
+    Writes the tree rooted at root into writer piece by piece, using an explicit
+    stack. Caches are read but not populated.
+    """
+    write = writer.write
+    stack = [iter(root._render_parts())]
+    while stack:
+        for part in stack[-1]:
+            if isinstance(part, str):
+                write(part)
+            elif part._rendered is not None:
+                write(part._rendered)
+            else:
+                stack.append(iter(part._render_parts()))
+                break
+        else:
+            stack.pop()
+
+
 class DurationUnit(tuple[float, str], enum.Enum):
     millisecond = (1, "ms")
     second = (millisecond[0] * 1000, "s")
@@ -690,10 +1359,70 @@ class DurationUnit(tuple[float, str], enum.Enum):
         return self[0]
 
 
+# (factor, name) for every unit except milliseconds, largest first. Milliseconds are
+# rendered from whatever remains after the larger units.
+_DURATION_RENDER_UNITS: tuple[tuple[int, str], ...] = tuple(
+    (int(u.unit_factor()), u.unit_name())
+    for u in sorted(DurationUnit, key=lambda u: u.unit_factor(), reverse=True)
+    if u != DurationUnit.millisecond
+)
+
+
+def _normalize_interval(v: float) -> int | float:
+    # intervals are multiples of the step and may be fractional, but whole numbers
+    # are kept as ints so that they render as 2i rather than 2.0i
+    return int(v) if float(v).is_integer() else v
+
+
 class Duration(Renderable):
+    """
+    Duration is an immutable length of time: a whole number of milliseconds plus a
+    number of evaluation intervals (the i suffix). Durations are hashable and cache
+    their rendered form, since they're rendered for every range selector, subquery,
+    offset and rule interval.
+
+    Arithmetic which produces fractional milliseconds is rounded to the nearest
+    millisecond.
+    """
+
+    __slots__ = ("_intervals", "_milliseconds", "_rendered")
+
+    _milliseconds: int
+    _intervals: int | float
+    _rendered: str | None
+
     def __init__(self, time_value: float, interval_value: float) -> None:
-        self.time_value = time_value
-        self.interval_value = interval_value
+        set_attr = object.__setattr__
+        if type(time_value) is not int:
+            time_value = round(time_value)
+        if type(interval_value) is not int:
+            interval_value = _normalize_interval(interval_value)
+        set_attr(self, "_milliseconds", time_value)
+        set_attr(self, "_intervals", interval_value)
+        set_attr(self, "_rendered", None)
+
+    @property
+    def time_value(self) -> int:
+        """
+        The time part of this duration, in milliseconds.
+        """
+        return self._milliseconds
+
+    @property
+    def interval_value(self) -> int | float:
+        """
+        The number of evaluation intervals in this duration.
+        """
+        return self._intervals
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("Duration is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("Duration is immutable")
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (Duration, (self._milliseconds, self._intervals))
 
     @staticmethod
     def from_units(value: float, unit: DurationUnit) -> Duration:
@@ -712,9 +1441,10 @@ class Duration(Renderable):
     def __eq__(self, o: Any) -> bool:
         if not isinstance(o, Duration):
             return False
-        return (
-            self.time_value == o.time_value and self.interval_value == o.interval_value
-        )
+        return self._milliseconds == o._milliseconds and self._intervals == o._intervals
+
+    def __hash__(self) -> int:
+        return hash((Duration, self._milliseconds, self._intervals))
 
     def _binop(self, o: Duration, op: Callable[[float, float], float]) -> Duration:
         return Duration(
@@ -723,12 +1453,20 @@ class Duration(Renderable):
 
     # math with scalars
     def __mul__(self, o: float | int) -> Duration:
+        # scaling a unit (5 * ql.Minute) is by far the most common way durations
+        # are built, so it skips the generic path
+        if type(o) is int or type(o) is float:
+            return Duration(self._milliseconds * o, self._intervals * o)
         return Duration._scalar_binop(self, o, operator.mul)
 
     def __rmul__(self, o: float | int) -> Duration:
+        if type(o) is int or type(o) is float:
+            return Duration(o * self._milliseconds, o * self._intervals)
         return Duration._scalar_binop(o, self, operator.mul)
 
-    def __truediv__(self, o: Duration) -> Duration:
+    def __truediv__(self, o: Duration | float | int) -> Duration:
+        if not isinstance(o, Duration):
+            return Duration._scalar_binop(self, o, operator.truediv)
         return self._binop(o, operator.truediv)
 
     def __rtruediv__(self, o: Duration) -> Duration:
@@ -773,34 +1511,29 @@ class Duration(Renderable):
             raise NotImplementedError("don't call __index__ on Duration")
 
     def render(self) -> str:
-        if self.interval_value:
-            interval = f"{self.interval_value}i"
-        else:
-            interval = ""
-        if self.time_value:
-            remainder = self.time_value
-            parts = []
-
-            # this needs a type annotation because mypy can't seem
-            # to figure out that it's not a DurationUnit | str | float
-            sorted_duration_units: Iterable[DurationUnit] = sorted(
-                DurationUnit, key=lambda u: u.unit_factor(), reverse=True
-            )
-            for unit in sorted_duration_units:
-                res, new_remainder = divmod(remainder, unit.unit_factor())
-                if res > 0 and unit != DurationUnit.millisecond:
-                    parts.append(f"{res}{unit.unit_name()}")
-                elif unit == DurationUnit.millisecond and remainder != 0:
-                    parts.append(f"{remainder}ms")
-                remainder = new_remainder
-
-            time = "".join(parts)
-        else:
-            time = ""
-        if not time and not interval:
-            # this duration is 0. Return 0ms.
-            return "0ms"
-        return "".join((time, interval))
+        if self._rendered is None:
+            object.__setattr__(self, "_rendered", self._render())
+        return self._rendered  # type: ignore[return-value]
+
+    def _render(self) -> str:
+        interval = f"{self._intervals}i" if self._intervals else ""
+        remainder = self._milliseconds
+        if not remainder:
+            # a duration of 0 renders as 0ms
+            return interval or "0ms"
+
+        parts = []
+        if remainder < 0:
+            parts.append("-")
+            remainder = -remainder
+        for factor, name in _DURATION_RENDER_UNITS:
+            if remainder >= factor:
+                count, remainder = divmod(remainder, factor)
+                parts.append(f"{count}{name}")
+        if remainder:
+            parts.append(f"{remainder}ms")
+        parts.append(interval)
+        return "".join(parts)
 
     def __str__(self) -> str:
         return self.render()
@@ -835,6 +1568,8 @@ class MatcherKind(str, enum.Enum):
 
 
 class Matcher:
+    __slots__ = ("kind", "value")
+
     def __init__(self, value: str, kind: MatcherKind) -> None:
         self.value = value
         self.kind = kind
@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import enum
+import functools
+import inspect
+from collections.abc import Callable
+from typing import Any, NamedTuple
+
+from heracles.ql import prelude
+from heracles.ql._func_table import FUNC_TABLE
+
+__all__ = [
+    "CostClass",
+    "FuncParam",
+    "FuncSpec",
+    "ParamKind",
+    "func_names",
+    "func_spec",
+    "func_specs",
+]
+
+
+class ParamKind(enum.StrEnum):
+    range = "range"
+    instant_or_range = "instant_or_range"
+    scalar = "scalar"
+    string = "string"
+    optional_string = "optional_string"
+
+
+class CostClass(enum.StrEnum):
+    # a constant amount of work per sample
+    linear = "linear"
+    # sorts or buckets the samples of each series
+    sorting = "sorting"
+
+
+class FuncParam(NamedTuple):
+    name: str
+    kind: ParamKind
+    variadic: bool = False
+
+
+class FuncSpec(NamedTuple):
+    """
+    FuncSpec describes a MetricsQL function: the node type heracles.ql.funcs builds
+    for it, its arguments in the order they're rendered, and how expensive it is
+    to evaluate.
+    """
+
+    name: str
+    node_type: type[prelude.BuiltinFunc]
+    params: tuple[FuncParam, ...]
+    cost_class: CostClass
+
+    def build(self, *args: Any) -> prelude.BuiltinFunc:
+        """
+        Builds a call to the function with already ordered arguments. Every
+        generated function in heracles.ql.funcs is built through here.
+        """
+        return self.node_type(self.name, *args)
+
+
+# functions whose signatures the code generator can't parse, which are built by
+# heracles/ql/funcs/handwritten.py. Rows are laid out like FUNC_TABLE.
+_HANDWRITTEN_TABLE: tuple[tuple[Any, ...], ...] = (
+    (
+        "aggr_over_time",
+        "AggrFunc",
+        "linear",
+        (("rollups", "string", True), ("vector", "range", False)),
+    ),
+    (
+        "quantiles_over_time",
+        "AggrFunc",
+        "sorting",
+        (
+            ("phi_label", "string", False),
+            ("phi", "scalar", True),
+            ("vector", "range", False),
+        ),
+    ),
+    (
+        "quantiles",
+        "AggrFunc",
+        "linear",
+        (
+            ("phi_label", "string", False),
+            ("phi", "scalar", True),
+            ("vector", "instant_or_range", False),
+        ),
+    ),
+    (
+        "histogram_quantiles",
+        "AggrFunc",
+        "linear",
+        (
+            ("phi_label", "string", False),
+            ("phi", "scalar", True),
+            ("vector", "instant_or_range", False),
+        ),
+    ),
+    (
+        "label_copy",
+        "LabelManipulationFunc",
+        "linear",
+        (("vector", "instant_or_range", False), ("labels", "string", True)),
+    ),
+    (
+        "label_map",
+        "LabelManipulationFunc",
+        "linear",
+        (
+            ("vector", "instant_or_range", False),
+            ("label", "string", False),
+            ("label_pairs", "string", True),
+        ),
+    ),
+    (
+        "label_move",
+        "LabelManipulationFunc",
+        "linear",
+        (("vector", "instant_or_range", False), ("labels", "string", True)),
+    ),
+    (
+        "label_set",
+        "LabelManipulationFunc",
+        "linear",
+        (("vector", "instant_or_range", False), ("labels", "string", True)),
+    ),
+)
+
+
+# the type each kind of parameter is annotated with in
+# heracles/ql/funcs/generated.pyi. Inverse of PARAM_KINDS in codegen/markdown.py.
+_PARAM_ANNOTATIONS = {
+    ParamKind.range: "prelude.RangeVector",
+    ParamKind.instant_or_range: "prelude.InstantOrRangeVector",
+    ParamKind.scalar: "int | float | prelude.InstantVector",
+    ParamKind.string: "str",
+    ParamKind.optional_string: "str | None",
+}
+
+
+# specs are only built when they're looked up, since importing heracles.ql.funcs
+# shouldn't pay for hundreds of them
+_ROWS = {row[0]: row for row in (*FUNC_TABLE, *_HANDWRITTEN_TABLE)}
+
+
+def func_names(cost_class: CostClass | None = None) -> frozenset[str]:
+    """
+    Returns the name of every function in heracles.ql.funcs, or of those in
+    cost_class if it's given.
+    """
+    if cost_class is None:
+        return frozenset(_ROWS)
+    return frozenset(name for name, _, c, _ in _ROWS.values() if c == cost_class)
+
+
+@functools.cache
+def func_spec(name: str) -> FuncSpec | None:
+    """
+    Returns the spec of the MetricsQL function called name, or None if heracles
+    doesn't know it.
+    """
+    row = _ROWS.get(name)
+    if row is None:
+        return None
+    _, node_type, cost_class, params = row
+    return FuncSpec(
+        name=name,
+        node_type=getattr(prelude, node_type),
+        params=tuple(FuncParam(n, ParamKind(k), v) for n, k, v in params),
+        cost_class=CostClass(cost_class),
+    )
+
+
+def func_specs() -> list[FuncSpec]:
+    """
+    Returns the spec of every function in heracles.ql.funcs.
+    """
+    return [spec for name in _ROWS if (spec := func_spec(name)) is not None]
+
+
+def _generated_builders() -> dict[str, Callable[..., prelude.BuiltinFunc]]:
+    """
+    Returns a builder for every function in FUNC_TABLE, which heracles.ql.funcs
+    exports. Their signatures are in heracles/ql/funcs/generated.pyi.
+    """
+    return {row[0]: _builder(row[0]) for row in FUNC_TABLE}
+
+
+def _builder(name: str) -> Callable[..., prelude.BuiltinFunc]:
+    # everything but the arguments is resolved once here, so that building a call
+    # is only an arity check on top of constructing the node
+    _, node_type_name, _, params = _ROWS[name]
+    node_type = getattr(prelude, node_type_name)
+    variadic = bool(params) and params[-1][2]
+    fixed = len(params) - variadic
+
+    def build(*args: Any, **kwargs: Any) -> prelude.BuiltinFunc:
+        if kwargs:
+            spec = func_spec(name)
+            assert spec is not None
+            args = _bind_keywords(spec, args, kwargs)
+        if len(args) != fixed and (not variadic or len(args) < fixed):
+            expected = f"at least {fixed}" if variadic else str(fixed)
+            raise TypeError(f"{name}() takes {expected} arguments ({len(args)} given)")
+        return node_type(name, *args)  # type: ignore[no-any-return]
+
+    build.__name__ = build.__qualname__ = name
+    build.__module__ = "heracles.ql.funcs.generated"
+    build.__doc__ = f"Builds a call to MetricsQL's {name}."
+    # describes the builder as generated.pyi does, rather than as (*args, **kwargs)
+    build.__signature__ = inspect.Signature(  # type: ignore[attr-defined]
+        [
+            inspect.Parameter(
+                param,
+                inspect.Parameter.VAR_POSITIONAL
+                if variadic
+                else inspect.Parameter.POSITIONAL_OR_KEYWORD,
+                annotation=_PARAM_ANNOTATIONS[kind],
+            )
+            for param, kind, variadic in params
+        ],
+        return_annotation=f"prelude.{node_type_name}",
+    )
+    build.__annotations__ = {
+        **{param: _PARAM_ANNOTATIONS[kind] for param, kind, _ in params},
+        "return": f"prelude.{node_type_name}",
+    }
+    return build
+
+
+def _bind_keywords(
+    spec: FuncSpec, args: tuple[Any, ...], kwargs: dict[str, Any]
+) -> tuple[Any, ...]:
+    bound = list(args)
+    for param in spec.params[len(args) :]:
+        if param.variadic or param.name not in kwargs:
+            break
+        bound.append(kwargs.pop(param.name))
+    if kwargs:
+        raise TypeError(
+            f"{spec.name}() got unexpected keyword arguments: {', '.join(kwargs)}"
+        )
+    return tuple(bound)
@@ -0,0 +1,404 @@
+from __future__ import annotations
+
+import array
+import enum
+import struct
+import sys
+from collections.abc import Iterable
+from typing import Any
+
+from heracles.ql import ir, prelude
+
+__all__ = ["dumps", "dumps_many", "loads", "loads_many"]
+
+# Serialized expressions start with _MAGIC followed by a one byte format version.
+# Data written with a different version can't be loaded. The rest of the format is:
+#   - the node type table, as import paths
+#   - the roots, ops, spans and operands arrays of the expressions' ExprIR, each as
+#     an item size byte, a length and the raw little endian items
+#   - the constant table, as tagged values
+#   - the annotation table, as references to importable annotations or calls to
+#     annotation factories
+#   - the annotated nodes, as node indices and indices into the annotation table
+_MAGIC = b"HQL"
+FORMAT_VERSION = 1
+
+_U32 = struct.Struct("<I")
+_I64 = struct.Struct("<q")
+_F64 = struct.Struct("<d")
+
+# value tags
+_V_NONE = 0
+_V_FALSE = 1
+_V_TRUE = 2
+_V_INT = 3
+_V_BIGINT = 4
+_V_FLOAT = 5
+_V_STR = 6
+_V_DURATION = 7
+_V_MATCHER = 8
+_V_ENUM = 9
+_V_TUPLE = 10
+_V_LIST = 11
+_V_DICT = 12
+
+# annotation reference tags
+_A_IMPORT = 0
+_A_FACTORY = 1
+
+# unsigned array typecodes, keyed by item size
+_UNSIGNED_TYPECODES = {array.array(t).itemsize: t for t in "QLIHB"}
+
+
+def dumps(
+    expr: prelude.Timeseries, *, drop_unserializable_annotations: bool = False
+) -> bytes:
+    """
+    Serializes an expression tree, including its annotations, into a compact
+    binary form which can be loaded with loads.
+
+    Annotations must be importable by name, like those created with
+    annotation.assertion() at module level, or created by an
+    annotation.annotation_factory. Other annotations raise a ValueError, unless
+    drop_unserializable_annotations is set, in which case they're left out.
+    """
+    return dumps_many(
+        (expr,), drop_unserializable_annotations=drop_unserializable_annotations
+    )
+
+
+def dumps_many(
+    exprs: Iterable[prelude.Timeseries],
+    *,
+    drop_unserializable_annotations: bool = False,
+) -> bytes:
+    """
+    Serializes several expression trees together. Subtrees and constants shared
+    between the trees are only stored once.
+    """
+    compiled = ir.ExprIR.compile_many(exprs)
+    return _Encoder(drop_unserializable_annotations).encode(compiled)
+
+
+def loads(data: bytes) -> prelude.Timeseries:
+    """
+    Loads an expression tree serialized with dumps.
+
+    Node types, enums and annotations are looked up by the paths recorded in data,
+    but only in modules which are already imported: loading never imports a
+    module, and only calls functions marked with annotation.annotation_factory.
+    Even so, annotation factories run with arguments taken from data, so only
+    load data from trusted sources.
+    """
+    (expr,) = loads_many(data)
+    return expr
+
+
+def loads_many(data: bytes) -> list[prelude.Timeseries]:
+    """
+    Loads the expression trees serialized with dumps_many, in order.
+    """
+    return _Decoder(data).decode().to_timeseries_many()
+
+
+def _import_path(obj: Any) -> str | None:
+    """
+    Returns the path obj can be imported from, or None if it can't be imported.
+    """
+    module = getattr(obj, "__module__", None)
+    qualname = getattr(obj, "__qualname__", None)
+    if not module or not qualname or "<locals>" in qualname:
+        return None
+    try:
+        found = _resolve(f"{module}:{qualname}")
+    except (ImportError, AttributeError):
+        return None
+    if found is not obj:
+        return None
+    return f"{module}:{qualname}"
+
+
+def _resolve(path: str) -> Any:
+    module, _, qualname = path.partition(":")
+    # paths come from serialized data, so they mustn't be able to import, and so
+    # run, arbitrary modules
+    obj: Any = sys.modules.get(module)
+    if obj is None:
+        raise ImportError(f"module {module!r} isn't imported")
+    for name in qualname.split("."):
+        obj = getattr(obj, name)
+    return obj
+
+
+class _Encoder:
+    def __init__(self, drop_unserializable_annotations: bool) -> None:
+        self.drop_unserializable_annotations = drop_unserializable_annotations
+        self.out = bytearray()
+        self.annotation_table: list[prelude.AppliableAnnotation[Any]] = []
+        self.annotation_ids: dict[int, int | None] = {}
+
+    def encode(self, compiled: ir.ExprIR) -> bytes:
+        self.out += _MAGIC
+        self.out.append(FORMAT_VERSION)
+
+        self._u32(len(compiled.types))
+        for t in compiled.types:
+            path = _import_path(t)
+            if path is None:
+                raise ValueError(f"node type {t!r} can't be imported by name")
+            self._str(path)
+
+        for arr in (compiled.roots, compiled.ops, compiled.spans, compiled.operands):
+            self._array(arr)
+
+        self._u32(len(compiled.consts))
+        for c in compiled.consts:
+            self._value(c)
+
+        # annotations are collected before they're written, so that each is only
+        # written once no matter how many nodes it's applied to
+        annotated: list[tuple[int, list[int]]] = []
+        for node, applied in compiled.annotations.items():
+            ids = [self._annotation_id(a) for a in applied]
+            annotated.append((node, [i for i in ids if i is not None]))
+
+        self._u32(len(self.annotation_table))
+        for a in self.annotation_table:
+            self._annotation(a)
+
+        self._u32(len(annotated))
+        for node, table_ids in annotated:
+            self._u32(node)
+            self._u32(len(table_ids))
+            for i in table_ids:
+                self._u32(i)
+        return bytes(self.out)
+
+    def _annotation_id(self, a: prelude.AppliableAnnotation[Any]) -> int | None:
+        key = id(a)
+        if key not in self.annotation_ids:
+            if _import_path(a) is None and not hasattr(a, "_factory_call"):
+                if not self.drop_unserializable_annotations:
+                    raise ValueError(
+                        f"annotation {a!r} can't be serialized: it must be importable "
+                        "by name or created by an annotation factory"
+                    )
+                self.annotation_ids[key] = None
+            else:
+                self.annotation_ids[key] = len(self.annotation_table)
+                self.annotation_table.append(a)
+        return self.annotation_ids[key]
+
+    def _annotation(self, a: prelude.AppliableAnnotation[Any]) -> None:
+        path = _import_path(a)
+        if path is not None:
+            self.out.append(_A_IMPORT)
+            self._str(path)
+            return
+        factory, args, kwargs = getattr(a, "_factory_call")
+        factory_path = _import_path(factory)
+        if factory_path is None:
+            raise ValueError(f"annotation factory {factory!r} can't be imported")
+        self.out.append(_A_FACTORY)
+        self._str(factory_path)
+        self._value(tuple(args))
+        self._value(dict(kwargs))
+
+    def _u32(self, v: int) -> None:
+        self.out += _U32.pack(v)
+
+    def _str(self, s: str) -> None:
+        encoded = s.encode()
+        self._u32(len(encoded))
+        self.out += encoded
+
+    def _array(self, arr: array.array[int]) -> None:
+        bits = max(arr, default=0).bit_length()
+        itemsize = next(
+            size for size in sorted(_UNSIGNED_TYPECODES) if size * 8 >= bits
+        )
+        packed = array.array(_UNSIGNED_TYPECODES[itemsize], arr)
+        if sys.byteorder == "big":
+            packed.byteswap()
+        self.out.append(itemsize)
+        self._u32(len(packed))
+        self.out += packed.tobytes()
+
+    def _value(self, v: Any) -> None:
+        out = self.out
+        if v is None:
+            out.append(_V_NONE)
+        elif v is False:
+            out.append(_V_FALSE)
+        elif v is True:
+            out.append(_V_TRUE)
+        elif isinstance(v, enum.Enum):
+            # checked before the base types, since str enums are strs
+            path = _import_path(type(v))
+            if path is None:
+                raise ValueError(f"enum {type(v)!r} can't be imported by name")
+            out.append(_V_ENUM)
+            self._str(path)
+            self._value(v.value)
+        elif type(v) is int:
+            if -(2**63) <= v < 2**63:
+                out.append(_V_INT)
+                out += _I64.pack(v)
+            else:
+                out.append(_V_BIGINT)
+                self._str(str(v))
+        elif type(v) is float:
+            out.append(_V_FLOAT)
+            out += _F64.pack(v)
+        elif type(v) is str:
+            out.append(_V_STR)
+            self._str(v)
+        elif type(v) is prelude.Duration:
+            out.append(_V_DURATION)
+            self._value(v.time_value)
+            self._value(v.interval_value)
+        elif type(v) is prelude.Matcher:
+            out.append(_V_MATCHER)
+            self._str(v.value)
+            self._value(v.kind)
+        elif isinstance(v, tuple | list):
+            out.append(_V_TUPLE if isinstance(v, tuple) else _V_LIST)
+            self._u32(len(v))
+            for item in v:
+                self._value(item)
+        elif isinstance(v, dict):
+            out.append(_V_DICT)
+            self._u32(len(v))
+            for k, item in v.items():
+                self._value(k)
+                self._value(item)
+        else:
+            raise ValueError(f"can't serialize value {v!r} of type {type(v)!r}")
+
+
+class _Decoder:
+    def __init__(self, data: bytes) -> None:
+        self.data = memoryview(data)
+        self.pos = 0
+
+    def decode(self) -> ir.ExprIR:
+        if bytes(self.data[: len(_MAGIC)]) != _MAGIC:
+            raise ValueError("not a serialized heracles expression")
+        self.pos = len(_MAGIC)
+        version = self._byte()
+        if version != FORMAT_VERSION:
+            raise ValueError(
+                f"unsupported serialization format version {version}, "
+                f"expected {FORMAT_VERSION}"
+            )
+
+        types = []
+        for _ in range(self._u32()):
+            t = self._resolve_checked(self._str())
+            if not (isinstance(t, type) and issubclass(t, prelude.Timeseries)):
+                raise ValueError(f"{t!r} is not a node type")
+            types.append(t)
+
+        roots, ops, spans, operands = (self._array() for _ in range(4))
+        consts = [self._value() for _ in range(self._u32())]
+        annotation_table = [self._annotation() for _ in range(self._u32())]
+
+        annotations: dict[int, tuple[prelude.AppliableAnnotation[Any], ...]] = {}
+        for _ in range(self._u32()):
+            node = self._u32()
+            annotations[node] = tuple(
+                annotation_table[self._u32()] for _ in range(self._u32())
+            )
+
+        if self.pos != len(self.data):
+            raise ValueError("trailing data after serialized expression")
+        return ir.ExprIR(types, ops, spans, operands, consts, annotations, roots)
+
+    def _resolve_checked(self, path: str) -> Any:
+        try:
+            return _resolve(path)
+        except (ImportError, AttributeError) as e:
+            raise ValueError(f"can't resolve {path!r}") from e
+
+    def _annotation(self) -> prelude.AppliableAnnotation[Any]:
+        tag = self._byte()
+        if tag == _A_IMPORT:
+            a = self._resolve_checked(self._str())
+            if not (isinstance(a, type) and issubclass(a, prelude.Annotation)):
+                raise ValueError(f"{a!r} is not an annotation")
+            return a  # type: ignore[no-any-return]
+        if tag == _A_FACTORY:
+            factory = self._resolve_checked(self._str())
+            if not getattr(factory, "_annotation_factory", False):
+                raise ValueError(f"{factory!r} is not an annotation factory")
+            args = self._value()
+            kwargs = self._value()
+            return factory(*args, **kwargs)  # type: ignore[no-any-return]
+        raise ValueError(f"unknown annotation tag {tag}")
+
+    def _byte(self) -> int:
+        b = self.data[self.pos]
+        self.pos += 1
+        return b
+
+    def _u32(self) -> int:
+        (v,) = _U32.unpack_from(self.data, self.pos)
+        self.pos += _U32.size
+        return v  # type: ignore[no-any-return]
+
+    def _str(self) -> str:
+        length = self._u32()
+        s = str(self.data[self.pos : self.pos + length], "utf-8")
+        self.pos += length
+        return s
+
+    def _array(self) -> array.array[int]:
+        itemsize = self._byte()
+        if itemsize not in _UNSIGNED_TYPECODES:
+            raise ValueError(f"unsupported array item size {itemsize}")
+        length = self._u32()
+        end = self.pos + length * itemsize
+        arr = array.array(_UNSIGNED_TYPECODES[itemsize])
+        arr.frombytes(self.data[self.pos : end])
+        if sys.byteorder == "big":
+            arr.byteswap()
+        self.pos = end
+        return arr
+
+    def _value(self) -> Any:
+        tag = self._byte()
+        if tag == _V_NONE:
+            return None
+        if tag == _V_FALSE:
+            return False
+        if tag == _V_TRUE:
+            return True
+        if tag == _V_INT:
+            (v,) = _I64.unpack_from(self.data, self.pos)
+            self.pos += _I64.size
+            return v
+        if tag == _V_BIGINT:
+            return int(self._str())
+        if tag == _V_FLOAT:
+            (v,) = _F64.unpack_from(self.data, self.pos)
+            self.pos += _F64.size
+            return v
+        if tag == _V_STR:
+            return self._str()
+        if tag == _V_DURATION:
+            time_value = self._value()
+            return prelude.Duration(time_value, self._value())
+        if tag == _V_MATCHER:
+            value = self._str()
+            return prelude.Matcher(value, self._value())
+        if tag == _V_ENUM:
+            enum_type = self._resolve_checked(self._str())
+            if not (isinstance(enum_type, type) and issubclass(enum_type, enum.Enum)):
+                raise ValueError(f"{enum_type!r} is not an enum")
+            return enum_type(self._value())
+        if tag in (_V_TUPLE, _V_LIST):
+            items = [self._value() for _ in range(self._u32())]
+            return tuple(items) if tag == _V_TUPLE else items
+        if tag == _V_DICT:
+            return {self._value(): self._value() for _ in range(self._u32())}
+        raise ValueError(f"unknown value tag {tag}")
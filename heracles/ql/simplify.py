@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import math
+import operator
+from collections.abc import Callable
+from typing import Any
+
+from heracles.ql import prelude
+
+__all__ = ["simplify"]
+
+_FOLDABLE_OPS: dict[str, Callable[[float, float], float]] = {
+    prelude.BinopKind.add: operator.add,
+    prelude.BinopKind.sub: operator.sub,
+    prelude.BinopKind.mul: operator.mul,
+    prelude.BinopKind.truediv: operator.truediv,
+    prelude.BinopKind.mod: math.fmod,
+    prelude.BinopKind.pow: operator.pow,
+    prelude.BinopKind.atan2: math.atan2,
+}
+
+# aggregations whose results have no __name__ label
+_NAMELESS_AGGREGATIONS = frozenset(
+    ("avg", "count", "group", "max", "min", "stddev", "stdvar", "sum")
+)
+
+
+def simplify(root: prelude.Timeseries) -> prelude.Timeseries:
+    """
+    Returns an equivalent expression with work that would otherwise be repeated on
+    every evaluation removed:
+      - arithmetic between scalar literals is folded, so (2 * 3) becomes 6,
+      - identity operations (x + 0, 0 + x, x - 0, x * 1, 1 * x, x / 1) are
+        replaced by their operand,
+      - double negation, --x, is replaced by x, and the negation of a literal by
+        a negative literal.
+
+    Arithmetic drops the __name__ label of its result, so an identity operation or
+    double negation is only removed when its operand has no __name__ either, that
+    is when it's a literal, arithmetic, a negation or an aggregation like sum. For
+    example x * 1 is kept, since it differs from x by dropping __name__.
+    Operations with vector matching modifiers, annotated nodes and results which
+    aren't finite (like 1 / 0) are left as they are.
+
+    Unchanged subtrees are returned as-is, and root is never modified.
+    """
+    return prelude._rewrite(root, _simplify_node)
+
+
+def _simplify_node(node: prelude.Timeseries) -> prelude.Timeseries:
+    if node.is_annotated():
+        return node
+    if isinstance(node, prelude.BinaryOp):
+        return _simplify_binop(node)
+    if isinstance(node, prelude.UnaryOp) and node.op == prelude.UnopKind.neg:
+        return _simplify_neg(node)
+    return node
+
+
+def _simplify_binop(node: prelude.BinaryOp) -> prelude.Timeseries:
+    if node.on_labels or node.ignoring_labels or node.group_by:
+        return node
+    left, right, op = node.left, node.right, node.op
+    left_v = _literal_value(left)
+    right_v = _literal_value(right)
+    if left_v is not None and right_v is not None:
+        return _fold(node, op, left_v, right_v)
+    if right_v is not None and _is_identity(op, right_v, right_side=True):
+        return left if _is_nameless(left) else node
+    if left_v is not None and _is_identity(op, left_v, right_side=False):
+        return right if _is_nameless(right) else node
+    return node
+
+
+def _fold(
+    node: prelude.BinaryOp, op: str, left: float, right: float
+) -> prelude.Timeseries:
+    fold = _FOLDABLE_OPS.get(op)
+    if fold is None:
+        return node
+    try:
+        result = fold(left, right)
+    except (ArithmeticError, ValueError):
+        return node
+    # inf and nan can't be rendered as literals, and 0 ^ -1 is complex
+    if not isinstance(result, float | int) or not math.isfinite(result):
+        return node
+    return prelude.ScalarLiteral(result)
+
+
+def _is_identity(op: str, value: float, *, right_side: bool) -> bool:
+    if op == prelude.BinopKind.add:
+        return value == 0
+    if op == prelude.BinopKind.mul:
+        return value == 1
+    if right_side and op == prelude.BinopKind.sub:
+        return value == 0
+    if right_side and op == prelude.BinopKind.truediv:
+        return value == 1
+    return False
+
+
+def _simplify_neg(node: prelude.UnaryOp) -> prelude.Timeseries:
+    arg = node.arg
+    value = _literal_value(arg)
+    if value is not None:
+        return prelude.ScalarLiteral(-value)
+    if (
+        isinstance(arg, prelude.UnaryOp)
+        and arg.op == prelude.UnopKind.neg
+        and not arg.is_annotated()
+        and _is_nameless(arg.arg)
+    ):
+        return arg.arg  # type: ignore[no-any-return]
+    return node
+
+
+def _literal_value(node: Any) -> float | None:
+    if isinstance(node, prelude.ScalarLiteral) and not node.is_annotated():
+        return node.v
+    return None
+
+
+def _is_nameless(node: Any) -> bool:
+    """
+    Returns whether the results of node never have a __name__ label.
+    """
+    if isinstance(node, prelude.ScalarLiteral | prelude.UnaryOp):
+        return True
+    if isinstance(node, prelude.BinaryOp):
+        return node.op in _FOLDABLE_OPS
+    if isinstance(node, prelude.BaseAggrFunc):
+        return node.name in _NAMELESS_AGGREGATIONS
+    return False
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import collections
+import itertools
+from collections.abc import Iterable, Iterator
+
+from heracles.ql import prelude
+
+__all__ = ["render_with_templates"]
+
+# the overhead of one template definition, ", name = body", besides its name and
+# body
+_DEFINITION_OVERHEAD = 5
+
+
+class _TemplateRef(prelude.InstantVector):
+    """
+    _TemplateRef stands in for a subexpression which is rendered as a reference to
+    a WITH template.
+    """
+
+    __slots__ = ("name",)
+
+    def __init__(self, name: str) -> None:
+        super().__init__()
+        self.name = name
+
+    def _render_parts(self) -> Iterable[str | prelude.Timeseries]:
+        return (self.name,)
+
+
+def render_with_templates(root: prelude.Timeseries) -> str:
+    """
+    Renders root, writing subexpressions which appear more than once as MetricsQL
+    WITH templates, so that each is only written out once. For example
+
+        ((sum(rate(x{}[5m])) by (a) / (sum(rate(x{}[5m])) by (a) offset 1d)) > 2.0)
+
+    renders as
+
+        WITH (_t0 = sum(rate(x{}[5m])) by (a)) ((_t0 / (_t0 offset 1d)) > 2.0)
+
+    Subexpressions are matched by their rendered form, so structurally equal
+    subtrees share a template whether or not they're the same object. A template
+    is only made when it makes the output shorter. Repeats inside a template are
+    made into templates of their own, which are defined before the templates using
+    them.
+
+    MetricsQL expands templates while parsing, so the query is evaluated exactly as
+    if it had been rendered normally. The output isn't valid PromQL.
+    """
+    text = root.render()
+    names = (n for n in (f"_t{i}" for i in itertools.count()) if n not in text)
+
+    # the main expression is keyed by None, templates by their name
+    trees: dict[str | None, prelude.Timeseries] = {None: root}
+    order: list[str] = []
+    while True:
+        picks = _pick_repeats(trees)
+        if not picks:
+            break
+        refs = {s: _TemplateRef(next(names)) for s in picks}
+        trees = {
+            key: _substitute(tree, refs, keep_root=key is not None)
+            for key, tree in trees.items()
+        }
+        for s, node in picks.items():
+            name = refs[s].name
+            trees[name] = _substitute(node, refs, keep_root=True)
+            order.append(name)
+
+    if len(trees) == 1:
+        return text
+    definitions = [
+        f"{name} = {trees[name].render()}" for name in _dependency_order(trees, order)
+    ]
+    return f"WITH ({', '.join(definitions)}) {trees[None].render()}"
+
+
+def _candidates(
+    trees: dict[str | None, prelude.Timeseries],
+) -> Iterator[tuple[prelude.Timeseries, bool]]:
+    """
+    Yields every occurrence of every node, along with whether it's the root of an
+    existing template's body.
+    """
+    for key, tree in trees.items():
+        stack = [(tree, key is not None)]
+        while stack:
+            node, is_body = stack.pop()
+            yield node, is_body
+            stack.extend(
+                (c, False)
+                for c in node._children_to_visit()
+                if isinstance(c, prelude.Timeseries)
+            )
+
+
+def _is_candidate(node: prelude.Timeseries) -> bool:
+    # templates are restricted to instant vectors, which can be used anywhere an
+    # expression can
+    return isinstance(node, prelude.InstantVector) and not isinstance(
+        node, prelude.ScalarLiteral | _TemplateRef
+    )
+
+
+def _pick_repeats(
+    trees: dict[str | None, prelude.Timeseries],
+) -> dict[str, prelude.Timeseries]:
+    """
+    Returns the largest subexpressions which are repeated and worth making into
+    templates, keyed by their rendered form. Repeats inside a picked subexpression
+    are left for the next round, once the picked one has become a single template.
+    """
+    counts: collections.Counter[str] = collections.Counter(
+        node.render()
+        for node, is_body in _candidates(trees)
+        if not is_body and _is_candidate(node)
+    )
+    picks: dict[str, prelude.Timeseries] = {}
+    for key, tree in trees.items():
+        stack = [(tree, key is not None)]
+        while stack:
+            node, is_body = stack.pop()
+            if not is_body and _is_candidate(node):
+                s = node.render()
+                if s in picks or _worth_template(s, counts[s]):
+                    picks.setdefault(s, node)
+                    continue
+            stack.extend(
+                (c, False)
+                for c in node._children_to_visit()
+                if isinstance(c, prelude.Timeseries)
+            )
+    return picks
+
+
+def _worth_template(rendered: str, count: int) -> bool:
+    # template names are at most a few characters long
+    name_length = 4
+    inline = count * len(rendered)
+    templated = (count + 1) * name_length + len(rendered) + _DEFINITION_OVERHEAD
+    return count >= 2 and templated < inline
+
+
+def _substitute(
+    root: prelude.Timeseries, refs: dict[str, _TemplateRef], *, keep_root: bool
+) -> prelude.Timeseries:
+    """
+    Returns root with every subexpression whose rendered form is in refs replaced
+    by its reference, except root itself if keep_root is set.
+    """
+    done: dict[int, prelude.Timeseries] = {}
+    # each entry is a node and whether its children have already been pushed
+    stack: list[tuple[prelude.Timeseries, bool]] = [(root, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if id(node) in done:
+            continue
+        if expanded:
+            done[id(node)] = node._map_children(lambda c: done.get(id(c), c))
+            continue
+        if (node is not root or not keep_root) and _is_candidate(node):
+            ref = refs.get(node.render())
+            if ref is not None:
+                done[id(node)] = ref
+                continue
+        stack.append((node, True))
+        stack.extend(
+            (c, False)
+            for c in node._children_to_visit()
+            if isinstance(c, prelude.Timeseries)
+        )
+    return done[id(root)]
+
+
+def _dependency_order(
+    trees: dict[str | None, prelude.Timeseries], order: list[str]
+) -> list[str]:
+    """
+    Orders template names so that every template is defined after the templates
+    its body refers to.
+    """
+    ordered: list[str] = []
+    seen: set[str] = set()
+    for name in order:
+        # each entry is a template name and whether its dependencies have already
+        # been pushed
+        stack = [(name, False)]
+        while stack:
+            current, expanded = stack.pop()
+            if expanded:
+                ordered.append(current)
+                continue
+            if current in seen:
+                continue
+            seen.add(current)
+            stack.append((current, True))
+            refs: list[str] = []
+
+            def collect(t: _TemplateRef) -> None:
+                refs.append(t.name)
+
+            trees[current].accept_visitor(collect)
+            stack.extend((r, False) for r in refs if r not in seen)
+    return ordered
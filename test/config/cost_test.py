@@ -0,0 +1,60 @@
+import pytest
+
+from heracles import config, ql
+
+
+def make_config() -> config.PrometheusRulesConfig:
+    cheap = config.RuleBundle(name="cheap")
+    costly = config.RuleBundle(name="costly", evaluation_interval=30 * ql.Second)
+    v = cheap.vectors()
+
+    @cheap.alert()
+    def Down() -> config.Alert:
+        return config.SimpleAlert(expr=v.up == 0)
+
+    @costly.alert()
+    def SlowRequests() -> config.Alert:
+        latency = ql.quantile_over_time(0.99, v.latency[1 * ql.Hour])
+        return config.SimpleAlert(expr=latency > 1)
+
+    return config.PrometheusRulesConfig.from_bundles(cheap, costly)
+
+
+def test_cost_report() -> None:
+    cheap, costly = config.cost_report(make_config())
+    assert cheap.name == "cheap"
+    assert cheap.interval == ql.Minute
+    assert [r.name for r in cheap.rules] == ["Down"]
+    assert cheap.cost_per_minute == cheap.cost
+
+    (rule,) = costly.rules
+    assert rule.cost > 100 * cheap.cost
+    assert costly.cost == rule.cost
+    # evaluated twice a minute
+    assert costly.cost_per_minute == 2 * costly.cost
+
+
+def test_cost_budget() -> None:
+    rules_config = make_config()
+    assert config.CostBudget(max_rule_cost=10_000).check(rules_config)
+
+    with pytest.raises(config.CostBudgetExceeded) as exc_info:
+        config.CostBudget(max_rule_cost=100).check(rules_config)
+    (violation,) = exc_info.value.violations
+    assert "SlowRequests" in violation
+
+    with pytest.raises(config.CostBudgetExceeded) as exc_info:
+        config.CostBudget(max_group_cost_per_minute=1_000).check(rules_config)
+    (violation,) = exc_info.value.violations
+    assert "group 'costly'" in violation
+
+
+def test_cost_report_resolves_interval_units() -> None:
+    bundle = config.RuleBundle(name="every_other", evaluation_interval=2 * ql.I)
+    bundle.record(ql.sum(bundle.vectors().x), "total")
+    rules_config = config.PrometheusRulesConfig.from_bundles(bundle)
+
+    (group,) = config.cost_report(rules_config)
+    assert group.interval == 2 * ql.Minute
+    assert group.cost_per_minute == group.cost / 2
+    assert config.CostBudget(max_group_cost_per_minute=group.cost).check(rules_config)
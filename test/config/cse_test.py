@@ -0,0 +1,119 @@
+from heracles import config, ql
+from heracles.ql.assertions import assert_exactly_one
+
+
+def make_bundles() -> tuple[config.RuleBundle, config.RuleBundle]:
+    api = config.RuleBundle(name="api")
+    web = config.RuleBundle(name="web")
+    v = api.vectors()
+
+    def errors() -> ql.InstantVector:
+        return ql.sum(ql.rate(v.http_errors_total(job="api")[5 * ql.Minute])).by(
+            "instance"
+        )
+
+    def high_errors(threshold: int) -> config.Alert:
+        return config.SimpleAlert(
+            expr=errors() > threshold, labels={"i": str(threshold)}
+        )
+
+    for i, bundle in enumerate([api, web, api]):
+        bundle.alert(f"HighErrors{i}", bundle.extends(high_errors, threshold=i))
+
+    @web.alert()
+    def ErrorsOffset() -> config.Alert:
+        # inside offset, so it can't be replaced
+        return config.SimpleAlert(expr=errors().offset(ql.Hour) > 1)
+
+    @web.alert()
+    def Unrelated() -> config.Alert:
+        return config.SimpleAlert(expr=v.up == 0)
+
+    return api, web
+
+
+def test_cse_records_repeated_subexpressions() -> None:
+    api, web = make_bundles()
+    factory = config.CommonSubexpressionConfigFactory(max_series=10)
+    factory.prepare([api, web])
+
+    (recording,) = factory.recordings
+    assert recording.name.startswith("cse:http_errors_total:")
+    assert recording.expr.render() == (
+        'sum(rate(http_errors_total{job="api"}[5m])) by (instance)'
+    )
+
+    (api_group,) = factory.config_from_bundles(api).groups
+    (web_group,) = factory.config_from_bundles(web).groups
+    assert [r.name for r in api_group.rules] == [
+        recording.name,
+        "HighErrors0",
+        "HighErrors2",
+    ]
+    exprs = {r.name: r.expr.render() for r in [*api_group.rules, *web_group.rules]}
+    assert exprs["HighErrors0"] == f"({recording.name}{{}} > 0.0)"
+    # web only uses it once outside offset, and recordings aren't shared between
+    # groups
+    assert exprs["HighErrors1"].startswith("(sum(rate(")
+    assert exprs["ErrorsOffset"].startswith("((sum(rate(")
+    assert exprs["Unrelated"] == "(up{} == 0.0)"
+
+    # rules keep their other fields
+    assert [r.labels for r in api_group.rules[1:]] == [{"i": "0"}, {"i": "2"}]
+
+
+def test_cse_budget() -> None:
+    api, web = make_bundles()
+    factory = config.CommonSubexpressionConfigFactory(
+        max_series=10, estimate_series=lambda _: 20
+    )
+    factory.prepare([api, web])
+    assert factory.recordings == []
+    (api_group,) = factory.config_from_bundles(api).groups
+    assert len(api_group.rules) == 2
+
+
+def test_cse_shares_recordings_of_annotated_duplicates() -> None:
+    bundle = config.RuleBundle(name="team")
+    v = bundle.vectors()
+
+    def errors(annotated: bool) -> ql.InstantVector:
+        rate = ql.rate(v.x(job="a")[5 * ql.Minute])
+        if annotated:
+            rate = rate.annotate(assert_exactly_one("i"))
+        return ql.sum(rate).by("i")
+
+    def alert(i: int) -> config.Alert:
+        return config.SimpleAlert(expr=errors(i % 2 == 0) > i)
+
+    for i in range(4):
+        bundle.alert(f"Alert{i}", bundle.extends(alert, i=i))
+
+    factory = config.CommonSubexpressionConfigFactory(max_series=10)
+    factory.prepare([bundle])
+    factory.prepare([bundle])
+
+    (recording,) = factory.recordings
+    (group,) = factory.config_from_bundles(bundle).groups
+    names = [r.name for r in group.rules]
+    assert names == [recording.name, "Alert0", "Alert1", "Alert2", "Alert3"]
+    for rule in group.rules[1:]:
+        assert rule.expr.render().startswith(f"({recording.name}{{}} > ")
+
+
+def test_cse_records_separately_in_each_group() -> None:
+    bundles = [config.RuleBundle(name=name) for name in ["fast", "slow"]]
+    for bundle in bundles:
+        v = bundle.vectors()
+        for i in range(2):
+            bundle.record(ql.sum(ql.rate(v.x[5 * ql.Minute])) * i, f"x:times{i}")
+
+    factory = config.CommonSubexpressionConfigFactory(max_series=10)
+    factory.prepare(bundles)
+
+    fast, slow = factory.recordings
+    assert fast.name != slow.name
+    assert fast.expr.render() == slow.expr.render()
+    for bundle, recording in zip(bundles, [fast, slow]):
+        (group,) = factory.config_from_bundles(bundle).groups
+        assert [r.name for r in group.rules] == [recording.name, "x:times0", "x:times1"]
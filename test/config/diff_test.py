@@ -0,0 +1,67 @@
+from heracles import config, ql
+
+
+def make_bundle(threshold: int, extra_label: bool = False) -> config.RuleBundle:
+    rules = config.RuleBundle(name="test_bundle", evaluation_interval=ql.Minute)
+
+    @rules.alert()
+    def HighErrors() -> config.Alert:
+        return config.SimpleAlert(
+            expr=rules.vectors().errors > threshold,
+            for_=5 * ql.Minute,
+            labels={"severity": "page", **({"team": "a"} if extra_label else {})},
+        )
+
+    @rules.alert()
+    def Unchanged() -> config.Alert:
+        return config.SimpleAlert(expr=rules.vectors().up == 0)
+
+    rules.record(rules.vectors().requests * 2, "requests:doubled")
+    return rules
+
+
+def test_diff_rules() -> None:
+    old = list(make_bundle(1).dump())
+    assert config.diff_rules(old, list(make_bundle(1).dump())) == []
+
+    (change,) = config.diff_rules(old, list(make_bundle(2, extra_label=True).dump()))
+    assert change.name == "HighErrors"
+    assert change.changed_fields == ["labels", "expr"]
+    (edit,) = change.expr_edits
+    assert edit.path == (1,)
+
+    added, removed = config.diff_rules(old[1:2], old[:1])
+    assert added.added and added.name == "HighErrors"
+    assert removed.removed and removed.name == "Unchanged"
+
+
+def test_diff_rules_reports_moves() -> None:
+    old = list(make_bundle(1).dump())
+    new = [old[2], old[0], old[1]]
+    (change,) = config.diff_rules(old, new)
+    assert change.name == "requests:doubled"
+    assert change.moved and change.changed_fields == [] and change.expr_edits == []
+
+    changed = list(make_bundle(2).dump())
+    (change,) = config.diff_rules(old, [old[1], old[2], changed[0]])
+    assert change.name == "HighErrors"
+    assert change.moved and change.changed_fields == ["expr"]
+
+
+def test_diff_configs() -> None:
+    def build(threshold: int) -> config.PrometheusRulesConfig:
+        return config.PrometheusRulesConfig.from_bundles(make_bundle(threshold))
+
+    assert config.diff_configs(build(1), build(1)) == []
+
+    (group,) = config.diff_configs(build(1), build(2))
+    assert group.name == "test_bundle"
+    assert not group.interval_changed
+    assert [c.name for c in group.rule_changes] == ["HighErrors"]
+
+    other = config.RuleBundle(name="other_bundle", evaluation_interval=ql.Minute)
+    other.record(other.vectors().up, "up:copy")
+    first = config.PrometheusRulesConfig.from_bundles(make_bundle(1), other)
+    second = config.PrometheusRulesConfig(groups=first.groups[::-1])
+    (group,) = config.diff_configs(first, second)
+    assert group.moved and group.rule_changes == []
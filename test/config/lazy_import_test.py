@@ -0,0 +1,29 @@
+import subprocess
+import sys
+
+from heracles import config, ql
+
+
+def test_import_defers_schemas_and_yaml() -> None:
+    code = (
+        "import sys, heracles.config as c; "
+        "print('yaml' in sys.modules, c.RealizedAlert.__pydantic_complete__, "
+        "c.PrometheusRulesConfig.__pydantic_complete__)"
+    )
+    res = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert res.stdout.split() == ["False", "False", "False"]
+
+
+def test_deferred_models_serialize() -> None:
+    alert = config.RealizedAlert(
+        name="Up", raw_expr=ql.Selector().up == 0, for_=5 * ql.Minute
+    )
+    rules_config = config.PrometheusRulesConfig(
+        groups=[config.PrometheusRuleGroup(name="g", rules=[alert], interval=None)]
+    )
+    dump = rules_config.to_dict(with_templates=True)
+    assert dump["groups"][0]["rules"][0]["alert"] == "Up"
+    assert dump["groups"][0]["rules"][0]["for"] == "5m"
+    assert "alert: Up" in rules_config.as_yaml(with_templates=True)
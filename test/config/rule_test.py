@@ -1,3 +1,5 @@
+import pytest
+
 from heracles import config, ql
 
 
@@ -131,3 +133,82 @@ def test_assertion_extraction() -> None:
     assert dumped_rules[0].expr.render() == '(example_metric{foo="bar"} * 42.0)'
     assert dumped_rules[1].name == "TestingRuleInvalidData"
     assert dumped_rules[1].expr.render() == 'absent(example_metric{foo="bar"})'
+
+
+def test_align_subqueries() -> None:
+    def max_rate(bundle: config.RuleBundle) -> ql.InstantVector:
+        rate = ql.rate(bundle.vectors().x[5 * ql.Minute])
+        return ql.max_over_time(rate[1 * ql.Hour : None])
+
+    aligned = config.RuleBundle(
+        name="aligned", evaluation_interval=30 * ql.Second, align_subqueries=True
+    )
+    aligned.record(max_rate(aligned), "max_rate")
+    (rule,) = aligned.dump()
+    assert rule.expr.render() == "max_over_time((rate(x{}[5m]))[1h:30s])"
+    assert aligned.get("max_rate") is not None
+
+    unaligned = config.RuleBundle(name="unaligned")
+    unaligned.record(max_rate(unaligned), "max_rate")
+    (rule,) = unaligned.dump()
+    assert rule.expr.render() == "max_over_time((rate(x{}[5m]))[1h:])"
+
+
+def test_simplify_exprs() -> None:
+    def scaled(bundle: config.RuleBundle) -> ql.InstantVector:
+        return ql.sum(bundle.vectors().x(job=ql.RE("a|a"))) * (ql.ScalarLiteral(60) * 1)
+
+    simplified = config.RuleBundle(name="simplified", simplify_exprs=True)
+    simplified.record(scaled(simplified), "scaled")
+    (rule,) = simplified.dump()
+    assert rule.expr.render() == '(sum(x{job="a"}) * 60.0)'
+
+    # existing rules are written as they're defined unless a bundle opts in
+    unchanged = config.RuleBundle(name="unchanged")
+    unchanged.record(scaled(unchanged), "scaled")
+    (rule,) = unchanged.dump()
+    assert rule.expr.render() == '(sum(x{job=~"a|a"}) * (60.0 * 1.0))'
+
+
+def test_get_realizes_each_rule_once() -> None:
+    bundle = config.RuleBundle(name="indexed")
+    calls: list[str] = []
+
+    def counted(name: str, expr: ql.InstantVector) -> None:
+        @bundle.alert(name)
+        def alert() -> config.Alert:
+            calls.append(name)
+            return config.SimpleAlert(expr=expr)
+
+    counted("First", ql.Selector().x > 1)
+    counted("Second", ql.Selector().y > 1)
+
+    assert bundle.get("First") is not None
+    assert bundle.get("Missing") is None
+    assert calls == ["First", "Second"]
+
+    # lookups return copies, so changing one doesn't change the bundle
+    second = bundle.get("Second")
+    assert second is not None
+    second.expr = ql.Selector().changed > 1
+    second = bundle.get("Second")
+    assert second is not None
+    assert second.expr.render() == "(y{} > 1.0)"
+
+    # only the added rule is realized by the next lookup, and dumps reuse them
+    counted("Third", ql.Selector().z > 1)
+    assert bundle.get("Third") is not None
+    assert [r.name for r in bundle.dump()] == ["First", "Second", "Third"]
+    assert calls == ["First", "Second", "Third"]
+
+
+def test_get_propagates_errors() -> None:
+    bundle = config.RuleBundle(name="broken")
+
+    @bundle.alert()
+    def Broken() -> config.Alert:
+        raise RuntimeError("no data")
+
+    with pytest.raises(RuntimeError, match="no data") as e:
+        bundle.get("Broken")
+    assert "bundle 'broken'" in e.value.__notes__[0]
@@ -0,0 +1,79 @@
+import pathlib
+
+import pytest
+
+from heracles import config, ql
+from heracles.ql import _native
+
+requires_validator = pytest.mark.skipif(
+    _native.buffer_func("ValidateMany") is None,
+    reason="formatter library with ValidateMany isn't available",
+)
+
+
+def make_dumps(*exprs: str) -> dict[str, dict]:
+    return {
+        "team.rules": {
+            "groups": [
+                {
+                    "name": "team",
+                    "rules": [
+                        {"alert": f"Rule{i}", "expr": e} for i, e in enumerate(exprs)
+                    ],
+                }
+            ]
+        }
+    }
+
+
+def test_validate_syntax_locates_errors(monkeypatch: pytest.MonkeyPatch) -> None:
+    def validate_many(queries: list[str]) -> list[ql.QuerySyntaxError | None]:
+        return [
+            ql.QuerySyntaxError("unexpected token", 4) if "(" in q else None
+            for q in queries
+        ]
+
+    monkeypatch.setattr(ql, "validate_many", validate_many)
+    (error,) = config.validate_syntax(make_dumps("up == 0", "sum(", "x > 1"))
+    assert (error.module, error.group, error.rule) == ("team.rules", "team", "Rule1")
+    assert error.expr == "sum("
+    assert error.offset == 4
+    assert str(error) == (
+        "team.rules: rule 'Rule1' in group 'team' at byte 4: unexpected token"
+    )
+
+
+def test_generate_files_rejects_invalid_rules(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path
+) -> None:
+    def validate_many(queries: list[str]) -> list[ql.QuerySyntaxError | None]:
+        return [ql.QuerySyntaxError("bad", None) for _ in queries]
+
+    monkeypatch.setattr(ql, "validate_many", validate_many)
+    bundle = config.RuleBundle(name="team")
+
+    @bundle.alert()
+    def Broken() -> config.Alert:
+        return config.SimpleAlert(expr=ql.Selector().up == 0)
+
+    project = config.HeraclesProject()
+    project.rules_bundles["team.rules"].append(bundle)
+
+    with pytest.raises(config.InvalidRulesError) as e:
+        project.generate_files(tmp_path)
+    assert [err.rule for err in e.value.errors] == ["Broken"]
+    assert not list(tmp_path.iterdir())
+
+    assert project.generate_files(tmp_path, validate=False) == [
+        tmp_path / "team.rules.rules.yml"
+    ]
+
+
+@requires_validator
+def test_validate_many() -> None:
+    valid, invalid = ql.validate_many(["sum(rate(x[5m])) by (a)", "sum(rate(x[5m]) +"])
+    assert valid is None
+    assert invalid is not None
+    assert invalid.message
+    if invalid.offset is not None:
+        assert 0 <= invalid.offset <= len("sum(rate(x[5m]) +")
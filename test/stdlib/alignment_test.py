@@ -0,0 +1,65 @@
+import pytest
+
+from heracles import ql
+
+v = ql.Selector()
+rate = ql.rate(v.x[5 * ql.Minute])
+
+
+@pytest.mark.parametrize(
+    "expr,expected",
+    [
+        (
+            ql.max_over_time(rate[1 * ql.Hour : None]),
+            "max_over_time((rate(x{}[5m]))[1h:1m])",
+        ),
+        (
+            ql.max_over_time(rate[90 * ql.Second : None]),
+            "max_over_time((rate(x{}[5m]))[2m:1m])",
+        ),
+        # explicit steps are kept, and lookbacks are aligned to them
+        (
+            ql.max_over_time(rate[7 * ql.Minute : 5 * ql.Minute]),
+            "max_over_time((rate(x{}[5m]))[10m:5m])",
+        ),
+        # offsets are left alone, since changing them changes the query
+        (
+            ql.max_over_time(rate[1 * ql.Hour : None].offset(100 * ql.Second)),
+            "max_over_time(((rate(x{}[5m]))[1h:1m] offset 1m40s))",
+        ),
+        (rate.offset(100 * ql.Second), "(rate(x{}[5m]) offset 1m40s)"),
+        (
+            ql.max_over_time(rate[10 * ql.I : None]),
+            "max_over_time((rate(x{}[5m]))[10i:])",
+        ),
+    ],
+)
+def test_align_subqueries(expr: ql.Timeseries, expected: str) -> None:
+    assert ql.align_subqueries(expr, ql.Minute).render() == expected
+
+
+def test_align_subqueries_keeps_aligned_expressions() -> None:
+    expr = ql.max_over_time(rate[1 * ql.Hour : 1 * ql.Minute]) > 1
+    assert ql.align_subqueries(expr, ql.Minute) is expr
+    assert ql.misaligned_subqueries(expr, ql.Minute) == []
+
+
+def test_misaligned_subqueries() -> None:
+    expr = ql.max_over_time(rate[1 * ql.Hour : None]) + ql.max_over_time(
+        rate[1 * ql.Hour : 45 * ql.Second]
+    )
+    no_step, bad_step = ql.misaligned_subqueries(expr, ql.Minute)
+    assert "no step" in no_step.reason
+    assert "45s isn't a multiple" in bad_step.reason
+    # an explicit step is never changed, so it's still reported after alignment
+    (warning,) = ql.misaligned_subqueries(
+        ql.align_subqueries(expr, ql.Minute), ql.Minute
+    )
+    assert warning.node.render() == bad_step.node.render()
+
+
+def test_misaligned_offsets_are_only_reported() -> None:
+    expr = ql.max_over_time(rate[1 * ql.Hour : ql.Minute].offset(100 * ql.Second))
+    assert ql.align_subqueries(expr, ql.Minute) is expr
+    (warning,) = ql.misaligned_subqueries(expr, ql.Minute)
+    assert "offset 1m40s isn't a multiple" in warning.reason
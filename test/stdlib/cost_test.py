@@ -0,0 +1,41 @@
+import pytest
+
+from heracles import ql
+
+v = ql.Selector()
+
+
+@pytest.mark.parametrize(
+    "cheaper,costlier",
+    [
+        (v.x, v.x(job=ql.RE("api|web"))),
+        (v.x(job=ql.RE("api.*")), v.x(job=ql.RE(".*api"))),
+        (ql.rate(v.x[5 * ql.Minute]), ql.rate(v.x[1 * ql.Hour])),
+        (
+            ql.max_over_time(v.x[5 * ql.Minute]),
+            ql.quantile_over_time(0.9, v.x[5 * ql.Minute]),
+        ),
+        (
+            ql.max_over_time(ql.rate(v.x[5 * ql.Minute])[1 * ql.Hour : 5 * ql.Minute]),
+            ql.max_over_time(ql.rate(v.x[5 * ql.Minute])[1 * ql.Hour : 1 * ql.Minute]),
+        ),
+    ],
+)
+def test_cost_ordering(cheaper: ql.Timeseries, costlier: ql.Timeseries) -> None:
+    assert ql.estimate_cost(cheaper) < ql.estimate_cost(costlier)
+
+
+def test_cost_model() -> None:
+    rate = ql.rate(v.x[5 * ql.Minute])
+    # 20 samples at the default 15s scrape interval, plus the function
+    assert ql.estimate_cost(rate) == 21
+    model = ql.CostModel(scrape_interval=30 * ql.Second)
+    assert ql.estimate_cost(rate, model) == 11
+
+    # the subquery evaluates rate once per minute of its hour
+    nested = ql.max_over_time(rate[1 * ql.Hour : 1 * ql.Minute])
+    assert ql.estimate_cost(nested) == 1 + 60 * 21
+    # without a resolution, the subquery steps at the evaluation interval
+    nested = ql.max_over_time(rate[1 * ql.Hour : None])
+    model = ql.CostModel(evaluation_interval=5 * ql.Minute)
+    assert ql.estimate_cost(nested, model) == 1 + 12 * 21
@@ -0,0 +1,61 @@
+import sys
+
+from heracles import ql
+
+v = ql.Selector()
+
+
+def build(
+    threshold: float = 0.05, window: ql.Duration = 5 * ql.Minute
+) -> ql.InstantVector:
+    errors = ql.sum(ql.rate(v.errors_total(job="api")[window])).by("instance")
+    requests = ql.sum(ql.rate(v.requests_total(job="api")[5 * ql.Minute])).by(
+        "instance"
+    )
+    return errors / requests > threshold
+
+
+def test_diff_of_equal_trees() -> None:
+    assert ql.diff(build(), build()) == []
+
+
+def test_diff_updates() -> None:
+    old = build()
+    new = build(threshold=0.1)
+    (edit,) = ql.diff(old, new)
+    # only the literal changed, not the comparison or the ratio
+    assert edit.kind == ql.EditKind.update
+    assert edit.path == (1,)
+    assert edit.old.render() == "0.05"
+    assert edit.new.render() == "0.1"
+
+    (edit,) = ql.diff(build(), build(window=10 * ql.Minute))
+    assert edit.kind == ql.EditKind.update
+    assert isinstance(edit.new, ql.SelectedRangeVector)
+    assert edit.path == (0, 0, 0, 0)
+
+
+def test_diff_replacements() -> None:
+    old = ql.abs(v.a) + v.b
+    new = ql.abs(v.a) + ql.abs(v.b)
+    (edit,) = ql.diff(old, new)
+    assert edit.kind == ql.EditKind.replace
+    assert edit.path == (1,)
+
+    edits = ql.diff((v.a + v.b).on("x"), (v.c + v.b).on("y"))
+    assert [(e.kind, e.path) for e in edits] == [
+        (ql.EditKind.update, ()),
+        (ql.EditKind.update, (0,)),
+    ]
+    assert str(edits[1]) == "update at [0]: a{} -> c{}"
+
+
+def test_diff_of_deep_trees() -> None:
+    def chain(last: str) -> ql.InstantVector:
+        expr: ql.InstantVector = v.base
+        for i in range(5 * sys.getrecursionlimit()):
+            expr = expr.or_(v.get(f"m{i}"))
+        return expr.or_(v.get(last))
+
+    (edit,) = ql.diff(chain("x"), chain("y"))
+    assert edit.path == (1,)
@@ -0,0 +1,32 @@
+import pytest
+
+from heracles import ql
+
+
+@pytest.mark.parametrize(
+    ["duration", "result"],
+    [
+        (5 * ql.Minute, "5m"),
+        (ql.Minute * 5.0, "5m"),
+        (1.5 * ql.Minute, "1m30s"),
+        (ql.Day + ql.Second + ql.Millisecond, "1d1s1ms"),
+        (ql.Minute / 7, "8s571ms"),
+        (-1 * ql.Minute, "-1m"),
+        (ql.Hour + 2 * ql.I, "1h2i"),
+        (ql.I / 2, "0.5i"),
+        (0 * ql.Second, "0ms"),
+    ],
+)
+def test_duration_render(duration: ql.Duration, result: str) -> None:
+    assert duration.render() == result
+
+
+def test_duration_values() -> None:
+    d = 5 * ql.Minute
+    assert d.time_value == 300_000
+    assert isinstance((d * 1.0).time_value, int)
+    assert d == ql.Minute * 5
+    assert len({d, ql.Minute * 5, 300 * ql.Second}) == 1
+    assert d != d + ql.I
+    with pytest.raises(AttributeError):
+        d.time_value = 1  # type: ignore[misc]
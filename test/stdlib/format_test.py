@@ -0,0 +1,88 @@
+import json
+import pathlib
+
+from heracles import ql
+
+QUERIES = [
+    "sum(rate(x[5m])) by (a)>1",
+    "",
+    'up{job="api",env=~"prod|staging"} == 0',
+    "sum(rate(",
+    'é{label="ü"} * 2',
+]
+
+
+def test_format_many_matches_format() -> None:
+    assert ql.format_many(QUERIES) == [ql.format(q) for q in QUERIES]
+    assert ql.format_many([]) == []
+
+
+def test_format_many_large_batch() -> None:
+    queries = [f'x{{i="{i}"}} * {i}' for i in range(2_000)]
+    assert ql.format_many(queries) == [ql.format(q) for q in queries]
+
+
+def test_format_cache_hits_and_eviction() -> None:
+    cache = ql.FormatCache(maxsize=2)
+    previous = ql.get_format_cache()
+    ql.set_format_cache(cache)
+    try:
+        first = ql.format("a+b")
+        assert ql.format("a+b") == first
+        assert cache.info() == ql.FormatCacheInfo(1, 1, 2, 1)
+
+        ql.format_many(["c", "d", "c"])
+        assert cache.info() == ql.FormatCacheInfo(1, 4, 2, 2)
+
+        # a+b was the least recently used entry, so it was evicted
+        ql.format("a+b")
+        assert cache.info().misses == 5
+
+        cache.clear()
+        assert cache.info() == ql.FormatCacheInfo(0, 0, 2, 0)
+    finally:
+        ql.set_format_cache(previous)
+
+
+def test_format_cache_disabled() -> None:
+    previous = ql.get_format_cache()
+    ql.set_format_cache(None)
+    try:
+        assert ql.format_many(QUERIES) == [ql.format(q) for q in QUERIES]
+    finally:
+        ql.set_format_cache(previous)
+
+
+def test_format_cache_persists(tmp_path: pathlib.Path) -> None:
+    path = tmp_path / "format-cache.json"
+    cache = ql.FormatCache(path=path)
+    previous = ql.get_format_cache()
+    ql.set_format_cache(cache)
+    try:
+        expected = ql.format_many(QUERIES)
+        cache.save()
+
+        loaded = ql.FormatCache(path=path)
+        assert loaded.info().currsize == len(QUERIES)
+        ql.set_format_cache(loaded)
+        assert ql.format_many(QUERIES) == expected
+        assert loaded.info().misses == 0
+
+        # results from another build of the formatter aren't reused
+        path.write_text('{"version": "other", "entries": [["x", "y"]]}')
+        assert ql.FormatCache(path=path).info().currsize == 0
+    finally:
+        ql.set_format_cache(previous)
+
+
+def test_format_cache_ignores_malformed_entries(tmp_path: pathlib.Path) -> None:
+    path = tmp_path / "format-cache.json"
+    cache = ql.FormatCache(path=path)
+    cache._set("up", "up")
+    cache.save()
+    saved = json.loads(path.read_text())
+    assert ql.FormatCache(path=path).info().currsize == 1
+
+    for entries in [{"up": "up"}, [["up"]], [["up", "up", "up"]], [[1, "up"]], [3]]:
+        path.write_text(json.dumps({**saved, "entries": entries}))
+        assert ql.FormatCache(path=path).info().currsize == 0
@@ -0,0 +1,149 @@
+import pickle
+import sys
+from collections.abc import Iterable
+
+import pytest
+
+from heracles import ql
+
+v = ql.Selector()
+
+
+def build() -> ql.InstantVector:
+    errors = ql.rate(v.errors_total(job="api", code=ql.RE("5.."))[5 * ql.Minute])
+    requests = ql.rate(v.requests_total(job="api")[5 * ql.Minute])
+    ratio = ql.sum(errors).by("instance") / ql.sum(requests).without("code")
+    return (
+        (ratio > 0.05)
+        .and_(ql.absent(v.up @ 100))
+        .on("job")
+        .group_left("team")
+        .or_(
+            ql.histogram_quantile(
+                0.99, ql.sum(ql.rate(v.latency_bucket[5 * ql.Minute])).by("le")
+            )
+        )
+        .or_(ql.max_over_time(ql.rate(v.up[ql.Minute])[ql.Hour : 10 * ql.Second]))
+        .or_(ql.UnaryOp(v.down, ql.UnopKind.neg))
+        .offset(ql.Hour)
+    )
+
+
+def test_ir_round_trip() -> None:
+    expr = build()
+    ir = ql.ExprIR.compile(expr)
+    rebuilt = ir.to_timeseries()
+
+    assert rebuilt is not expr
+    assert rebuilt.structurally_equal(expr)
+    assert rebuilt.render() == expr.render()
+    assert ir.render() == expr.render()
+
+
+def test_ir_shares_subtrees() -> None:
+    shared = ql.rate(v.requests_total(job="api")[5 * ql.Minute])
+    expr = (shared + shared) / shared
+    ir = ql.ExprIR.compile(expr)
+
+    # selector, range vector, rate, +, /
+    assert len(ir) == 5
+    assert list(ir.indices_of(ql.BuiltinFunc)) == [2]
+    assert ir.children(ir.root) == [3, 2]
+
+    rebuilt = ir.to_timeseries()
+    assert isinstance(rebuilt, ql.BinaryOp)
+    assert rebuilt.right is rebuilt.left.left is rebuilt.left.right
+
+
+def test_ir_fields_and_constants() -> None:
+    ir = ql.ExprIR.compile(ql.sum(v.a(x="1") + 1.0).by("x") + 1)
+    (selector,) = ir.indices_of(ql.SelectedInstantVector)
+    assert ir.fields(selector) == {"name": "a", "_selectors": {"x": "1"}}
+
+    (aggr,) = ir.indices_of(ql.FinalizedAggrFunc)
+    fields = ir.fields(aggr)
+    assert fields["name"] == "sum"
+    (arg,) = fields["args"]
+    assert isinstance(arg, ql.NodeRef)
+    assert ir.node_type(arg.index) is ql.BinaryOp
+
+    # "x", 1.0 and the label tuple are each stored once
+    assert len(ir.consts) == len(set(map(repr, ir.consts)))
+
+
+def test_ir_preserves_annotations() -> None:
+    def note(t: ql.Timeseries) -> ql.Annotation[ql.Timeseries]:
+        return ql.Annotation(t)
+
+    expr = ql.abs(v.a.annotate(note))
+    rebuilt = ql.ExprIR.compile(expr).to_timeseries()
+    assert isinstance(rebuilt, ql.BuiltinFunc)
+    assert rebuilt.args[0].is_annotated()
+    assert rebuilt.structurally_equal(expr)
+
+
+def test_ir_deep_trees() -> None:
+    expr: ql.InstantVector = v.base
+    for i in range(5 * sys.getrecursionlimit()):
+        expr = expr.or_(v.get(f"m{i}"))
+    ir = ql.ExprIR.compile(expr)
+    assert ir.render() == expr.render()
+    assert ir.to_timeseries().structurally_equal(expr)
+
+
+def test_ir_pickles() -> None:
+    expr = build()
+    ir = pickle.loads(pickle.dumps(ql.ExprIR.compile(expr)))
+    assert ir.render() == expr.render()
+
+
+def test_ir_renders_without_building_nodes(monkeypatch: pytest.MonkeyPatch) -> None:
+    expr = build()
+    ir = ql.ExprIR.compile(expr)
+
+    def fail(self: ql.ExprIR, i: int, child: object) -> ql.Timeseries:
+        raise AssertionError(f"built node {i}")
+
+    monkeypatch.setattr(ql.ExprIR, "_build", fail)
+    assert ir.render() == expr.render()
+
+
+def test_ir_renders_types_without_templates() -> None:
+    class Shouty(ql.BuiltinFunc):
+        def _render_parts(self) -> Iterable[str | ql.Timeseries]:
+            return ("SHOUT(", *self.args, ")")
+
+    expr = ql.abs(Shouty("shout", v.a))
+    assert ql.ExprIR.compile(expr).render() == "abs(SHOUT(a{}))"
+
+
+def test_ir_visitor() -> None:
+    class Visitor(ql.ExprIRVisitor):
+        def __init__(self) -> None:
+            self.seen: list[str] = []
+
+        def visit_builtin_function(self, ir: ql.ExprIR, i: int) -> None:
+            self.seen.append(ir.fields(i)["name"])
+
+        def visit_selected_instant_vector(
+            self, ir: ql.ExprIR, i: int
+        ) -> ql.VisitorAction | None:
+            self.seen.append(ir.fields(i)["name"])
+            if ir.fields(i)["name"] == "stop":
+                return ql.VisitorAction.STOP
+            return None
+
+        def visit_at_op(self, ir: ql.ExprIR, i: int) -> ql.VisitorAction:
+            return ql.VisitorAction.CONTINUE
+
+    # aggregations fall back to visit_builtin_function
+    expr = ql.sum(ql.rate(v.a[ql.Minute])).by("x") + ql.abs(v.b @ 1) + v.c
+    visitor = Visitor()
+    ir = ql.ExprIR.compile(expr)
+    assert ir.accept_visitor(visitor) == ql.VisitorAction.RECURSE
+    assert visitor.seen == ["sum", "rate", "a", "abs", "c"]
+
+    visitor = Visitor()
+    ir = ql.ExprIR.compile(v.a + v.stop + v.c)
+    assert ir.accept_visitor(visitor) == ql.VisitorAction.STOP
+    assert visitor.seen == ["a", "stop"]
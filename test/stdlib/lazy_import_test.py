@@ -0,0 +1,61 @@
+import ast
+import importlib
+import pathlib
+import subprocess
+import sys
+
+from heracles import ql
+from heracles.ql import _func_names, funcs
+
+
+def test_func_names_match_funcs() -> None:
+    assert ql.func_names() == set(funcs.__all__)
+    assert list(_func_names.FUNC_NAMES) == funcs.__all__
+
+
+def test_lazy_names_match_modules() -> None:
+    # __init__.pyi doesn't declare the table, since it imports every module
+    for module, names in vars(ql)["_LAZY_MODULES"].items():
+        assert importlib.import_module(f"heracles.ql.{module}").__all__ == list(names)
+
+
+def test_lazy_functions_resolve() -> None:
+    assert ql.rate is funcs.rate
+    assert ql.funcs is funcs
+    assert "sum" in dir(ql)
+    # the stub has no __all__ of its own, so type checkers don't see this one
+    all_ = set(vars(ql)["__all__"])
+    assert {"rate", "funcs", "format", "Selector"} <= all_
+    assert not {"Any", "annotations", "importlib", "prelude"} & all_
+
+    namespace: dict[str, object] = {}
+    exec("from heracles.ql import *", namespace)
+    assert namespace["histogram_quantile"] is funcs.histogram_quantile
+
+
+def test_import_is_lazy() -> None:
+    code = (
+        "import sys, heracles.ql; "
+        "print(sorted({'heracles.ql.funcs', 'heracles.ql.registry', "
+        "'heracles.ql._func_table', 'heracles.ql.ir', 'heracles.ql.parsing', "
+        "'ctypes'} & set(sys.modules)))"
+    )
+    res = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert res.stdout.strip() == "[]"
+
+
+def test_all_matches_stub() -> None:
+    stub = ast.parse(pathlib.Path(ql.__file__).with_suffix(".pyi").read_text())
+    exported: set[str] = set()
+    for stmt in stub.body:
+        assert isinstance(stmt, ast.ImportFrom) and stmt.module is not None
+        for alias in stmt.names:
+            if alias.name == "*":
+                exported.update(importlib.import_module(stmt.module).__all__)
+            else:
+                exported.add(alias.asname or alias.name)
+    all_ = vars(ql)["__all__"]
+    assert len(all_) == len(set(all_))
+    assert set(all_) == exported
@@ -0,0 +1,53 @@
+import pytest
+
+from heracles import ql
+
+v = ql.Selector()
+
+
+@pytest.mark.parametrize(
+    "expr,expected",
+    [
+        (v.x(job=ql.RE("api")), 'x{job="api"}'),
+        (v.x(job=ql.NR("api")), 'x{job!="api"}'),
+        (v.x(job=ql.RE("b|a|a")), 'x{job=~"a|b"}'),
+        (v.x(job=ql.RE(r"a\.b|c")), r'x{job=~"a\\.b|c"}'),
+        (v.x(job=("a", ql.EQ("a"))), 'x{job="a"}'),
+        (v.x(job=(ql.RE("a|b|c"), ql.RE("c|b|d"))), 'x{job=~"b|c"}'),
+        (v.x(job=(ql.RE("a|b"), ql.NE("a"))), 'x{job="b"}'),
+        (v.x(job=("a", ql.RE("a|b"), ql.NE("c"))), 'x{job="a"}'),
+        (v.x(job=(ql.NE("b"), ql.NR("c|a"), ql.NE(""))), 'x{job!="",job!~"a|b|c"}'),
+        (v.x(job=(ql.NR("a.*"), "a")), 'x{job="a",job!~"a.*"}'),
+        # matchers which never match together are kept
+        (v.x(job=("b", "a")), 'x{job="a",job="b"}'),
+        (v.x(job=("a", ql.NE("a"))), 'x{job="a",job!="a"}'),
+        # regexes which aren't literals are left alone
+        (v.x(job=ql.RE("api-.*")), 'x{job=~"api-.*"}'),
+        (v.x(job=ql.RE(r"\d+|a")), r'x{job=~"\\d+|a"}'),
+    ],
+)
+def test_normalize_matchers(expr: ql.InstantVector, expected: str) -> None:
+    assert ql.normalize_matchers(expr).render() == expected
+
+
+def test_normalize_matchers_keeps_normalized_selectors() -> None:
+    expr = ql.rate(v.x(job="a", instance=ql.RE("a|b"))[5 * ql.Minute])
+    assert ql.normalize_matchers(expr) is expr
+
+    normalized = ql.normalize_matchers(ql.sum(expr) / v.y(job=ql.RE("a")))
+    assert (
+        normalized.render()
+        == '(sum(rate(x{job="a",instance=~"a|b"}[5m])) / y{job="a"})'
+    )
+    assert isinstance(normalized, ql.BinaryOp)
+    assert normalized.left.args[0] is expr
+
+
+def test_unindexed_matchers() -> None:
+    expr = v.x(job=ql.RE(".*api"), env=ql.RE(".*")) + v.y(job=ql.RE("api.*"))
+    (warning,) = ql.unindexed_matchers(expr)
+    assert warning.label == "job"
+    assert warning.matcher.value == ".*api"
+    assert warning.selector.name == "x"
+    assert ql.unindexed_reason(".*api") == warning.reason
+    assert ql.unindexed_reason("api.*") is None
@@ -0,0 +1,60 @@
+import pytest
+
+from heracles import ql
+
+v = ql.Selector()
+
+# format is a no-op when the formatter library isn't built
+_has_formatter = ql.format("x+1") != "x+1"
+
+
+def neg(e: ql.InstantVector) -> ql.InstantVector:
+    return ql.UnaryOp(e, ql.UnopKind.neg)
+
+
+EXPRESSIONS = [
+    (((v.a + v.b) * 2) > 1.5, "(a{} + b{}) * 2 > 1.5"),
+    (v.a - (v.b - v.c), "a{} - (b{} - c{})"),
+    ((v.a - v.b) - v.c, "a{} - b{} - c{}"),
+    (v.a / (v.b * v.c), "a{} / (b{} * c{})"),
+    (v.a ** (v.b**v.c), "a{} ^ b{} ^ c{}"),
+    ((v.a**v.b) ** v.c, "(a{} ^ b{}) ^ c{}"),
+    (neg(v.a) ** 2, "(-a{}) ^ 2"),
+    (neg(v.a + v.b) * 2, "-(a{} + b{}) * 2"),
+    (v.a.and_(v.b > 1).or_(v.c), "a{} and b{} > 1 or c{}"),
+    (v.a.or_(v.b.and_(v.c)), "a{} or b{} and c{}"),
+    (v.a.unless(v.b).and_(v.c), "a{} unless b{} and c{}"),
+    (v.a.and_(v.b.unless(v.c)), "a{} and (b{} unless c{})"),
+    (
+        ((v.a + v.b).on("x").group_left("y") * 3) + v.c.atan2(v.d),
+        "(a{} + on (x) group_left(y) b{}) * 3 + c{} atan2 d{}",
+    ),
+    (ql.sum(v.a + v.b).by("x") / 60, "sum(a{} + b{}) by (x) / 60"),
+    ((v.a + v.b).offset(ql.Day) * 2, "((a{} + b{}) offset 1d) * 2"),
+    (
+        ql.max_over_time((v.a + v.b)[1 * ql.Hour : ql.Minute]),
+        "max_over_time((a{} + b{})[1h:1m])",
+    ),
+    (ql.ScalarLiteral(1e-7) + ql.ScalarLiteral(1e20) + 0.25, "1e-07 + 1e+20 + 0.25"),
+]
+
+
+@pytest.mark.parametrize("expr,expected", EXPRESSIONS)
+def test_render_minimal(expr: ql.InstantVector, expected: str) -> None:
+    assert ql.render_minimal(expr) == expected
+
+
+@pytest.mark.parametrize(
+    "v,expected",
+    [(5.0, "5"), (-2.0, "-2"), (0.0, "0"), (-0.0, "-0"), (0.1, "0.1"), (1e16, "1e+16")],
+)
+def test_format_number(v: float, expected: str) -> None:
+    assert ql.format_number(v) == expected
+    assert float(expected) == v
+
+
+@pytest.mark.skipif(not _has_formatter, reason="formatter library isn't built")
+@pytest.mark.parametrize("expr,expected", EXPRESSIONS)
+def test_render_minimal_round_trip(expr: ql.InstantVector, expected: str) -> None:
+    # the formatter parses the query, so equal output means equal queries
+    assert ql.format(ql.render_minimal(expr)) == ql.format(expr.render())
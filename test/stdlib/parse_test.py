@@ -0,0 +1,151 @@
+import struct
+
+import pytest
+
+from heracles import ql
+from heracles.ql import _native, parsing
+
+_has_parser = _native.buffer_func("Parse") is not None
+
+requires_parser = pytest.mark.skipif(
+    not _has_parser, reason="formatter library with Parse isn't available"
+)
+
+
+def _string(s: str) -> bytes:
+    encoded = s.encode()
+    return struct.pack("<I", len(encoded)) + encoded
+
+
+def _selector(*filters: tuple[str, int, str]) -> bytes:
+    out = bytes([parsing._TAG_SELECTOR]) + struct.pack("<I", len(filters))
+    for label, kind, value in filters:
+        out += _string(label) + bytes([kind]) + _string(value)
+    return out
+
+
+def _duration(millis: int, steps: float = 0) -> bytes:
+    return struct.pack("<qd", millis, steps)
+
+
+def _number(v: float) -> bytes:
+    return bytes([parsing._TAG_NUMBER]) + struct.pack("<d", v)
+
+
+def _modifier(op: str = "", *labels: str) -> bytes:
+    return _string(op) + struct.pack("<I", len(labels)) + b"".join(map(_string, labels))
+
+
+def _decode(data: bytes) -> ql.Timeseries:
+    return parsing._decode("query", data, 0)
+
+
+def test_decode_selector() -> None:
+    res = _decode(
+        _selector(("__name__", 0, "up"), ("job", 1, "api|web"), ("name", 2, "x"))
+    )
+    assert res.render() == 'up{job=~"api|web",name!="x"}'
+
+
+def test_decode_repeated_label() -> None:
+    res = _decode(_selector(("a", 2, "x"), ("a", 2, "y"), ("a", 3, "z")))
+    assert res.render() == '{a!="x",a!="y",a!~"z"}'
+
+
+def test_decode_rollup_and_aggregation() -> None:
+    data = (
+        _selector(("__name__", 0, "x"))
+        + bytes([parsing._TAG_ROLLUP, parsing._ROLLUP_WINDOW])
+        + _duration(5 * 60_000)
+        + bytes([parsing._TAG_FUNC, 1])
+        + _string("rate")
+        + struct.pack("<I", 1)
+        + bytes([parsing._TAG_AGGR])
+        + _string("sum")
+        + _modifier("by", "a")
+        + struct.pack("<I", 1)
+        + _number(1)
+        + bytes([parsing._TAG_BINARY_OP])
+        + _string(">")
+        + _modifier()
+        + _modifier()
+    )
+    res = _decode(data)
+    v = ql.Selector()
+    expected = ql.sum(ql.rate(v.x[5 * ql.Minute])).by("a") > 1
+    assert ql.StructuralKey(res) == ql.StructuralKey(expected)
+
+
+def test_decode_subquery_with_offset() -> None:
+    data = (
+        _selector(("__name__", 0, "x"))
+        + bytes(
+            [
+                parsing._TAG_ROLLUP,
+                parsing._ROLLUP_WINDOW | parsing._ROLLUP_STEP | parsing._ROLLUP_OFFSET,
+            ]
+        )
+        + _duration(3_600_000)
+        + _duration(0, 1)
+        + _duration(-60_000)
+    )
+    res = _decode(data)
+    assert isinstance(res, ql.OffsetRangeVector)
+    assert res.render() == "((x{})[1h:1i] offset -1m)"
+
+
+def test_decode_rejects_unsupported_operator() -> None:
+    data = (
+        _number(1)
+        + _number(2)
+        + bytes([parsing._TAG_BINARY_OP])
+        + _string("default")
+        + _modifier()
+        + _modifier()
+    )
+    with pytest.raises(ql.ParseError, match="default"):
+        _decode(data)
+
+
+def test_decode_rejects_malformed_input() -> None:
+    with pytest.raises(ql.ParseError):
+        _decode(_number(1) + _number(2))
+    with pytest.raises(ql.ParseError):
+        _decode(bytes([parsing._TAG_SELECTOR]) + struct.pack("<I", 1))
+    with pytest.raises(ql.ParseError):
+        _decode(bytes([99]))
+
+
+@requires_parser
+@pytest.mark.parametrize(
+    "query",
+    [
+        'sum(rate(http_requests_total{job="api"}[5m])) by (code) > 1',
+        "histogram_quantile(0.99, sum(rate(x_bucket[5m])) without (pod))",
+        "max_over_time(deriv(x[1h])[1d:5m] offset 1h)",
+        'label_replace(up, "dst", "$1", "src", "(.*)")',
+        "a / on (job) group_left (team) b",
+        "-x ^ 2 or vector(0)",
+        "rate(x[5m] @ end())",
+    ],
+)
+def test_parse_round_trip(query: str) -> None:
+    parsed = ql.parse(query)
+    # heracles renders the query differently, but it must parse back to the same
+    # expression
+    assert ql.StructuralKey(ql.parse(parsed.render())) == ql.StructuralKey(parsed)
+
+
+@requires_parser
+def test_parse_expands_templates() -> None:
+    parsed = ql.parse("WITH (t = sum(x) by (a)) t / t")
+    assert parsed.render() == ql.parse("sum(x) by (a) / sum(x) by (a)").render()
+
+
+@requires_parser
+@pytest.mark.parametrize(
+    "query", ["sum(rate(", "a > bool b", "sum(x) limit 5", "rate(x) keep_metric_names"]
+)
+def test_parse_errors(query: str) -> None:
+    with pytest.raises(ql.ParseError):
+        ql.parse(query)
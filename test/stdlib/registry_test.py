@@ -0,0 +1,101 @@
+import ast
+import inspect
+import pathlib
+
+import pytest
+
+from heracles import ql
+from heracles.ql import funcs
+
+
+def test_every_function_has_a_spec() -> None:
+    for name in funcs.__all__:
+        spec = ql.func_spec(name)
+        assert spec is not None, name
+        assert spec.name == name
+        assert sum(p.variadic for p in spec.params) <= 1
+    assert ql.func_spec("not_a_function") is None
+
+
+def test_builders_build_spec_node_type() -> None:
+    for spec in ql.func_specs():
+        if spec.params or spec.name not in funcs.generated.__dict__:
+            continue
+        node = getattr(funcs, spec.name)()
+        assert type(node) is spec.node_type
+        assert node.name == spec.name
+
+    v = ql.Selector().x
+    assert ql.func_spec("rate") == ql.FuncSpec(
+        "rate",
+        ql.RollupFunc,
+        (ql.FuncParam("vector", ql.ParamKind.range),),
+        ql.CostClass.linear,
+    )
+    pairs = [
+        (funcs.rate(v[5 * ql.Minute]), ql.RollupFunc("rate", v[5 * ql.Minute])),
+        (funcs.clamp(v, 0, 1), ql.TransformFunc("clamp", v, 0, 1)),
+        (funcs.sum(v, v), ql.AggrFunc("sum", v, v)),
+        (
+            funcs.label_del(v, "a", "b"),
+            ql.LabelManipulationFunc("label_del", v, "a", "b"),
+        ),
+    ]
+    for built, expected in pairs:
+        assert built.structural_key() == expected.structural_key()
+
+
+def test_builder_arguments() -> None:
+    v = ql.Selector().x
+    assert (
+        funcs.clamp(v, min=0, max=1).structural_key()
+        == funcs.clamp(v, 0, 1).structural_key()
+    )
+    assert funcs.topk.__name__ == "topk"
+
+    with pytest.raises(TypeError, match=r"clamp\(\) takes 3 arguments \(2 given\)"):
+        funcs.clamp(v, 0)  # type: ignore[call-arg]
+    with pytest.raises(TypeError, match=r"label_del\(\) takes at least 1"):
+        funcs.label_del()  # type: ignore[call-arg]
+    with pytest.raises(TypeError, match="unexpected keyword arguments: maximum"):
+        funcs.clamp(v, 0, maximum=1)  # type: ignore[call-arg]
+
+
+def test_sorting_functions_are_weighted() -> None:
+    model = ql.CostModel()
+    for spec in ql.func_specs():
+        expected = 4.0 if spec.cost_class is ql.CostClass.sorting else None
+        assert model.function_weights.get(spec.name) == expected
+
+
+def test_builder_signatures_match_stub() -> None:
+    assert str(inspect.signature(ql.rate)) == (
+        "(vector: 'prelude.RangeVector') -> 'prelude.RollupFunc'"
+    )
+
+    stub_path = pathlib.Path(funcs.generated.__file__).with_suffix(".pyi")
+    for stmt in ast.parse(stub_path.read_text()).body:
+        if not isinstance(stmt, ast.FunctionDef):
+            continue
+        args = stmt.args
+        expected: list[tuple[str, inspect._ParameterKind, ast.expr | None]] = [
+            (a.arg, inspect.Parameter.POSITIONAL_OR_KEYWORD, a.annotation)
+            for a in args.args
+        ]
+        if args.vararg is not None:
+            vararg = args.vararg
+            expected.append(
+                (vararg.arg, inspect.Parameter.VAR_POSITIONAL, vararg.annotation)
+            )
+        builder = getattr(funcs, stmt.name)
+        sig = inspect.signature(builder)
+        params = [(p.name, p.kind, p.annotation) for p in sig.parameters.values()]
+        assert params == [
+            (name, kind, ast.unparse(a)) for name, kind, a in expected if a
+        ], stmt.name
+        assert stmt.returns is not None
+        assert sig.return_annotation == ast.unparse(stmt.returns)
+        assert builder.__annotations__ == {
+            **{name: annotation for name, _, annotation in params},
+            "return": sig.return_annotation,
+        }
@@ -0,0 +1,60 @@
+import io
+
+from heracles import ql
+
+
+def test_render_cache_is_invalidated_by_copies() -> None:
+    left = ql.SelectedInstantVector(name="left")
+    right = ql.SelectedInstantVector(name="right")
+    op = left * right
+    assert op.render() == "(left{} * right{})"
+
+    on = op.on("hostname")
+    assert on.render() == "(left{} * on (hostname) right{})"
+    # the original must be unaffected by on(), including its cached render
+    assert op.render() == "(left{} * right{})"
+    assert op.on_labels == []
+
+    grouped = on.group_left("colo")
+    assert grouped.render() == "(left{} * on (hostname) group_left(colo) right{})"
+    assert on.render() == "(left{} * on (hostname) right{})"
+
+    selected = left(instance="foo")
+    assert selected.render() == 'left{instance="foo"}'
+    assert left.render() == "left{}"
+
+
+def test_shared_subtrees_render_once() -> None:
+    shared = ql.rate(ql.SelectedInstantVector(name="requests")[5 * ql.Minute])
+    first = shared * 2
+    second = shared + 1
+    assert first.render() == "(rate(requests{}[5m]) * 2.0)"
+    assert second.render() == "(rate(requests{}[5m]) + 1.0)"
+    assert shared._rendered == "rate(requests{}[5m])"
+
+
+def test_render_into_writers() -> None:
+    def build() -> ql.InstantVector:
+        return ql.sum(
+            ql.rate(ql.SelectedInstantVector(name="requests")(code="500")[ql.Minute])
+        ).by("instance") / ql.SelectedInstantVector(name="limit")
+
+    expected = build().render()
+
+    streamed = build()
+    out = io.StringIO()
+    streamed.render_into(out)
+    assert out.getvalue() == expected
+    # streaming writes pieces directly to the writer and doesn't fill caches
+    assert streamed._rendered is None
+
+    buffered = build()
+    buffer = ql.RenderBuffer()
+    buffer.write("expr: ")
+    buffered.render_into(buffer)
+    assert buffer.getvalue() == "expr: " + expected
+    assert buffered._rendered == expected
+
+    out = io.StringIO()
+    (5 * ql.Minute).render_into(out)
+    assert out.getvalue() == "5m"
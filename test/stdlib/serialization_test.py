@@ -0,0 +1,107 @@
+import pickle
+import sys
+
+import pytest
+
+from heracles import ql
+from heracles.lib import identity
+from heracles.ql import annotation, assertions, serialization
+
+v = ql.Selector()
+
+
+def build() -> ql.InstantVector:
+    errors = ql.rate(v.errors_total(job="api", code=ql.RE("5.."))[5 * ql.Minute])
+    requests = ql.rate(v.must.requests_total(job="api")[5 * ql.Minute])
+    ratio = ql.sum(errors).by("instance") / identity.reduce(requests, to=["instance"])
+    return (
+        (ratio > 0.05)
+        .and_(ql.absent(v.up @ 100))
+        .on("job")
+        .group_left("team")
+        .or_(
+            ql.histogram_quantile(
+                0.99, ql.sum(ql.rate(v.latency_bucket[5 * ql.Minute])).by("le")
+            )
+        )
+        .or_(ql.max_over_time(ql.rate(v.up[ql.Minute])[ql.Hour : 10 * ql.Second]))
+        .or_(ql.UnaryOp(v.down, ql.UnopKind.neg))
+        .offset(ql.Hour + 2 * ql.I)
+    )
+
+
+def test_round_trip() -> None:
+    expr = build()
+    data = expr.dumps()
+    loaded = ql.Timeseries.loads(data)
+
+    assert loaded.structurally_equal(expr)
+    assert loaded.render() == expr.render()
+
+    annotated = [
+        a.assertion().render()
+        for node in (expr, loaded)
+        for a in _all_annotations(node)
+    ]
+    half = len(annotated) // 2
+    assert half == 2
+    assert annotated[:half] == annotated[half:]
+
+
+def _all_annotations(expr: ql.Timeseries) -> list[annotation.AssertionAnnotation]:
+    found: list[annotation.AssertionAnnotation] = []
+
+    def visit(t: ql.Timeseries) -> None:
+        found.extend(
+            a for a in t.annotations if isinstance(a, annotation.AssertionAnnotation)
+        )
+
+    expr.accept_visitor(visit)
+    return found
+
+
+def test_round_trip_many() -> None:
+    exprs = [build() > i for i in range(3)]
+    loaded = ql.loads_many(ql.dumps_many(exprs))
+    assert [e.render() for e in loaded] == [e.render() for e in exprs]
+
+
+def test_module_level_annotations_pickle() -> None:
+    assert pickle.loads(pickle.dumps(assertions.assert_exists)) is (
+        assertions.assert_exists
+    )
+
+
+def test_unserializable_annotations() -> None:
+    @annotation.assertion()
+    def local(vector: ql.InstantVector) -> ql.InstantVector:
+        return ql.absent(vector)
+
+    expr = ql.abs(v.a.annotate(local))
+    with pytest.raises(ValueError, match="can't be serialized"):
+        expr.dumps()
+
+    loaded = ql.Timeseries.loads(expr.dumps(drop_unserializable_annotations=True))
+    assert loaded.render() == expr.render()
+    assert not _all_annotations(loaded)
+
+
+def test_rejects_invalid_data() -> None:
+    data = ql.abs(v.a).dumps()
+    with pytest.raises(ValueError, match="not a serialized"):
+        ql.loads(b"junk" + data)
+    with pytest.raises(ValueError, match="version"):
+        ql.loads(data[:3] + bytes([255]) + data[4:])
+    with pytest.raises(ValueError, match="trailing data"):
+        ql.loads(data + b"\0")
+
+
+def test_loading_never_imports(monkeypatch: pytest.MonkeyPatch) -> None:
+    # importing this prints the Zen of Python
+    monkeypatch.delitem(sys.modules, "this", raising=False)
+    with monkeypatch.context() as m:
+        m.setattr(serialization, "_import_path", lambda obj: "this:s")
+        data = ql.abs(v.a).dumps()
+    with pytest.raises(ValueError, match="can't resolve 'this:s'"):
+        ql.loads(data)
+    assert "this" not in sys.modules
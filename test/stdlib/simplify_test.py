@@ -0,0 +1,48 @@
+import pytest
+
+from heracles import ql
+
+v = ql.Selector()
+
+
+@pytest.mark.parametrize(
+    "expr,expected",
+    [
+        (ql.ScalarLiteral(2) * 3, "6.0"),
+        ((ql.ScalarLiteral(2) * 3) + 1, "7.0"),
+        (v.x * (ql.ScalarLiteral(60) * 60), "(x{} * 3600.0)"),
+        # 1 / 0 is +Inf, which has no literal form
+        (ql.ScalarLiteral(1) / 0, "(1.0 / 0.0)"),
+        (ql.ScalarLiteral(7) % 3, "1.0"),
+        # identity operations are only removed when __name__ is dropped anyway
+        (v.x * 1, "(x{} * 1.0)"),
+        ((v.x + v.y) * 1, "(x{} + y{})"),
+        (0 + ql.sum(v.x), "sum(x{})"),
+        ((v.x / v.y) - 0, "(x{} / y{})"),
+        (1 / (v.x / v.y), "(1.0 / (x{} / y{}))"),
+        (((v.x * 100) + 0) * 1.0, "(x{} * 100.0)"),
+        (v.x + (v.y * 0), "(x{} + (y{} * 0.0))"),
+        ((v.x + v.y).on("a") * 1, "(x{} + on (a) y{})"),
+        (((v.x + v.y) * v.z).ignoring("a") * 1, "((x{} + y{}) * ignoring (a) z{})"),
+        ((ql.sum(v.x) * 1).ignoring("a"), "(sum(x{}) * ignoring (a) 1.0)"),
+        ((v.x > 1) * 1, "((x{} > 1.0) * 1.0)"),
+        (ql.UnaryOp(ql.UnaryOp(v.x, ql.UnopKind.neg), ql.UnopKind.neg), "--x{}"),
+        (
+            ql.UnaryOp(ql.UnaryOp(v.x * 2, ql.UnopKind.neg), ql.UnopKind.neg),
+            "(x{} * 2.0)",
+        ),
+        (v.x > ql.UnaryOp(ql.ScalarLiteral(1), ql.UnopKind.neg), "(x{} > -1.0)"),
+    ],
+)
+def test_simplify(expr: ql.Timeseries, expected: str) -> None:
+    assert ql.simplify(expr).render() == expected
+
+
+def test_simplify_keeps_unchanged_subtrees() -> None:
+    expr = ql.rate(v.x[5 * ql.Minute]) > 1
+    assert ql.simplify(expr) is expr
+
+    inner = ql.sum(ql.rate(v.x[5 * ql.Minute]))
+    simplified = ql.simplify((inner + 0) > 1)
+    assert isinstance(simplified, ql.BinaryOp)
+    assert simplified.left is inner
@@ -0,0 +1,106 @@
+import sys
+
+from heracles import ql
+from heracles.ql.assertions import assert_exists
+
+v = ql.Selector()
+
+
+def build() -> ql.InstantVector:
+    errors = ql.rate(v.errors_total(job="api")[5 * ql.Minute])
+    requests = ql.rate(v.requests_total(job="api")[5 * ql.Minute])
+    return ql.sum(errors).by("instance") / ql.sum(requests).by("instance")
+
+
+def test_structural_equality() -> None:
+    left = build()
+    right = build()
+
+    assert left is not right
+    assert left.structurally_equal(right)
+    assert left.structural_hash() == right.structural_hash()
+    assert left.structural_key() == right.structural_key()
+    assert len({left.structural_key(), right.structural_key()}) == 1
+
+
+def test_structural_inequality() -> None:
+    base = v.up(job="x")
+    assert not base.structurally_equal(v.up(job="y"))
+    assert not base.structurally_equal(v.down(job="x"))
+    assert not base.structurally_equal(v.must.up(job="x"))
+    assert not (base + 1).structurally_equal(base - 1)
+    assert not (base + 1).structurally_equal((base + 1).on("job"))
+    assert not ql.sum(base).by("a").structurally_equal(ql.sum(base).without("a"))
+    assert not base[5 * ql.Minute].structurally_equal(base[4 * ql.Minute])
+    assert not base.structurally_equal("up")
+
+
+def test_structural_hash_of_deep_trees() -> None:
+    def chain() -> ql.InstantVector:
+        expr: ql.InstantVector = v.base
+        for i in range(5 * sys.getrecursionlimit()):
+            expr = expr.or_(v.get(f"m{i}"))
+        return expr
+
+    assert chain().structurally_equal(chain())
+
+
+def test_interning_shares_subtrees() -> None:
+    interner = ql.Interner()
+    first = interner.intern(build())
+    second = interner.intern(build())
+
+    assert first is second
+    assert isinstance(first, ql.BinaryOp)
+    assert first.render() == build().render()
+
+    other = interner.intern(ql.sum(ql.rate(v.errors_total(job="api")[5 * ql.Minute])))
+    assert isinstance(other, ql.AggrFunc)
+    assert isinstance(first.left, ql.FinalizedAggrFunc)
+    # the rate() inside both trees is a single shared instance
+    assert other.args[0] is first.left.args[0]
+
+
+def test_interning_does_not_modify_input() -> None:
+    interner = ql.Interner()
+    shared = interner.intern(v.up(job="x"))
+    expr = v.up(job="x") + 1
+    original_left = expr.left
+
+    interned = interner.intern(expr)
+    assert expr.left is original_left
+    assert interned.left is shared
+    assert interned.render() == expr.render()
+
+
+def test_structural_equality_of_floats() -> None:
+    x = v.x
+    assert not (x * 0.0).structurally_equal(x * -0.0)
+    assert (x * float("nan")).structurally_equal(x * float("nan"))
+
+    interner = ql.Interner()
+    interner.intern(x * 0.0)
+    assert interner.intern(x * -0.0).render() == (x * -0.0).render()
+
+
+def test_annotating_keeps_ancestor_hashes() -> None:
+    inner = ql.rate(v.x[5 * ql.Minute])
+    outer = ql.sum(inner)
+    unannotated = ql.sum(ql.rate(v.x[5 * ql.Minute]))
+    hashed = outer.structural_hash()
+
+    # annotations are compared, but not hashed
+    inner.annotate(assert_exists)
+    annotated = ql.sum(ql.rate(v.x[5 * ql.Minute]).annotate(assert_exists))
+    assert outer.structural_hash() == hashed == annotated.structural_hash()
+    assert outer.structurally_equal(annotated)
+    assert not outer.structurally_equal(unannotated)
+    assert outer.structural_key() != unannotated.structural_key()
+
+
+def test_selecting_copies_annotations() -> None:
+    base = v.x.annotate(assert_exists)
+    selected = base(job="a")
+    selected.annotate(assert_exists)
+    assert len(base.annotations) == 1
+    assert len(selected.annotations) == 2
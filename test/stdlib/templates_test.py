@@ -0,0 +1,55 @@
+import pytest
+
+from heracles import ql
+
+v = ql.Selector()
+
+# format is a no-op when the formatter library isn't built
+_has_formatter = ql.format("x+1") != "x+1"
+
+errors = ql.sum(ql.rate(v.http_errors_total(job="api")[5 * ql.Minute])).by("a")
+requests = ql.rate(v.http_requests_total(job="api")[5 * ql.Minute])
+
+EXPRESSIONS = [
+    (errors / errors.offset(ql.Day)) > 2,
+    (ql.sum(requests).by("a") / ql.sum(requests).by("b"))
+    + (ql.sum(requests).by("a") * 0)
+    + ql.max(requests),
+    ql.max_over_time((errors / ql.sum(requests).by("a"))[1 * ql.Hour : ql.Minute])
+    > errors,
+]
+
+
+def test_render_with_templates() -> None:
+    rendered = ql.render_with_templates(EXPRESSIONS[0])
+    assert rendered == (
+        'WITH (_t0 = sum(rate(http_errors_total{job="api"}[5m])) by (a)) '
+        "((_t0 / (_t0 offset 1d)) > 2.0)"
+    )
+
+    # nested repeats are templates of their own, defined before their users
+    rendered = ql.render_with_templates(EXPRESSIONS[1])
+    assert rendered.startswith(
+        'WITH (_t0 = rate(http_requests_total{job="api"}[5m]), _t1 = sum(_t0) by (a)) '
+    )
+    assert len(rendered) < len(EXPRESSIONS[1].render())
+
+
+def test_render_with_templates_without_repeats() -> None:
+    expr = ql.sum(requests) > 1
+    assert ql.render_with_templates(expr) == expr.render()
+    # repeats which are too short to be worth a template are rendered inline
+    expr = v.x + v.x
+    assert ql.render_with_templates(expr) == expr.render()
+
+
+def test_render_with_templates_avoids_names_in_use() -> None:
+    expr = v._t0 + (errors / errors)
+    assert ql.render_with_templates(expr).startswith("WITH (_t1 = ")
+
+
+@pytest.mark.skipif(not _has_formatter, reason="formatter library isn't built")
+@pytest.mark.parametrize("expr", EXPRESSIONS)
+def test_render_with_templates_round_trip(expr: ql.InstantVector) -> None:
+    # the formatter parses the query, which expands the templates
+    assert ql.format(ql.render_with_templates(expr)) == ql.format(expr.render())
@@ -0,0 +1,98 @@
+import sys
+
+from heracles import ql
+
+
+def test_deep_trees_do_not_recurse() -> None:
+    # left-deep chains like the ones built with functools.reduce in the assertion
+    # contexts must not be limited by the interpreter's recursion limit
+    depth = 10 * sys.getrecursionlimit()
+    expr: ql.InstantVector = ql.SelectedInstantVector(name="base")
+    for i in range(depth):
+        expr = expr.or_(ql.absent(ql.SelectedInstantVector(name=f"m{i}")))
+
+    rendered = expr.render()
+    assert rendered.startswith("(" * depth + "base{} or absent(m0{}))")
+    assert rendered.endswith(f" or absent(m{depth - 1}{{}}))")
+
+    selected: list[str] = []
+
+    def visitor(v: ql.SelectedInstantVector) -> None:
+        selected.append(v.name or "")
+
+    expr.accept_visitor(visitor)
+    assert len(selected) == depth + 1
+    assert selected[:3] == ["base", "m0", "m1"]
+
+
+def test_visitor_actions() -> None:
+    expr = ql.rate(ql.SelectedInstantVector(name="a")[ql.Minute]) + ql.absent(
+        ql.SelectedInstantVector(name="b")
+    )
+    visited: list[str] = []
+
+    def skip_rollups(v: ql.Timeseries) -> ql.VisitorAction | None:
+        visited.append(type(v).__name__)
+        if isinstance(v, ql.RollupFunc):
+            return ql.VisitorAction.CONTINUE
+        return None
+
+    assert expr.accept_visitor(skip_rollups) == ql.VisitorAction.RECURSE
+    assert visited == [
+        "BinaryOp",
+        "RollupFunc",
+        "TransformFunc",
+        "SelectedInstantVector",
+    ]
+
+    visited.clear()
+
+    def stop_at_selector(v: ql.Timeseries) -> ql.VisitorAction | None:
+        visited.append(type(v).__name__)
+        if isinstance(v, ql.SelectedInstantVector):
+            return ql.VisitorAction.STOP
+        return None
+
+    assert expr.accept_visitor(stop_at_selector) == ql.VisitorAction.STOP
+    assert visited == [
+        "BinaryOp",
+        "RollupFunc",
+        "SelectedRangeVector",
+        "SelectedInstantVector",
+    ]
+
+
+def test_visitor_dispatch() -> None:
+    expr = ql.sum(ql.rate(ql.SelectedInstantVector(name="a")[ql.Minute])) + ql.abs(
+        ql.SelectedInstantVector(name="b")
+    )
+
+    class FunctionNames(ql.TimeseriesVisitor):
+        def __init__(self) -> None:
+            super().__init__()
+            self.names: list[str] = []
+
+        def visit_builtin_function(self, f: ql.BuiltinFunc) -> None:
+            self.names.append(f.name)
+
+    # aggregations fall back to visit_builtin_function
+    visitor = FunctionNames()
+    expr.accept_visitor(visitor)
+    assert visitor.names == ["sum", "rate", "abs"]
+
+    selected: list[str] = []
+
+    def selectors(v: ql.SelectedInstantVector) -> None:
+        selected.append(v.name or "")
+
+    expr.accept_visitor(selectors)
+    assert selected == ["a", "b"]
+
+    visited: list[str] = []
+
+    def unannotated(v):  # type: ignore[no-untyped-def]
+        visited.append(type(v).__name__)
+
+    # as before dispatch was cached, unannotated functions are never called
+    expr.accept_visitor(unannotated)
+    assert visited == []